@@ -38,6 +38,14 @@ const TasksPage = ({ user, onLogout }) => {
     loadCategories();
   }, []);
 
+  // Efeito para recarregar os dados quando outra aba ou dispositivo alterar algo
+  useEffect(() => {
+    return api.subscribeEvents((event) => {
+      if (event.entity !== 'category') loadTasks();
+      if (event.entity !== 'task' && event.entity !== 'subtask') loadCategories();
+    });
+  }, []);
+
   // Função para carregar tarefas do servidor
   const loadTasks = async () => {
     try {
@@ -1,6 +1,34 @@
 const BASE_URL = "https://todolist-backend-1099393198012.us-central1.run.app";
 
 class ApiService {
+  // Última resposta de cada listagem, indexada pela URL, com o ETag dela
+  etagCache = new Map();
+
+  async cachedGet(url, errorMessage) {
+    const token = localStorage.getItem("access_token");
+    const cached = this.etagCache.get(url);
+    const headers = { "Authorization": `Bearer ${token}` };
+    if (cached) headers["If-None-Match"] = cached.etag;
+
+    // O cache HTTP do navegador fica de fora: a revalidação é feita aqui
+    const res = await fetch(url, { headers, cache: "no-store" });
+
+    if (res.status === 304 && cached) {
+      return cached.data;
+    }
+
+    if (!res.ok) {
+      throw new Error(errorMessage);
+    }
+
+    const data = await res.json();
+    const etag = res.headers.get("ETag");
+    if (etag) {
+      this.etagCache.set(url, { etag, data });
+    }
+    return data;
+  }
+
   async login(email, password) {
     const body = new URLSearchParams();
     body.append("username", email);
@@ -44,7 +72,6 @@ class ApiService {
   }
 
   async fetchTasks(categoriaId = null, dataInicio = null, dataFim = null) {
-    const token = localStorage.getItem("access_token");
     let url = `${BASE_URL}/tasks`;
     const params = new URLSearchParams();
     
@@ -54,16 +81,22 @@ class ApiService {
     
     if (params.toString()) url += `?${params.toString()}`;
     
-    const res = await fetch(url, {
+    return await this.cachedGet(url, "Failed to fetch tasks");
+  }
+
+  async searchTasks(q, limit = 50) {
+    const params = new URLSearchParams({ q, limit });
+    const token = localStorage.getItem("access_token");
+    const res = await fetch(`${BASE_URL}/tasks/search?${params.toString()}`, {
       headers: {
         "Authorization": `Bearer ${token}`
       }
     });
-    
+
     if (!res.ok) {
-      throw new Error("Failed to fetch tasks");
+      throw new Error("Failed to search tasks");
     }
-    
+
     return await res.json();
   }
 
@@ -121,18 +154,10 @@ class ApiService {
 
   // Categories
   async fetchCategories() {
-    const token = localStorage.getItem("access_token");
-    const res = await fetch(`${BASE_URL}/categories`, {
-      headers: {
-        "Authorization": `Bearer ${token}`
-      }
-    });
-    
-    if (!res.ok) {
-      throw new Error("Failed to fetch categories");
-    }
-    
-    return await res.json();
+    return await this.cachedGet(
+      `${BASE_URL}/categories`,
+      "Failed to fetch categories"
+    );
   }
 
   async createCategory(category) {
@@ -222,8 +247,22 @@ class ApiService {
     return await res.json();
   }
 
+  // Abre o fluxo SSE de alterações; retorna uma função que fecha a conexão
+  subscribeEvents(onEvent) {
+    const token = localStorage.getItem("access_token");
+    const params = new URLSearchParams({ token });
+    const source = new EventSource(`${BASE_URL}/events?${params.toString()}`);
+
+    source.onmessage = (message) => {
+      onEvent(JSON.parse(message.data));
+    };
+
+    return () => source.close();
+  }
+
   logout() {
     localStorage.removeItem("access_token");
+    this.etagCache.clear();
   }
 }
 
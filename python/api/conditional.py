@@ -0,0 +1,60 @@
+"""
+Requisições condicionais (ETag / If-None-Match).
+
+As listagens usam a versão dos dados do usuário como ETag, o que permite
+responder 304 Not Modified sem executar as consultas da listagem.
+"""
+
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def make_etag(user_id: int, version: int, request: Request) -> str:
+    """
+    Gera o ETag de uma listagem do usuário.
+
+    Args:
+        user_id: ID do usuário autenticado
+        version: Versão atual dos dados do usuário
+        request: Requisição (os parâmetros de query e o Accept entram no
+            ETag, pois filtros, cursores e formatos diferentes geram
+            respostas diferentes)
+
+    Returns:
+        str: ETag fraco no formato W/"<usuário>.<versão>.<hash da query>"
+    """
+    query = "&".join(sorted(request.url.query.split("&")))
+    variant = f"{query}\n{request.headers.get('accept', '')}"
+    digest = hashlib.blake2b(variant.encode("utf-8"), digest_size=6).hexdigest()
+    return f'W/"{user_id}.{version}.{digest}"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    Verifica o cabeçalho If-None-Match da requisição.
+
+    Args:
+        request: Requisição recebida
+        etag: ETag atual do recurso
+
+    Returns:
+        Response: Resposta 304 se o cliente já tem a versão atual,
+        None caso contrário
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+
+    # Comparação fraca: ignora o prefixo W/
+    current = etag.removeprefix("W/")
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    if current in candidates or "*" in candidates:
+        return Response(status_code=304, headers=cache_headers(etag))
+    return None
+
+
+def cache_headers(etag: str) -> dict:
+    """Cabeçalhos de cache das listagens: sempre revalidar com o ETag."""
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
@@ -5,21 +5,55 @@ Este módulo contém funções de dependência usadas em toda a aplicação,
 principalmente para autenticação e autorização.
 """
 
-import jwt
-from fastapi import Depends, HTTPException, status
+from typing import List, Optional
+
+from fastapi import BackgroundTasks, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 
-from core.config import SECRET_KEY, ALGORITHM
-from db.database import get_db
-from repositories.user_repo import get_user_by_email
+from core.events import make_event, publish_event
+from core.metrics import AUTH_FAILURES
+from core.security import decode_access_token
+from core.token_cache import token_cache
+from db.database import get_async_db
+from repositories.aio.user_repo import get_user_by_email
+from repositories.aio.versions_repo import get_user_version
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), conn=Depends(get_db)):
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    conn=Depends(get_async_db)
+):
     """
     Obtém o usuário atual a partir do token JWT.
+
+    Tokens já verificados ficam no `token_cache` até expirarem, evitando
+    repetir a decodificação e a busca do usuário a cada requisição.
+    """
+    return await resolve_user(token, conn)
+
+
+def _token_user(row) -> dict:
+    """
+    Dados do usuário expostos às rotas e guardados no `token_cache`.
+
+    Só `id` e `email`: o hash da senha não fica em memória durante a
+    validade do token, e uma troca de senha não deixa o cache desatualizado.
+    """
+    return {"id": row["id"], "email": row["email"]}
+
+
+async def resolve_user(token: str, conn):
+    """
+    Valida o token e retorna o usuário dono dele (`id` e `email`).
+
+    Separada de `get_current_user` para rotas que recebem o token de outra
+    forma (por exemplo, `GET /events`).
+
+    Raises:
+        HTTPException: 401 se o token for inválido
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -30,24 +64,70 @@ def get_current_user(token: str = Depends(oauth2_scheme), conn=Depends(get_db)):
     # BYPASS PARA DESENVOLVIMENTO - REMOVER EM PRODUÇÃO!
     if token.startswith('dev-bypass-token-'):
         # Retorna ou cria usuário de desenvolvimento
-        dev_user = get_user_by_email(conn, 'dev@test.com')
+        dev_user = await get_user_by_email(conn, 'dev@test.com')
         if not dev_user:
-            from core.security import hash_password
-            from repositories.user_repo import create_user
-            create_user(conn, 'dev@test.com', hash_password('dev123'))
-            dev_user = get_user_by_email(conn, 'dev@test.com')
-        return dev_user
-
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except jwt.PyJWTError:
+            from core.security import hash_password_async
+            from repositories.aio.user_repo import create_user
+            password_hash = await hash_password_async('dev123')
+            await create_user(conn, 'dev@test.com', password_hash)
+            dev_user = await get_user_by_email(conn, 'dev@test.com')
+        return _token_user(dev_user)
+
+    user = token_cache.get(token)
+    if user is not None:
+        return user
+
+    payload = decode_access_token(token)
+    email: Optional[str] = payload.get("sub") if payload else None
+    if email is None:
+        AUTH_FAILURES.get("invalid_token").inc()
         raise credentials_exception
 
-    user = get_user_by_email(conn, email)
-    if user is None:
+    row = await get_user_by_email(conn, email)
+    if row is None:
+        AUTH_FAILURES.get("unknown_user").inc()
         raise credentials_exception
 
-    return user
\ No newline at end of file
+    user = _token_user(row)
+    token_cache.put(token, user, payload.get("exp"))
+    return user
+
+
+class ChangeNotifier:
+    """
+    Publica os eventos de alteração de uma requisição.
+
+    Os eventos são agendados como tarefas de fundo, que o FastAPI só executa
+    depois do commit da unidade de trabalho e do envio da resposta; se a
+    requisição falhar, nada é publicado.
+    """
+
+    def __init__(self, user_id: int, conn, background_tasks: BackgroundTasks):
+        self.user_id = user_id
+        self.conn = conn
+        self.background_tasks = background_tasks
+
+    async def notify(self, entity: str, action: str, ids: List[int]) -> None:
+        """
+        Agenda o evento `<entity>.<action>` para os IDs informados.
+
+        A versão é lida na própria conexão da requisição, então já inclui a
+        alteração que está sendo notificada.
+        """
+        if not ids:
+            return
+        version = await get_user_version(self.conn, self.user_id)
+        self.background_tasks.add_task(
+            publish_event,
+            self.user_id,
+            make_event(entity, action, ids, version)
+        )
+
+
+async def get_notifier(
+    background_tasks: BackgroundTasks,
+    user=Depends(get_current_user),
+    conn=Depends(get_async_db)
+) -> ChangeNotifier:
+    """Dependência que fornece o `ChangeNotifier` do usuário autenticado."""
+    return ChangeNotifier(user["id"], conn, background_tasks)
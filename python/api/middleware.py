@@ -0,0 +1,253 @@
+"""
+Middlewares ASGI da aplicação.
+
+Implementados direto sobre a interface ASGI (sem `BaseHTTPMiddleware`),
+então não criam tarefas nem filas extras por requisição e não interferem
+no streaming das respostas.
+"""
+
+import logging
+import random
+import time
+from typing import Optional
+
+import orjson
+
+from core.config import (
+    LOG_SAMPLE_RATE,
+    LOG_SLOW_REQUEST_MS,
+    SQL_PROFILE,
+    SQL_PROFILE_REPEAT_THRESHOLD
+)
+from core.metrics import REQUEST_DURATION, REQUESTS_IN_FLIGHT
+from db.profiler import QueryProfile, current_profile
+
+
+access_logger = logging.getLogger("todolist.access")
+profile_logger = logging.getLogger("todolist.sql_profile")
+
+
+def route_template(scope) -> str:
+    """
+    Caminho da rota que atendeu a requisição, com os parâmetros no formato
+    do template (ex.: `/tasks/{task_id}`); o caminho bruto se nenhuma rota
+    casou.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or scope.get("path", "")
+
+
+class AccessLogMiddleware:
+    """
+    Registra método, rota, status e duração de cada requisição HTTP.
+
+    Respostas 5xx (e exceções, com o traceback) saem em ERROR e requisições
+    mais lentas que `slow_ms` em WARNING, sempre. As demais saem em INFO: as
+    4xx sempre, e as bem-sucedidas só numa fração `sample_rate`. Fluxos SSE
+    (`text/event-stream`) ficam abertos por definição e não contam como
+    lentos.
+
+    Args:
+        app: Aplicação ASGI envolvida
+        sample_rate: Fração (0 a 1) das respostas bem-sucedidas registradas
+        slow_ms: Duração, em milissegundos, a partir da qual a requisição
+            é considerada lenta
+    """
+
+    def __init__(
+        self,
+        app,
+        sample_rate: float = LOG_SAMPLE_RATE,
+        slow_ms: float = LOG_SLOW_REQUEST_MS
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        event_stream = False
+        error = None
+
+        async def send_wrapper(message):
+            nonlocal status, event_stream
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name.lower() == b"content-type":
+                        event_stream = value.startswith(b"text/event-stream")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            status = 500
+            error = e
+            raise
+        finally:
+            self._log(
+                scope,
+                status,
+                (time.perf_counter() - start) * 1000,
+                event_stream,
+                error
+            )
+
+    def _log(
+        self,
+        scope,
+        status: int,
+        duration_ms: float,
+        event_stream: bool,
+        error: Optional[Exception]
+    ):
+        if status >= 500:
+            level = logging.ERROR
+        elif duration_ms >= self.slow_ms and not event_stream:
+            level = logging.WARNING
+        elif status >= 400 or random.random() < self.sample_rate:
+            level = logging.INFO
+        else:
+            return
+
+        if access_logger.isEnabledFor(level):
+            # Argumentos separados: a mensagem é montada pelo listener da
+            # fila de logs, fora da requisição
+            access_logger.log(
+                level,
+                "%s %s %d %.1fms",
+                scope["method"],
+                route_template(scope),
+                status,
+                duration_ms,
+                exc_info=error
+            )
+
+
+class MetricsMiddleware:
+    """
+    Mede as requisições HTTP para `GET /metrics`.
+
+    Observa a duração no histograma por método, rota e status e mantém o
+    gauge de requisições em andamento. Requisições que não casam com
+    nenhuma rota ficam com a rota "unmatched", para que caminhos
+    arbitrários (varreduras, por exemplo) não criem séries novas.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            status = 500
+            raise
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            REQUEST_DURATION.get(
+                scope["method"],
+                getattr(route, "path", None) or "unmatched",
+                str(status)
+            ).observe(time.perf_counter() - start)
+
+
+class SQLProfilerMiddleware:
+    """
+    Profiler de SQL opcional por requisição.
+
+    Ativo em todas as requisições com `mode="always"`, ou só nas que enviam
+    `X-SQL-Profile: 1` com `mode="header"`; com "off" não faz nada. A
+    resposta ganha o cabeçalho `Server-Timing` (tempo no banco, número de
+    instruções e as instruções repetidas demais) e, ao final, um registro
+    em `todolist.sql_profile` traz o resumo completo em JSON, em WARNING
+    se alguma instrução passou de `repeat_threshold` execuções (suspeita
+    de N+1).
+
+    Em respostas em streaming o cabeçalho só cobre as consultas feitas até
+    o envio dele; o registro de log cobre a requisição inteira.
+
+    Args:
+        app: Aplicação ASGI envolvida
+        mode: "off", "header" ou "always"
+        repeat_threshold: Execuções da mesma instrução normalizada acima
+            das quais a requisição é marcada
+    """
+
+    def __init__(
+        self,
+        app,
+        mode: str = SQL_PROFILE,
+        repeat_threshold: int = SQL_PROFILE_REPEAT_THRESHOLD
+    ):
+        self.app = app
+        self.mode = mode
+        self.repeat_threshold = repeat_threshold
+
+    def _enabled(self, scope) -> bool:
+        if self.mode == "always":
+            return True
+        if self.mode != "header":
+            return False
+        for name, value in scope["headers"]:
+            if name == b"x-sql-profile":
+                return value.lower() in (b"1", b"true", b"yes")
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._enabled(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile(self.repeat_threshold)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", ()),
+                        (b"server-timing", profile.server_timing().encode()),
+                    ],
+                }
+            await send(message)
+
+        token = current_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_profile.reset(token)
+            summary = profile.summary()
+            profile_logger.log(
+                logging.WARNING if summary["repeated"] else logging.INFO,
+                "%s",
+                orjson.dumps({
+                    "method": scope["method"],
+                    "route": route_template(scope),
+                    "status": status,
+                    **summary,
+                }).decode()
+            )
@@ -8,10 +8,10 @@ informações do usuário autenticado.
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 
-from db.database import get_db
 from services.auth_service import register, authenticate
 from core.security import create_access_token
 from core.config import ACCESS_TOKEN_EXPIRE_MINUTES
+from core.metrics import AUTH_FAILURES
 from api.deps import get_current_user
 from models.user import UserCreate
 
@@ -20,13 +20,12 @@ router = APIRouter()
 
 
 @router.post("/register")
-def register_user(data: UserCreate, conn=Depends(get_db)):
+async def register_user(data: UserCreate):
     """
     Registra um novo usuário no sistema.
 
     Args:
         data: Dados do usuário (email e senha)
-        conn: Conexão com o banco de dados
 
     Returns:
         dict: Confirmação de registro
@@ -34,7 +33,7 @@ def register_user(data: UserCreate, conn=Depends(get_db)):
     Raises:
         HTTPException: Se o usuário já existir
     """
-    if not register(conn, data.email, data.password):
+    if not await register(data.email, data.password):
         raise HTTPException(
             status_code=400,
             detail="Usuário já existe"
@@ -43,16 +42,12 @@ def register_user(data: UserCreate, conn=Depends(get_db)):
 
 
 @router.post("/login")
-def login(
-    form: OAuth2PasswordRequestForm = Depends(),
-    conn=Depends(get_db)
-):
+async def login(form: OAuth2PasswordRequestForm = Depends()):
     """
     Autentica um usuário e retorna um token JWT.
 
     Args:
         form: Formulário com username (email) e senha
-        conn: Conexão com o banco de dados
 
     Returns:
         dict: Access token e tipo de token
@@ -60,8 +55,9 @@ def login(
     Raises:
         HTTPException: Se as credenciais forem inválidas
     """
-    user = authenticate(conn, form.username, form.password)
+    user = await authenticate(form.username, form.password)
     if not user:
+        AUTH_FAILURES.get("invalid_credentials").inc()
         raise HTTPException(
             status_code=401,
             detail="Credenciais inválidas"
@@ -79,7 +75,7 @@ def login(
 
 
 @router.get("/me")
-def get_current_user_info(user=Depends(get_current_user)):
+async def get_current_user_info(user=Depends(get_current_user)):
     """
     Retorna informações do usuário autenticado.
 
@@ -4,75 +4,100 @@ Rotas de categorias.
 Este módulo contém os endpoints para gerenciar categorias de tarefas.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 
-from db.database import get_db
-from api.deps import get_current_user
+from db.database import get_async_db
+from api.conditional import cache_headers, make_etag, not_modified
+from api.deps import ChangeNotifier, get_current_user, get_notifier
 from models.tasks import CategoryCreate, CategoryUpdate
-from repositories.categories_repo import (
+from repositories.aio.categories_repo import (
     get_categories_by_user,
     create_category,
     update_category,
     delete_category,
     get_category_by_id
 )
+from repositories.aio.versions_repo import get_user_version
 
 
 router = APIRouter()
 
 
 @router.get("/categories")
-def get_categories(user=Depends(get_current_user), conn=Depends(get_db)):
-    """Lista todas as categorias do usuário autenticado."""
-    categories = get_categories_by_user(conn, user["id"])
-    return [dict(row) for row in categories]
+async def get_categories(
+    request: Request,
+    user=Depends(get_current_user),
+    conn=Depends(get_async_db)
+):
+    """
+    Lista todas as categorias do usuário autenticado.
+
+    Suporta If-None-Match: se nada mudou desde o ETag informado, responde
+    304 sem consultar as categorias.
+    """
+    etag = make_etag(
+        user["id"], await get_user_version(conn, user["id"]), request
+    )
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    categories = await get_categories_by_user(conn, user["id"])
+    return ORJSONResponse(categories, headers=cache_headers(etag))
 
 
 @router.post("/categories")
-def create_new_category(
+async def create_new_category(
     data: CategoryCreate,
     user=Depends(get_current_user),
-    conn=Depends(get_db)
+    conn=Depends(get_async_db),
+    notifier: ChangeNotifier = Depends(get_notifier)
 ):
     """Cria uma nova categoria para o usuário autenticado."""
-    category_id = create_category(
+    category_id = await create_category(
         conn,
         user["id"],
         data.nome,
         data.cor
     )
+    await notifier.notify("category", "created", [category_id])
     return {"id": category_id, "ok": True}
 
 
 @router.put("/categories/{category_id}")
-def update_existing_category(
+async def update_existing_category(
     category_id: int,
     data: CategoryUpdate,
     user=Depends(get_current_user),
-    conn=Depends(get_db)
+    conn=Depends(get_async_db),
+    notifier: ChangeNotifier = Depends(get_notifier)
 ):
     """Atualiza uma categoria existente do usuário."""
-    category = get_category_by_id(conn, category_id, user["id"])
+    category = await get_category_by_id(conn, category_id, user["id"])
     if not category:
         raise HTTPException(status_code=404, detail="Categoria não encontrada")
 
     new_nome = data.nome if data.nome is not None else category["nome"]
     new_cor = data.cor if data.cor is not None else category["cor"]
 
-    update_category(conn, category_id, user["id"], new_nome, new_cor)
+    await update_category(conn, category_id, user["id"], new_nome, new_cor)
+    await notifier.notify("category", "updated", [category_id])
     return {"ok": True}
 
 
 @router.delete("/categories/{category_id}")
-def delete_existing_category(
+async def delete_existing_category(
     category_id: int,
     user=Depends(get_current_user),
-    conn=Depends(get_db)
+    conn=Depends(get_async_db),
+    notifier: ChangeNotifier = Depends(get_notifier)
 ):
     """Exclui uma categoria do usuário."""
-    category = get_category_by_id(conn, category_id, user["id"])
+    category = await get_category_by_id(conn, category_id, user["id"])
     if not category:
         raise HTTPException(status_code=404, detail="Categoria não encontrada")
 
-    delete_category(conn, category_id, user["id"])
+    await delete_category(conn, category_id, user["id"])
+    await notifier.notify("category", "deleted", [category_id])
     return {"ok": True}
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""
+Rota de eventos (Server-Sent Events).
+
+Este módulo contém o endpoint que mantém aberta uma conexão SSE com as
+notificações de alteração dos dados do usuário autenticado.
+"""
+
+import asyncio
+from typing import AsyncIterator, Optional
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import OAuth2PasswordBearer
+
+from api.deps import resolve_user
+from core.config import EVENTS_HEARTBEAT_SECONDS
+from core.events import EventBroker, get_broker
+from db.database import acquire_async, get_pool, run_db
+
+
+router = APIRouter()
+
+# O EventSource do navegador não envia cabeçalhos: o token também é
+# aceito no parâmetro `token`
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login", auto_error=False)
+
+
+async def _event_stream(
+    broker: EventBroker,
+    user_id: int
+) -> AsyncIterator[bytes]:
+    """Gera o fluxo SSE: um bloco por evento e comentários de heartbeat."""
+    async with broker.subscribe(user_id) as subscription:
+        # Pede ao navegador que reconecte em 3 s se a conexão cair
+        yield b"retry: 3000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.get(),
+                    timeout=EVENTS_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                # Mantém a conexão viva em proxies e detecta clientes mortos
+                yield b": heartbeat\n\n"
+                continue
+
+            chunk = b"data: " + orjson.dumps(event) + b"\n\n"
+            if "id" in event:
+                chunk = f"id: {event['id']}\n".encode() + chunk
+            yield chunk
+
+
+@router.get("/events")
+async def stream_events(
+    header_token: Optional[str] = Depends(optional_oauth2_scheme),
+    token: Optional[str] = Query(None)
+):
+    """
+    Fluxo SSE com as alterações dos dados do usuário autenticado.
+
+    Cada evento traz `type` (ex.: "task.updated"), `entity`, `action`, `ids`
+    e `version`. Um evento `resync` indica que eventos foram descartados e
+    o cliente deve recarregar os dados. O token pode vir no cabeçalho
+    Authorization ou no parâmetro `token`.
+    """
+    token = header_token or token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Não autenticado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # Conexão só para autenticar: a do get_async_db ficaria presa enquanto
+    # o fluxo estiver aberto, dependendo da versão do FastAPI
+    pool = get_pool()
+    conn = await acquire_async()
+    try:
+        user = await resolve_user(token, conn)
+        if conn.in_transaction:
+            await run_db(conn.commit)
+    finally:
+        await run_db(pool.release, conn)
+
+    return StreamingResponse(
+        _event_stream(get_broker(), user["id"]),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Desliga o buffer de proxies como o nginx
+            "X-Accel-Buffering": "no",
+        }
+    )
@@ -0,0 +1,52 @@
+"""
+Rota de sincronização incremental.
+
+Este módulo contém o endpoint que devolve só o que mudou nos dados do
+usuário autenticado desde uma versão conhecida pelo cliente.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+
+from core.config import SYNC_PAGE_DEFAULT_LIMIT, SYNC_PAGE_MAX_LIMIT
+from db.database import get_async_db
+from api.deps import get_current_user
+from repositories.aio.sync_repo import get_sync_page
+
+
+router = APIRouter()
+
+
+@router.get("/sync")
+async def sync(
+    since: int = Query(0, ge=0),
+    limit: int = Query(SYNC_PAGE_DEFAULT_LIMIT, ge=1, le=SYNC_PAGE_MAX_LIMIT),
+    user=Depends(get_current_user),
+    conn=Depends(get_async_db)
+):
+    """
+    Alterações nos dados do usuário autenticado desde a versão `since`.
+
+    Retorna as tarefas, subtarefas e categorias criadas ou alteradas depois
+    de `since` (no estado atual), os IDs excluídos em `deleted` e a
+    `version` a enviar no próximo `since`. Com `has_more` verdadeiro, há
+    mais alterações: basta repetir a chamada com a nova versão. `since=0`
+    traz todos os dados.
+
+    Quando uma tarefa é excluída, o tombstone é só o dela: o cliente remove
+    junto as subtarefas que tiver dela.
+
+    Raises:
+        HTTPException 410: Se `since` for anterior aos tombstones já
+        compactados (ou posterior à versão atual); o cliente deve descartar
+        os dados locais e sincronizar com `since=0`
+    """
+    page = await get_sync_page(conn, user["id"], since, limit)
+
+    if since and (since < page["pruned_version"] or since > page["version"]):
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Versão de sincronização expirada; sincronize com since=0"
+        )
+
+    return ORJSONResponse(page)
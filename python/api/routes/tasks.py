@@ -5,69 +5,371 @@ Este módulo contém os endpoints para criar, listar, atualizar
 e excluir tarefas do usuário autenticado.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import Optional
+import base64
+import binascii
+import json
+import logging
+import anyio
+import orjson
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import AsyncIterator, Dict, List, Literal, Optional, Tuple
 from datetime import date
 
-from db.database import get_db
-from api.deps import get_current_user
-from models.tasks import TaskCreate, TaskUpdate, SubtaskCreate, SubtaskUpdate
-from repositories.tasks_repo import (
+from core.config import (
+    TASKS_PAGE_DEFAULT_LIMIT,
+    TASKS_PAGE_MAX_LIMIT,
+    TASKS_BULK_MAX_SIZE,
+    TASKS_STREAM_BATCH_SIZE
+)
+from db.database import acquire_async, get_async_db, get_pool, run_db
+from api.conditional import cache_headers, make_etag, not_modified
+from api.deps import ChangeNotifier, get_current_user, get_notifier
+from models.tasks import (
+    TaskCreate,
+    TaskBulkItem,
+    TaskBatchSelection,
+    TaskBatchUpdate,
+    TaskUpdate,
+    SubtaskCreate,
+    SubtaskUpdate
+)
+from repositories.aio.categories_repo import get_category_ids_for_user
+from repositories.aio.tasks_repo import (
     get_tasks_by_user,
+    iter_tasks_by_user,
+    search_tasks,
     create_task,
+    create_tasks_bulk,
+    update_tasks_batch,
+    delete_tasks_batch,
     update_task,
     delete_task,
     get_task_by_id
 )
-from repositories.subtasks_repo import (
-    get_subtasks_by_task,
+from repositories.aio.subtasks_repo import (
+    get_subtasks_by_tasks,
     create_subtask,
     update_subtask,
     delete_subtask,
     get_subtask_by_id
 )
+from repositories.aio.stats_repo import count_overdue, get_status_counts
+from repositories.aio.versions_repo import get_user_version
+from repositories.tasks_repo import TASK_FIELDS
 
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _encode_cursor(task) -> str:
+    """Gera o cursor opaco que aponta para depois da tarefa informada."""
+    raw = json.dumps([task["data_criacao"], task["id"]]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Decodifica um cursor gerado por _encode_cursor."""
+    try:
+        data_criacao, task_id = json.loads(base64.urlsafe_b64decode(cursor))
+        if not isinstance(data_criacao, str) or not isinstance(task_id, int):
+            raise ValueError
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    return data_criacao, task_id
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Valida o parâmetro `fields` (campos separados por vírgula).
+
+    Retorna None (todos os campos) se não informado; `id` é sempre incluído.
+    """
+    if fields is None:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    invalid = [name for name in names if name not in TASK_FIELDS]
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Campos inválidos: {', '.join(invalid)}"
+        )
+    return list(dict.fromkeys(["id", *names]))
+
+
+def _attach_subtasks(tasks: List[dict], subtasks_by_task) -> List[dict]:
+    """Inclui em cada tarefa (já um dicionário) a lista de subtarefas."""
+    for task in tasks:
+        task["subtasks"] = subtasks_by_task[task["id"]]
+    return tasks
+
+
+async def _stream_tasks(
+    user_id: int,
+    categoria_id: Optional[int],
+    data_inicio: Optional[date],
+    data_fim: Optional[date],
+    fields: Optional[List[str]],
+    include: str,
+    ndjson: bool
+) -> AsyncIterator[bytes]:
+    """
+    Gera a listagem de tarefas em blocos de TASKS_STREAM_BATCH_SIZE.
+
+    Só um bloco de tarefas (e suas subtarefas) fica em memória por vez.
+    Produz um array JSON ou, com `ndjson`, uma tarefa por linha.
+
+    Note:
+        A conexão do streaming é obtida aqui, quando o corpo começa a ser
+        enviado: a da dependência da rota já foi devolvida, então cada
+        requisição ocupa uma conexão por vez. Ela volta ao pool quando a
+        geração termina, falha ou o cliente desconecta.
+    """
+    pool = get_pool()
+    conn = None
+    try:
+        conn = await acquire_async()
+        cursor = await iter_tasks_by_user(
+            conn, user_id, categoria_id, data_inicio, data_fim,
+            fields, include == "subtask_counts"
+        )
+        first = True
+        if not ndjson:
+            yield b"["
+        while True:
+            tasks = await run_db(cursor.fetchmany, TASKS_STREAM_BATCH_SIZE)
+            if not tasks:
+                break
+            if include == "subtasks":
+                subtasks_by_task = await get_subtasks_by_tasks(
+                    conn,
+                    [t["id"] for t in tasks]
+                )
+                tasks = _attach_subtasks(tasks, subtasks_by_task)
+            items = [orjson.dumps(task) for task in tasks]
+            if ndjson:
+                yield b"".join(item + b"\n" for item in items)
+            else:
+                yield (b"" if first else b",") + b",".join(items)
+            first = False
+        if not ndjson:
+            yield b"]"
+    except Exception as e:
+        # O status já foi enviado; resta registrar e interromper a resposta
+        logger.error(f"Erro durante o streaming de tarefas: {e}")
+        raise
+    finally:
+        # Também roda quando o cliente desconecta (tarefa cancelada)
+        if conn is not None:
+            with anyio.CancelScope(shield=True):
+                await run_db(pool.release, conn)
 
 
 @router.get("/tasks")
-def get_tasks(
+async def get_tasks(
+    request: Request,
     user=Depends(get_current_user),
-    conn=Depends(get_db),
+    conn=Depends(get_async_db),
     categoria_id: Optional[int] = Query(None),
     data_inicio: Optional[date] = Query(None),
-    data_fim: Optional[date] = Query(None)
+    data_fim: Optional[date] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=TASKS_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = Query(None),
+    stream: bool = Query(False),
+    fields: Optional[str] = Query(None),
+    include: Literal["subtasks", "subtask_counts", "none"] = Query("subtasks")
 ):
-    """Lista todas as tarefas do usuário autenticado com filtros opcionais."""
-    tasks = get_tasks_by_user(
+    """
+    Lista as tarefas do usuário autenticado com filtros opcionais.
+
+    Sem `limit` nem `cursor`, retorna a lista completa (formato original).
+    Com paginação, retorna `{"items": [...], "next_cursor": ...}`; basta
+    repassar `next_cursor` como `cursor` para obter a próxima página.
+
+    Com `stream=true` (ou `Accept: application/x-ndjson`) a lista completa é
+    enviada em streaming, como array JSON ou NDJSON (uma tarefa por linha),
+    sem montar a resposta inteira em memória.
+
+    `fields` limita os campos de cada tarefa (ex.: `id,titulo,status`; `id`
+    sempre vem) e `include` define o que acompanha cada tarefa: a lista de
+    `subtasks` (padrão), só as contagens `subtasks_total` e
+    `subtasks_concluidas` (`subtask_counts`) ou nada (`none`). Os dois são
+    aplicados no próprio SELECT, então a listagem enxuta também lê menos
+    do banco.
+
+    Suporta If-None-Match: se nada mudou desde o ETag informado, responde
+    304 sem executar as consultas da listagem.
+
+    As linhas já chegam do banco como dicionários e a resposta é devolvida
+    pronta, sem passar pelo `jsonable_encoder`.
+    """
+    etag = make_etag(
+        user["id"], await get_user_version(conn, user["id"]), request
+    )
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    paginated = limit is not None or cursor is not None
+    ndjson = NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+    selected = _parse_fields(fields)
+
+    if stream or ndjson:
+        if paginated:
+            raise HTTPException(
+                status_code=400,
+                detail="Streaming não pode ser combinado com limit/cursor"
+            )
+        # A conexão da dependência é devolvida quando a rota retorna, antes
+        # do corpo ser enviado; o gerador só reserva a sua depois disso
+        return StreamingResponse(
+            _stream_tasks(
+                user["id"],
+                categoria_id,
+                data_inicio,
+                data_fim,
+                selected,
+                include,
+                ndjson
+            ),
+            media_type=NDJSON_MEDIA_TYPE if ndjson else "application/json",
+            headers=cache_headers(etag)
+        )
+
+    if paginated and limit is None:
+        limit = TASKS_PAGE_DEFAULT_LIMIT
+
+    # O cursor da próxima página precisa de data_criacao
+    hide_data_criacao = (
+        paginated and selected is not None and "data_criacao" not in selected
+    )
+    if hide_data_criacao:
+        selected.append("data_criacao")
+
+    tasks = await get_tasks_by_user(
         conn,
         user["id"],
         categoria_id,
         data_inicio,
-        data_fim
+        data_fim,
+        # Busca um item a mais para saber se existe próxima página
+        limit=limit + 1 if paginated else None,
+        cursor=_decode_cursor(cursor) if cursor is not None else None,
+        fields=selected,
+        subtask_counts=include == "subtask_counts"
     )
-    
-    # Adiciona subtarefas para cada tarefa
-    result = []
-    for task in tasks:
-        task_dict = dict(task)
-        subtasks = get_subtasks_by_task(conn, task["id"])
-        task_dict["subtasks"] = [dict(s) for s in subtasks]
-        result.append(task_dict)
-    
-    return result
+
+    next_cursor = None
+    if paginated and len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = _encode_cursor(tasks[-1])
+
+    if hide_data_criacao:
+        for task in tasks:
+            del task["data_criacao"]
+
+    result = tasks
+    if include == "subtasks":
+        # Carrega as subtarefas de todas as tarefas em uma única consulta
+        subtasks_by_task = await get_subtasks_by_tasks(
+            conn,
+            [t["id"] for t in tasks]
+        )
+        result = _attach_subtasks(tasks, subtasks_by_task)
+
+    if paginated:
+        result = {"items": result, "next_cursor": next_cursor}
+    return ORJSONResponse(result, headers=cache_headers(etag))
+
+
+@router.get("/tasks/search")
+async def search_user_tasks(
+    user=Depends(get_current_user),
+    conn=Depends(get_async_db),
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(
+        TASKS_PAGE_DEFAULT_LIMIT, ge=1, le=TASKS_PAGE_MAX_LIMIT
+    )
+):
+    """
+    Busca textual nas tarefas do usuário autenticado.
+
+    Procura os termos de `q` no título, na descrição e nos títulos das
+    subtarefas; termos terminados em `*` buscam por prefixo (`compr*`).
+    Os resultados vêm ordenados por relevância, cada um com `snippet`.
+    """
+    tasks = await search_tasks(conn, user["id"], q, limit)
+    subtasks_by_task = await get_subtasks_by_tasks(
+        conn,
+        [t["id"] for t in tasks]
+    )
+    return ORJSONResponse(_attach_subtasks(tasks, subtasks_by_task))
+
+
+def _completion_rate(por_status: Dict[str, int], total: int) -> float:
+    """Fração das tarefas com status 'concluida' (0 se não houver tarefas)."""
+    return round(por_status.get("concluida", 0) / total, 4) if total else 0.0
+
+
+@router.get("/tasks/stats")
+async def get_task_stats(
+    user=Depends(get_current_user),
+    conn=Depends(get_async_db)
+):
+    """
+    Estatísticas das tarefas do usuário autenticado.
+
+    Retorna totais por status, tarefas atrasadas (em aberto com vencimento
+    anterior a hoje) e taxa de conclusão, no geral e por categoria. Os
+    contadores vêm da tabela `task_stats`, mantida por triggers, então o
+    custo não depende da quantidade de tarefas.
+    """
+    counts = await get_status_counts(conn, user["id"])
+    overdue = await count_overdue(conn, user["id"], date.today())
+
+    categories = {}
+    por_status: Dict[str, int] = {}
+    for row in counts:
+        category = categories.setdefault(row["categoria_id"], {
+            "categoria_id": row["categoria_id"],
+            "categoria_nome": row["categoria_nome"],
+            "categoria_cor": row["categoria_cor"],
+            "total": 0,
+            "por_status": {},
+            "atrasadas": overdue.get(row["categoria_id"], 0),
+        })
+        category["total"] += row["total"]
+        category["por_status"][row["status"]] = row["total"]
+        por_status[row["status"]] = por_status.get(row["status"], 0) + row["total"]
+
+    for category in categories.values():
+        category["taxa_conclusao"] = _completion_rate(
+            category["por_status"], category["total"]
+        )
+
+    total = sum(por_status.values())
+    return ORJSONResponse({
+        "total": total,
+        "por_status": por_status,
+        "atrasadas": sum(overdue.values()),
+        "taxa_conclusao": _completion_rate(por_status, total),
+        "por_categoria": list(categories.values()),
+    })
 
 
 @router.post("/tasks")
-def create_new_task(
+async def create_new_task(
     data: TaskCreate,
     user=Depends(get_current_user),
-    conn=Depends(get_db)
+    conn=Depends(get_async_db),
+    notifier: ChangeNotifier = Depends(get_notifier)
 ): 
 
     """Cria uma nova tarefa para o usuário autenticado."""
-    task_id = create_task(
+    task_id = await create_task(
         conn,
         user["id"],
         data.titulo,
@@ -76,18 +378,111 @@ def create_new_task(
         data.categoria_id,
         data.data_vencimento
     )
+    await notifier.notify("task", "created", [task_id])
     return {"id": task_id, "ok": True}
 
 
+@router.post("/tasks/bulk")
+async def create_new_tasks_bulk(
+    data: List[TaskBulkItem] = Body(
+        ..., min_length=1, max_length=TASKS_BULK_MAX_SIZE
+    ),
+    user=Depends(get_current_user),
+    conn=Depends(get_async_db),
+    notifier: ChangeNotifier = Depends(get_notifier)
+):
+    """
+    Cria várias tarefas, com subtarefas opcionais, em uma única transação.
+
+    O lote inteiro é validado antes de qualquer inserção (no máximo
+    TASKS_BULK_MAX_SIZE tarefas). Retorna os IDs na ordem recebida.
+    """
+    category_ids = {t.categoria_id for t in data if t.categoria_id is not None}
+    if category_ids:
+        owned = await get_category_ids_for_user(conn, user["id"], category_ids)
+        missing = sorted(category_ids - owned)
+        if missing:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Categorias não encontradas: {missing}"
+            )
+
+    task_ids = await create_tasks_bulk(
+        conn,
+        user["id"],
+        [task.model_dump() for task in data]
+    )
+    await notifier.notify("task", "created", task_ids)
+    return {"ids": task_ids, "ok": True}
+
+
+def _selection_kwargs(data: TaskBatchSelection) -> dict:
+    """Converte a seleção do lote nos argumentos do repositório."""
+    kwargs = {"ids": data.ids}
+    if data.filter is not None:
+        kwargs.update(data.filter.model_dump())
+    return kwargs
+
+
+@router.patch("/tasks/batch")
+async def update_tasks_in_batch(
+    data: TaskBatchUpdate,
+    user=Depends(get_current_user),
+    conn=Depends(get_async_db),
+    notifier: ChangeNotifier = Depends(get_notifier)
+):
+    """
+    Aplica a mesma alteração parcial a várias tarefas do usuário.
+
+    As tarefas são escolhidas por `ids` ou por `filter` (categoria, status,
+    intervalo de vencimento) e atualizadas com um único UPDATE.
+    """
+    changes = data.changes.model_dump(exclude_none=True)
+
+    if "categoria_id" in changes:
+        owned = await get_category_ids_for_user(
+            conn, user["id"], [changes["categoria_id"]]
+        )
+        if not owned:
+            raise HTTPException(status_code=404, detail="Categoria não encontrada")
+
+    task_ids = await update_tasks_batch(
+        conn,
+        user["id"],
+        changes,
+        **_selection_kwargs(data)
+    )
+    await notifier.notify("task", "updated", task_ids)
+    return {"affected": len(task_ids), "ok": True}
+
+
+@router.post("/tasks/batch/delete")
+async def delete_tasks_in_batch(
+    data: TaskBatchSelection,
+    user=Depends(get_current_user),
+    conn=Depends(get_async_db),
+    notifier: ChangeNotifier = Depends(get_notifier)
+):
+    """Exclui, com um único DELETE, as tarefas escolhidas por ids ou filtro."""
+    task_ids = await delete_tasks_batch(
+        conn,
+        user["id"],
+        **_selection_kwargs(data)
+    )
+    await notifier.notify("task", "deleted", task_ids)
+    return {"affected": len(task_ids), "ok": True}
+
+
 @router.put("/tasks/{task_id}")
-def update_existing_task(
+async def update_existing_task(
     task_id: int,
     data: TaskUpdate,
     user=Depends(get_current_user),
-    conn=Depends(get_db)
+    conn=Depends(get_async_db),
+    notifier: ChangeNotifier = Depends(get_notifier)
 ):
     """Atualiza uma tarefa existente do usuário."""
-    task = get_task_by_id(conn, task_id, user["id"])
+    task = await get_task_by_id(conn, task_id, user["id"])
     if not task:
         raise HTTPException(status_code=404, detail="Tarefa não encontrada")
 
@@ -105,7 +500,7 @@ def update_existing_task(
         else task["data_vencimento"]
     )
 
-    update_task(
+    await update_task(
         conn,
         task_id,
         user["id"],
@@ -115,21 +510,24 @@ def update_existing_task(
         new_categoria_id,
         new_data_vencimento
     )
+    await notifier.notify("task", "updated", [task_id])
     return {"ok": True}
 
 
 @router.delete("/tasks/{task_id}")
-def delete_existing_task(
+async def delete_existing_task(
     task_id: int,
     user=Depends(get_current_user),
-    conn=Depends(get_db)
+    conn=Depends(get_async_db),
+    notifier: ChangeNotifier = Depends(get_notifier)
 ):
     """Exclui uma tarefa do usuário."""
-    task = get_task_by_id(conn, task_id, user["id"])
+    task = await get_task_by_id(conn, task_id, user["id"])
     if not task:
         raise HTTPException(status_code=404, detail="Tarefa não encontrada")
 
-    delete_task(conn, task_id, user["id"])
+    await delete_task(conn, task_id, user["id"])
+    await notifier.notify("task", "deleted", [task_id])
     return {"ok": True}
 
 
@@ -137,35 +535,38 @@ def delete_existing_task(
 
 
 @router.post("/tasks/{task_id}/subtasks")
-def create_new_subtask(
+async def create_new_subtask(
     task_id: int,
     data: SubtaskCreate,
     user=Depends(get_current_user),
-    conn=Depends(get_db)
+    conn=Depends(get_async_db),
+    notifier: ChangeNotifier = Depends(get_notifier)
 ):
     """Cria uma nova subtarefa para uma tarefa."""
-    task = get_task_by_id(conn, task_id, user["id"])
+    task = await get_task_by_id(conn, task_id, user["id"])
     if not task:
         raise HTTPException(status_code=404, detail="Tarefa não encontrada")
 
-    subtask_id = create_subtask(
+    subtask_id = await create_subtask(
         conn,
         task_id,
         data.titulo,
         data.concluida
     )
+    await notifier.notify("subtask", "created", [subtask_id])
     return {"id": subtask_id, "ok": True}
 
 
 @router.put("/subtasks/{subtask_id}")
-def update_existing_subtask(
+async def update_existing_subtask(
     subtask_id: int,
     data: SubtaskUpdate,
     user=Depends(get_current_user),
-    conn=Depends(get_db)
+    conn=Depends(get_async_db),
+    notifier: ChangeNotifier = Depends(get_notifier)
 ):
     """Atualiza uma subtarefa existente."""
-    subtask = get_subtask_by_id(conn, subtask_id)
+    subtask = await get_subtask_by_id(conn, subtask_id, user["id"])
     if not subtask:
         raise HTTPException(status_code=404, detail="Subtarefa não encontrada")
 
@@ -176,20 +577,23 @@ def update_existing_subtask(
         data.concluida if data.concluida is not None else subtask["concluida"]
     )
 
-    update_subtask(conn, subtask_id, new_titulo, new_concluida)
+    await update_subtask(conn, subtask_id, new_titulo, new_concluida)
+    await notifier.notify("subtask", "updated", [subtask_id])
     return {"ok": True}
 
 
 @router.delete("/subtasks/{subtask_id}")
-def delete_existing_subtask(
+async def delete_existing_subtask(
     subtask_id: int,
     user=Depends(get_current_user),
-    conn=Depends(get_db)
+    conn=Depends(get_async_db),
+    notifier: ChangeNotifier = Depends(get_notifier)
 ):
     """Exclui uma subtarefa."""
-    subtask = get_subtask_by_id(conn, subtask_id)
+    subtask = await get_subtask_by_id(conn, subtask_id, user["id"])
     if not subtask:
         raise HTTPException(status_code=404, detail="Subtarefa não encontrada")
 
-    delete_subtask(conn, subtask_id)
+    await delete_subtask(conn, subtask_id)
+    await notifier.notify("subtask", "deleted", [subtask_id])
     return {"ok": True}
\ No newline at end of file
@@ -0,0 +1,317 @@
+"""
+Rotas de exportação e importação.
+
+Este módulo contém os endpoints que exportam, em streaming, todos os dados
+do usuário autenticado e que importam um arquivo no mesmo formato (NDJSON
+ou CSV, veja `api.transfer`), ambos com memória constante.
+"""
+
+import logging
+import time
+import uuid
+from typing import AsyncIterator, Dict, List, Literal, Optional
+
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from starlette.requests import ClientDisconnect
+
+from api.deps import get_current_user
+from api.transfer import (
+    CSV_MEDIA_TYPE,
+    EXPORT_FIELDS,
+    NDJSON_MEDIA_TYPE,
+    CsvParser,
+    NdjsonParser,
+    ParsedRecord,
+    csv_header,
+    encode_csv,
+    encode_ndjson
+)
+from core.config import EXPORT_BATCH_SIZE, IMPORT_BATCH_SIZE, IMPORT_MAX_ERRORS
+from core.events import publish_event
+from db.database import acquire_async, get_async_db, get_pool, run_db
+from models.tasks import ImportRecord
+from repositories.aio.export_repo import begin_snapshot, iter_export
+from repositories.aio.import_repo import finish_import, import_batch, start_import
+from repositories.aio.versions_repo import get_user_version
+
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+_RECORD = TypeAdapter(ImportRecord)
+
+# Erros devolvidos na resposta (os demais só entram na contagem)
+_REPORTED_ERRORS = 100
+# Intervalo mínimo, em segundos, entre eventos de progresso
+_PROGRESS_INTERVAL = 1.0
+
+
+async def _stream_export(
+    user_id: int,
+    fmt: str,
+    entities: List[str]
+) -> AsyncIterator[bytes]:
+    """
+    Gera a exportação em blocos de EXPORT_BATCH_SIZE registros.
+
+    Todas as entidades são lidas na mesma transação de leitura, então o
+    arquivo é um retrato consistente dos dados.
+
+    Note:
+        A conexão é obtida aqui, quando o corpo começa a ser enviado (a da
+        dependência da rota já foi devolvida), e volta ao pool quando a
+        geração termina, falha ou o cliente desconecta.
+    """
+    pool = get_pool()
+    encode = encode_csv if fmt == "csv" else encode_ndjson
+    conn = None
+    try:
+        conn = await acquire_async()
+        await begin_snapshot(conn)
+        if fmt == "csv":
+            yield csv_header()
+        for entity in entities:
+            cursor = await iter_export(conn, user_id, entity)
+            while True:
+                rows = await run_db(cursor.fetchmany, EXPORT_BATCH_SIZE)
+                if not rows:
+                    break
+                yield encode(entity, rows)
+    except Exception as e:
+        # O status já foi enviado; resta registrar e interromper a resposta
+        logger.error(f"Erro durante a exportação: {e}")
+        raise
+    finally:
+        # Também roda quando o cliente desconecta (tarefa cancelada)
+        if conn is not None:
+            with anyio.CancelScope(shield=True):
+                await run_db(pool.release, conn)
+
+
+@router.get("/export")
+async def export_data(
+    request: Request,
+    user=Depends(get_current_user),
+    format: Optional[Literal["ndjson", "csv"]] = Query(None),
+    entity: Optional[Literal["category", "task", "subtask"]] = Query(None)
+):
+    """
+    Exporta em streaming as categorias, tarefas e subtarefas do usuário.
+
+    O formato vem de `format` ou do cabeçalho Accept (`text/csv`; padrão
+    NDJSON). Os registros saem nesta ordem: categorias, tarefas e
+    subtarefas, cada um com o campo `type`; `entity` limita a exportação a
+    um tipo. Os registros são lidos do banco e enviados em blocos, sem
+    carregar a conta inteira em memória.
+    """
+    if format is None:
+        accept = request.headers.get("accept", "")
+        format = "csv" if CSV_MEDIA_TYPE in accept else "ndjson"
+    entities = [entity] if entity else list(EXPORT_FIELDS)
+
+    # A conexão da dependência é devolvida quando a rota retorna, antes
+    # do corpo ser enviado; o gerador só reserva a sua depois disso
+    return StreamingResponse(
+        _stream_export(user["id"], format, entities),
+        media_type=CSV_MEDIA_TYPE if format == "csv" else NDJSON_MEDIA_TYPE,
+        headers={
+            "Content-Disposition":
+                f'attachment; filename="todolist-export.{format}"',
+        }
+    )
+
+
+class _ImportAborted(Exception):
+    """A importação passou de IMPORT_MAX_ERRORS registros inválidos."""
+
+
+class _Importer:
+    """
+    Estado de uma importação: lote pendente, contagens e erros.
+
+    Os registros válidos se acumulam até IMPORT_BATCH_SIZE e são gravados
+    em uma transação por lote; o progresso é publicado como evento
+    `import.progress` no máximo a cada _PROGRESS_INTERVAL segundos.
+    """
+
+    def __init__(self, conn, user_id: int, import_id: str):
+        self.conn = conn
+        self.user_id = user_id
+        self.import_id = import_id
+        self.lines = 0
+        self.counts = {"categories": 0, "tasks": 0, "subtasks": 0}
+        self.errors: List[Dict] = []
+        self.error_count = 0
+        self._batch: Dict[str, List[Dict]] = {
+            "category": [], "task": [], "subtask": []
+        }
+        self._pending = 0
+        self._last_progress = time.monotonic()
+
+    def summary(self, status: str) -> Dict:
+        """Resumo da importação (resposta e eventos)."""
+        return {
+            "import_id": self.import_id,
+            "status": status,
+            "lines": self.lines,
+            **self.counts,
+            "error_count": self.error_count,
+        }
+
+    def sorted_errors(self) -> List[Dict]:
+        """Erros guardados, em ordem de linha (os do lote chegam depois)."""
+        return sorted(self.errors, key=lambda error: error["line"])
+
+    async def publish(self, status: str, **extra) -> None:
+        """Publica o evento `import.<status>` nas conexões SSE do usuário."""
+        await publish_event(
+            self.user_id,
+            {**self.summary(status), "type": f"import.{status}", **extra}
+        )
+
+    def _error(self, line: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < _REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+        if self.error_count > IMPORT_MAX_ERRORS:
+            raise _ImportAborted
+
+    async def add(self, records: List[ParsedRecord]) -> None:
+        """Valida os registros lidos e grava os lotes que completarem."""
+        for line, record, error in records:
+            self.lines = line
+            if error is not None:
+                self._error(line, error)
+                continue
+            try:
+                item = _RECORD.validate_python(record)
+            except ValidationError as e:
+                detail = e.errors()[0]
+                field = ".".join(str(part) for part in detail["loc"][1:])
+                self._error(line, f"{field}: {detail['msg']}" if field
+                            else detail["msg"])
+                continue
+
+            data = item.model_dump()
+            data["line"] = line
+            if item.type == "task" and item.data_criacao is not None:
+                data["data_criacao"] = item.data_criacao.strftime(
+                    "%Y-%m-%d %H:%M:%S"
+                )
+            self._batch[item.type].append(data)
+            self._pending += 1
+            if self._pending >= IMPORT_BATCH_SIZE:
+                await self.flush()
+
+    async def flush(self) -> None:
+        """Grava e commita o lote pendente."""
+        if not self._pending:
+            return
+        batch = self._batch
+        self._batch = {"category": [], "task": [], "subtask": []}
+        self._pending = 0
+
+        result = await import_batch(
+            self.conn,
+            self.user_id,
+            batch["category"],
+            batch["task"],
+            batch["subtask"]
+        )
+        await run_db(self.conn.commit)
+        for key in self.counts:
+            self.counts[key] += result[key]
+
+        now = time.monotonic()
+        if now - self._last_progress >= _PROGRESS_INTERVAL:
+            self._last_progress = now
+            await self.publish("progress")
+
+        for error in result["errors"]:
+            self._error(error["line"], error["error"])
+
+
+@router.post("/import")
+async def import_data(
+    request: Request,
+    user=Depends(get_current_user),
+    conn=Depends(get_async_db),
+    format: Optional[Literal["ndjson", "csv"]] = Query(None),
+    import_id: Optional[str] = Query(
+        None, min_length=1, max_length=64, pattern=r"^[A-Za-z0-9_-]+$"
+    )
+):
+    """
+    Importa um arquivo no formato de `GET /export` para a conta do usuário.
+
+    O corpo é lido e processado à medida que chega (formato por `format` ou
+    Content-Type `text/csv`; padrão NDJSON) e gravado em transações de
+    IMPORT_BATCH_SIZE registros. Os dados são acrescentados aos que o
+    usuário já tem: os IDs do arquivo só relacionam os registros entre si
+    e são trocados pelos gerados no banco. Subtarefas e tarefas precisam
+    vir depois da tarefa e da categoria que referenciam.
+
+    Registros inválidos são ignorados e listados em `errors` (os primeiros
+    100, com o número da linha). O progresso é publicado em `GET /events`
+    como `import.started`, `import.progress` (a cada segundo, no máximo),
+    `import.completed` (com a `version` dos dados, para o cliente
+    sincronizar) ou `import.failed`, todos com o `import_id` (gerado ou
+    informado na query).
+
+    Raises:
+        HTTPException 422: Se o arquivo passar de IMPORT_MAX_ERRORS
+        registros inválidos; os lotes já gravados são mantidos e o corpo
+        traz o resumo do que foi importado
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "csv" if CSV_MEDIA_TYPE in content_type else "ndjson"
+    parser = CsvParser() if format == "csv" else NdjsonParser()
+    importer = _Importer(conn, user["id"], import_id or uuid.uuid4().hex)
+
+    # A importação não usa a unidade de trabalho da requisição: cada lote
+    # é commitado na hora, então o progresso não se perde em caso de falha
+    await start_import(conn)
+    await run_db(conn.commit)
+    await importer.publish("started")
+    try:
+        async for chunk in request.stream():
+            await importer.add(parser.feed(chunk))
+        await importer.add(parser.close())
+        await importer.flush()
+    except _ImportAborted:
+        await importer.publish("failed")
+        raise HTTPException(
+            status_code=422,
+            detail={
+                **importer.summary("aborted"),
+                "errors": importer.sorted_errors(),
+            }
+        )
+    except ClientDisconnect:
+        logger.warning(
+            f"Importação {importer.import_id} interrompida pelo cliente "
+            f"na linha {importer.lines}"
+        )
+        await importer.publish("failed")
+        raise
+    except Exception:
+        await importer.publish("failed")
+        raise
+    finally:
+        # Descarta o lote incompleto de uma falha antes de remover a
+        # tabela temporária (DDL fora de transação é gravado na hora)
+        if conn.in_transaction:
+            await run_db(conn.rollback)
+        await finish_import(conn)
+
+    version = await get_user_version(conn, user["id"])
+    await importer.publish("completed", version=version)
+    logger.info(
+        f"Importação {importer.import_id}: {importer.lines} linhas, "
+        f"{importer.counts}, {importer.error_count} erros"
+    )
+    return {**importer.summary("completed"), "errors": importer.sorted_errors()}
@@ -0,0 +1,175 @@
+"""
+Formatos de exportação e importação (NDJSON e CSV).
+
+Cada registro é uma categoria, tarefa ou subtarefa, identificada pelo campo
+`type` ("category", "task" ou "subtask"). No NDJSON cada linha é um objeto
+com os campos da entidade; no CSV há uma coluna por campo de todas as
+entidades (CSV_COLUMNS), vazias quando não se aplicam ao registro.
+
+A exportação é gerada bloco a bloco e os parsers da importação recebem o
+corpo em pedaços arbitrários: guardam só a linha (ou o registro CSV entre
+aspas) incompleta do fim de cada pedaço.
+"""
+
+import codecs
+import csv
+import io
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import orjson
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+
+# Campos exportados por entidade (mesma ordem das consultas do export_repo)
+EXPORT_FIELDS: Dict[str, List[str]] = {
+    "category": ["id", "nome", "cor"],
+    "task": [
+        "id", "categoria_id", "titulo", "descricao", "status",
+        "data_criacao", "data_vencimento",
+    ],
+    "subtask": ["id", "task_id", "titulo", "concluida", "ordem"],
+}
+
+CSV_COLUMNS = [
+    "type", "id", "task_id", "categoria_id", "nome", "cor", "titulo",
+    "descricao", "status", "data_criacao", "data_vencimento", "concluida",
+    "ordem",
+]
+
+# Registro lido: (linha no arquivo, campos, mensagem de erro)
+ParsedRecord = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+def encode_ndjson(entity: str, rows: Iterable[Dict[str, Any]]) -> bytes:
+    """Serializa um bloco de linhas do banco como NDJSON."""
+    return b"".join(
+        orjson.dumps({"type": entity, **row}) + b"\n" for row in rows
+    )
+
+
+def csv_header() -> bytes:
+    """Linha de cabeçalho do CSV."""
+    return (",".join(CSV_COLUMNS) + "\r\n").encode("utf-8")
+
+
+def encode_csv(entity: str, rows: Iterable[Dict[str, Any]]) -> bytes:
+    """Serializa um bloco de linhas do banco como CSV (sem cabeçalho)."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, CSV_COLUMNS)
+    for row in rows:
+        writer.writerow({"type": entity, **row})
+    return buffer.getvalue().encode("utf-8")
+
+
+class NdjsonParser:
+    """Parser incremental de NDJSON: um objeto JSON por linha."""
+
+    def __init__(self):
+        self._tail = b""
+        self._line = 0
+
+    def feed(self, chunk: bytes) -> List[ParsedRecord]:
+        """Processa um pedaço do corpo; retorna os registros completos."""
+        lines = (self._tail + chunk).split(b"\n")
+        self._tail = lines.pop()
+        return [self._parse(line) for line in lines if self._count(line)]
+
+    def close(self) -> List[ParsedRecord]:
+        """Processa o que restou depois do último pedaço."""
+        line, self._tail = self._tail, b""
+        return [self._parse(line)] if self._count(line) else []
+
+    def _count(self, line: bytes) -> bool:
+        """Conta a linha; indica se ela tem conteúdo."""
+        self._line += 1
+        return bool(line.strip())
+
+    def _parse(self, line: bytes) -> ParsedRecord:
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            return self._line, None, f"JSON inválido: {e}"
+        if not isinstance(record, dict):
+            return self._line, None, "A linha deve ser um objeto JSON"
+        return self._line, record, None
+
+
+class CsvParser:
+    """
+    Parser incremental de CSV com cabeçalho.
+
+    Um registro termina na quebra de linha em que a quantidade de aspas
+    acumulada é par, então campos entre aspas podem conter quebras de
+    linha. Colunas vazias são omitidas do registro (valor padrão).
+    """
+
+    def __init__(self):
+        # utf-8-sig descarta o BOM que planilhas costumam gravar
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._tail = ""
+        self._pending: List[str] = []
+        self._quotes = 0
+        self._line = 0
+        self._start = 0
+        self._header: Optional[List[str]] = None
+
+    def feed(self, chunk: bytes) -> List[ParsedRecord]:
+        """Processa um pedaço do corpo; retorna os registros completos."""
+        lines = (self._tail + self._decoder.decode(chunk)).split("\n")
+        self._tail = lines.pop()
+        return self._records(lines)
+
+    def close(self) -> List[ParsedRecord]:
+        """Processa o que restou depois do último pedaço."""
+        tail = self._tail + self._decoder.decode(b"", final=True)
+        self._tail = ""
+        records = self._records([tail] if tail else [])
+        if self._pending:
+            records.append((self._start, None, "Aspas não fechadas no registro"))
+            self._pending = []
+        return records
+
+    def _records(self, lines: List[str]) -> List[ParsedRecord]:
+        records = []
+        for line in lines:
+            self._line += 1
+            if not self._pending:
+                self._start = self._line
+            self._pending.append(line.rstrip("\r"))
+            self._quotes += line.count('"')
+            if self._quotes % 2:
+                continue
+
+            text = "\n".join(self._pending)
+            self._pending = []
+            self._quotes = 0
+            if not text.strip():
+                continue
+            try:
+                values = next(csv.reader([text]))
+            except csv.Error as e:
+                records.append((self._start, None, f"CSV inválido: {e}"))
+                continue
+
+            if self._header is None:
+                self._header = [name.strip() for name in values]
+                if "type" not in self._header:
+                    records.append(
+                        (self._start, None, 'Cabeçalho sem a coluna "type"')
+                    )
+                continue
+            if len(values) != len(self._header):
+                records.append((
+                    self._start, None,
+                    f"Esperadas {len(self._header)} colunas, "
+                    f"encontradas {len(values)}"
+                ))
+                continue
+            records.append((
+                self._start,
+                {k: v for k, v in zip(self._header, values) if v != ""},
+                None
+            ))
+        return records
@@ -0,0 +1,7 @@
+"""
+Benchmarks da API.
+
+Scripts executados manualmente a partir do diretório `python/`, por exemplo:
+
+    python -m benchmarks.bench_async_routes
+"""
@@ -0,0 +1,137 @@
+"""
+Custo do log de acesso por requisição: BaseHTTPMiddleware + StreamHandler
+síncrono x AccessLogMiddleware (ASGI puro) + fila de logs.
+
+Monta duas aplicações mínimas com a mesma rota e mede, chamando o ASGI
+diretamente, o tempo médio por requisição. Os logs vão para um arquivo
+real (não /dev/null), então a escrita em disco entra na conta do modo
+síncrono.
+
+Uso (a partir do diretório `python/`):
+
+    python -m benchmarks.bench_access_log --requests 20000
+"""
+
+import argparse
+import asyncio
+import logging
+import logging.handlers
+import os
+import queue
+import tempfile
+import time
+
+from fastapi import FastAPI, Request
+
+from api.middleware import AccessLogMiddleware
+from core.logging_config import LOG_FORMAT, _NonBlockingQueueHandler
+
+
+def file_handler(path: str) -> logging.Handler:
+    handler = logging.FileHandler(path)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    return handler
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"id": item_id}
+
+    return app
+
+
+def before_app(path: str) -> FastAPI:
+    """O middleware antigo de main.py, com o handler síncrono."""
+    logger = logging.getLogger("bench.before")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(file_handler(path))
+    app = make_app()
+
+    @app.middleware("http")
+    async def log_requests(request: Request, call_next):
+        logger.info(f"{request.method} {request.url}")
+        response = await call_next(request)
+        logger.info(f"Status: {response.status_code}")
+        return response
+
+    return app
+
+
+def after_app(path: str, sample_rate: float):
+    """AccessLogMiddleware com a fila; retorna a aplicação e o listener."""
+    log_queue: queue.Queue = queue.Queue(10000)
+    logger = logging.getLogger("todolist.access")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.handlers = [_NonBlockingQueueHandler(log_queue)]
+    listener = logging.handlers.QueueListener(log_queue, file_handler(path))
+    listener.start()
+
+    app = make_app()
+    app.add_middleware(AccessLogMiddleware, sample_rate=sample_rate)
+    return app, listener
+
+
+async def run(app, requests: int) -> float:
+    """Executa `requests` GETs em sequência; retorna o tempo médio em µs."""
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    def scope(i: int):
+        path = f"/items/{i}"
+        return {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"bench")],
+            "client": ("127.0.0.1", 0),
+            "server": ("bench", 80),
+        }
+
+    for i in range(200):
+        await app(scope(i), receive, send)
+    start = time.perf_counter()
+    for i in range(requests):
+        await app(scope(i), receive, send)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--sample-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="bench-")
+    baseline = asyncio.run(run(make_app(), args.requests))
+    print(f"{'sem log':34} {baseline:7.1f} µs/req")
+
+    before = asyncio.run(
+        run(before_app(os.path.join(directory, "before.log")), args.requests)
+    )
+    print(f"{'antes (BaseHTTPMiddleware)':34} {before:7.1f} µs/req")
+
+    for rate in (1.0, args.sample_rate):
+        app, listener = after_app(
+            os.path.join(directory, f"after-{rate}.log"), rate
+        )
+        after = asyncio.run(run(app, args.requests))
+        listener.stop()
+        print(f"{f'depois (ASGI + fila, amostra {rate:g})':34} {after:7.1f} µs/req")
+
+
+if __name__ == "__main__":
+    main()
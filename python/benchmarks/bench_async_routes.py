@@ -0,0 +1,147 @@
+"""
+Vazão concorrente das rotas síncronas x assíncronas.
+
+Compara `GET /tasks` da aplicação (rota `async def`, consultas no executor
+do banco) com uma cópia da implementação anterior (rota `def`, executada
+no threadpool do Starlette, abrindo uma conexão por requisição). As duas
+leem o mesmo banco.
+
+Uso (a partir do diretório `python/`):
+
+    python -m benchmarks.bench_async_routes --requests 2000 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+
+# O banco precisa estar definido antes de importar a aplicação
+os.environ.setdefault(
+    "DATABASE_PATH",
+    os.path.join(tempfile.mkdtemp(prefix="bench-"), "todolist.db")
+)
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+
+from core.security import create_access_token  # noqa: E402
+from db.database import get_db  # noqa: E402
+from db.init_db import init_db  # noqa: E402
+from repositories import subtasks_repo, tasks_repo, user_repo  # noqa: E402
+
+
+def seed(tasks_per_user: int) -> str:
+    """Cria um usuário com tarefas e subtarefas e retorna o token dele."""
+    init_db()
+    for conn in get_db():
+        if not user_repo.get_user_by_email(conn, "bench@test.com"):
+            user_repo.create_user(conn, "bench@test.com", "x")
+        user = user_repo.get_user_by_email(conn, "bench@test.com")
+        conn.executemany(
+            "INSERT INTO tasks (user_id, titulo, descricao, status) "
+            "VALUES (?, ?, '', 'pendente')",
+            [(user["id"], f"Tarefa {i}") for i in range(tasks_per_user)]
+        )
+        conn.execute(
+            "INSERT INTO subtasks (task_id, titulo) "
+            "SELECT id, 'Subtarefa' FROM tasks WHERE user_id = ?",
+            (user["id"],)
+        )
+        conn.commit()
+    return create_access_token({"sub": "bench@test.com"}, 60)
+
+
+def build_legacy_app() -> FastAPI:
+    """Aplicação com a versão síncrona de GET /tasks."""
+    import jwt
+    from fastapi.security import OAuth2PasswordBearer
+
+    from core.config import ALGORITHM, DATABASE_PATH, SECRET_KEY
+
+    oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
+    legacy = FastAPI()
+
+    def connect():
+        conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def current_user(token: str = Depends(oauth2_scheme), conn=Depends(connect)):
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        return user_repo.get_user_by_email(conn, payload["sub"])
+
+    @legacy.get("/tasks")
+    def get_tasks(user=Depends(current_user), conn=Depends(connect)):
+        tasks = tasks_repo.get_tasks_by_user(conn, user["id"], limit=50)
+        subtasks = subtasks_repo.get_subtasks_by_tasks(
+            conn, [t["id"] for t in tasks]
+        )
+        return [
+            {**dict(t), "subtasks": [dict(s) for s in subtasks[t["id"]]]}
+            for t in tasks
+        ]
+
+    return legacy
+
+
+async def run(app, token: str, total: int, concurrency: int) -> dict:
+    """Dispara `total` requisições com no máximo `concurrency` simultâneas."""
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {token}"}
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(
+                    "/tasks", params={"limit": 50}, headers=headers
+                )
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--tasks", type=int, default=500)
+    args = parser.parse_args()
+
+    token = seed(args.tasks)
+
+    from main import app
+
+    apps = (("sync (antes)", build_legacy_app()), ("async (depois)", app))
+    for name, target in apps:
+        result = asyncio.run(
+            run(target, token, args.requests, args.concurrency)
+        )
+        print(
+            f"{name:15} {result['rps']:8.1f} req/s  "
+            f"p50 {result['p50_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
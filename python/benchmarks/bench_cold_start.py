@@ -0,0 +1,151 @@
+"""
+Partida a frio: do import da aplicação até a primeira resposta.
+
+Cada execução roda em um processo novo, que importa `main`, inicia a
+aplicação pelo lifespan (como o uvicorn faz) e envia `GET /health` e, em
+seguida, um `GET /tasks` autenticado. São medidos o import, a partida
+(lifespan), cada primeira resposta e o processo inteiro (incluindo o
+interpretador), em dois cenários: banco novo (todas as migrações) e banco
+já na versão atual.
+
+Uso (a partir do diretório `python/`):
+
+    python -m benchmarks.bench_cold_start --runs 5
+    # Falha (saída 1) se a mediana do import até a primeira resposta no
+    # banco atual passar do limite
+    python -m benchmarks.bench_cold_start --max-ms 1500
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+SECRET_KEY = "bench-cold-start-" + "x" * 32
+
+COLUMNS = ("import_ms", "startup_ms", "health_ms", "tasks_ms", "total_ms",
+           "process_ms")
+
+
+def child() -> None:
+    """Mede a partida no processo atual e imprime o resultado em JSON."""
+    from benchmarks.bench_transfer import call
+
+    start = time.perf_counter()
+    from main import app
+    imported = time.perf_counter()
+
+    async def run():
+        async with app.router.lifespan_context(app):
+            started = time.perf_counter()
+            await call(app, "GET", "/health", [])
+            health = time.perf_counter()
+            token = os.environ["BENCH_TOKEN"]
+            await call(app, "GET", "/tasks",
+                       [(b"authorization", f"Bearer {token}".encode())])
+            tasks = time.perf_counter()
+        return started, health, tasks
+
+    started, health, tasks = asyncio.run(run())
+    print(json.dumps({
+        "import_ms": (imported - start) * 1000,
+        "startup_ms": (started - imported) * 1000,
+        "health_ms": (health - started) * 1000,
+        "tasks_ms": (tasks - health) * 1000,
+        "total_ms": (tasks - start) * 1000,
+    }))
+
+
+def prepare_database(path: str) -> None:
+    """Cria o banco na versão atual, com um usuário e algumas tarefas."""
+    from db.database import connect
+    from db.migrations import migrate
+
+    conn = connect(path)
+    migrate(conn)
+    conn.execute(
+        "INSERT INTO users (email, password_hash) VALUES ('bench@test.com', 'x')"
+    )
+    conn.executemany(
+        "INSERT INTO tasks (user_id, titulo) VALUES (1, ?)",
+        [(f"Tarefa {i}",) for i in range(50)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def measure(database: str, token: str) -> dict:
+    """Executa um processo filho e devolve as medições dele."""
+    env = {
+        **os.environ,
+        "DATABASE_PATH": database,
+        "SECRET_KEY": SECRET_KEY,
+        "BENCH_TOKEN": token,
+        "LOG_LEVEL": "WARNING",
+    }
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_cold_start", "--child"],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--max-ms", type=float,
+        help="limite da mediana de total_ms no banco atual"
+    )
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return 0
+
+    os.environ["SECRET_KEY"] = SECRET_KEY
+    from core.security import create_access_token
+    token = create_access_token({"sub": "bench@test.com"}, 60)
+
+    directory = tempfile.mkdtemp(prefix="bench-")
+    current = os.path.join(directory, "atual.db")
+    prepare_database(current)
+
+    print(f"{'cenário':12}" + "".join(f"{name:>12}" for name in COLUMNS))
+    medians = {}
+    for scenario in ("banco novo", "banco atual"):
+        results = []
+        for run in range(args.runs):
+            database = current
+            if scenario == "banco novo":
+                database = os.path.join(directory, f"novo-{run}.db")
+            results.append(measure(database, token))
+        medians[scenario] = {
+            name: statistics.median(r[name] for r in results)
+            for name in COLUMNS
+        }
+        print(f"{scenario:12}" + "".join(
+            f"{medians[scenario][name]:12.1f}" for name in COLUMNS
+        ))
+
+    if args.max_ms is not None and medians["banco atual"]["total_ms"] > args.max_ms:
+        print(f"total_ms acima do limite de {args.max_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+Escritas concorrentes: commit por escrita x escritor único com group commit.
+
+No modo "direto" cada thread usa a própria conexão do pool e faz commit a
+cada tarefa criada, como uma requisição de escrita faz hoje. No modo
+"escritor único" as mesmas escritas são enviadas para a `WriteQueue`, que
+as agrupa em transações.
+
+Uso (a partir do diretório `python/`):
+
+    python -m benchmarks.bench_group_commit --threads 32 --writes 200
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, List
+
+from db.database import ConnectionPool, connect
+from db.migrations import migrate
+from db.writer import WriteQueue
+from repositories import tasks_repo
+
+
+def prepare_database(path: str) -> int:
+    """Cria o esquema e um usuário; retorna o ID do usuário."""
+    conn = connect(path)
+    migrate(conn)
+    cursor = conn.execute(
+        "INSERT INTO users (email, password_hash) VALUES ('bench@test.com', 'x')"
+    )
+    conn.commit()
+    conn.close()
+    return cursor.lastrowid
+
+
+def run_threads(threads: int, writes: int, write: Callable[[int], None]) -> dict:
+    """Executa `writes` escritas em cada uma das `threads` e mede latências."""
+    latencies: List[float] = []
+    errors: List[Exception] = []
+    lock = threading.Lock()
+
+    def worker(worker_id: int):
+        local = []
+        for i in range(writes):
+            start = time.perf_counter()
+            try:
+                write(worker_id * writes + i)
+            except Exception as e:
+                with lock:
+                    errors.append(e)
+                continue
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    done = len(latencies)
+    latencies = sorted(latencies) or [0.0]
+    return {
+        "writes_per_s": done / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000,
+        "errors": len(errors),
+    }
+
+
+def bench_direct(path: str, user_id: int, threads: int, writes: int) -> dict:
+    pool = ConnectionPool(path, threads, timeout=30)
+
+    def write(n: int):
+        conn = pool.acquire()
+        try:
+            tasks_repo.create_task(conn, user_id, f"Tarefa {n}", "", "pendente")
+            conn.commit()
+        finally:
+            pool.release(conn)
+
+    try:
+        return run_threads(threads, writes, write)
+    finally:
+        pool.close()
+
+
+def bench_single_writer(
+    path: str,
+    user_id: int,
+    threads: int,
+    writes: int,
+    window_ms: float,
+    max_batch: int
+) -> dict:
+    writer = WriteQueue(path, window_ms / 1000, max_batch)
+    create_task = tasks_repo.create_task.__wrapped__
+
+    def write(n: int):
+        writer.submit(
+            create_task, (user_id, f"Tarefa {n}", "", "pendente")
+        ).result()
+
+    try:
+        return run_threads(threads, writes, write)
+    finally:
+        writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--writes", type=int, default=200)
+    parser.add_argument("--window-ms", type=float, default=2)
+    parser.add_argument("--max-batch", type=int, default=64)
+    args = parser.parse_args()
+
+    modes = (
+        ("direto", lambda path, uid: bench_direct(
+            path, uid, args.threads, args.writes
+        )),
+        ("escritor único", lambda path, uid: bench_single_writer(
+            path, uid, args.threads, args.writes, args.window_ms, args.max_batch
+        )),
+    )
+    for name, bench in modes:
+        path = os.path.join(tempfile.mkdtemp(prefix="bench-"), "todolist.db")
+        result = bench(path, prepare_database(path))
+        print(
+            f"{name:15} {result['writes_per_s']:9.1f} escritas/s  "
+            f"p50 {result['p50_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms  "
+            f"erros {result['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
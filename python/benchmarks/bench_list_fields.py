@@ -0,0 +1,74 @@
+"""
+Listagem de tarefas completa x enxuta (`fields` + `include=subtask_counts`).
+
+Reproduz, fora do HTTP, o trabalho de `GET /tasks` depois da autenticação:
+no modo "completa" são todos os campos com as subtarefas embutidas; no modo
+"enxuta", só `id,titulo,status,data_vencimento` com as contagens de
+subtarefas calculadas no próprio SELECT.
+
+Uso (a partir do diretório `python/`):
+
+    python -m benchmarks.bench_list_fields --tasks 1000 --subtasks 5
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+import orjson
+
+from benchmarks.bench_serialization import prepare_database
+from db.database import connect
+from repositories import subtasks_repo, tasks_repo
+
+
+LEAN_FIELDS = ["id", "titulo", "status", "data_vencimento"]
+
+
+def full(conn: sqlite3.Connection, user_id: int) -> bytes:
+    tasks = tasks_repo.get_tasks_by_user(conn, user_id)
+    subtasks_by_task = subtasks_repo.get_subtasks_by_tasks(
+        conn, [t["id"] for t in tasks]
+    )
+    for task in tasks:
+        task["subtasks"] = subtasks_by_task[task["id"]]
+    return orjson.dumps(tasks)
+
+
+def lean(conn: sqlite3.Connection, user_id: int) -> bytes:
+    tasks = tasks_repo.get_tasks_by_user(
+        conn, user_id, fields=LEAN_FIELDS, subtask_counts=True
+    )
+    return orjson.dumps(tasks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--subtasks", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-"), "todolist.db")
+    user_id = prepare_database(path, args.tasks, args.subtasks)
+    conn = connect(path)
+
+    for name, func in (("completa", full), ("enxuta", lean)):
+        body = func(conn, user_id)
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            func(conn, user_id)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        print(
+            f"{name:9} p50 {timings[len(timings) // 2] * 1000:8.2f} ms  "
+            f"{len(body) / 1024:8.1f} KiB"
+        )
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Custo das métricas no caminho quente: MetricsMiddleware por requisição e
+o histograma de `to_async` por chamada de repositório.
+
+Uso (a partir do diretório `python/`):
+
+    python -m benchmarks.bench_metrics --requests 20000 --calls 20000
+"""
+
+import argparse
+import asyncio
+import time
+
+from api.middleware import MetricsMiddleware
+from benchmarks.bench_access_log import make_app, run
+from core.metrics import DB_QUERY_DURATION
+from db.database import run_db, to_async
+
+
+def noop(conn):
+    return None
+
+
+async def measure_calls(func, calls: int) -> float:
+    """Tempo médio, em µs, de `calls` chamadas sequenciais de `func`."""
+    for _ in range(200):
+        await func(None)
+    start = time.perf_counter()
+    for _ in range(calls):
+        await func(None)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    without = asyncio.run(run(make_app(), args.requests))
+    app = make_app()
+    app.add_middleware(MetricsMiddleware)
+    with_metrics = asyncio.run(run(app, args.requests))
+    print(f"requisição sem métricas   {without:7.1f} µs")
+    print(f"requisição com métricas   {with_metrics:7.1f} µs "
+          f"(+{with_metrics - without:.1f})")
+
+    async def plain(conn):
+        return await run_db(noop, conn)
+
+    raw = asyncio.run(measure_calls(plain, args.calls))
+    timed = asyncio.run(measure_calls(to_async(noop), args.calls))
+    print(f"run_db sem histograma     {raw:7.1f} µs")
+    print(f"to_async com histograma   {timed:7.1f} µs (+{timed - raw:.1f})")
+
+    start = time.perf_counter()
+    child = DB_QUERY_DURATION.get("bench.noop")
+    for _ in range(args.calls):
+        child.observe(0.001)
+    observe = (time.perf_counter() - start) / args.calls * 1e6
+    print(f"observe() isolado         {observe:7.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
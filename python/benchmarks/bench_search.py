@@ -0,0 +1,97 @@
+"""
+Latência da busca textual (`tasks_repo.search_tasks`) em usuários grandes.
+
+Cria dois usuários com `--tasks` tarefas cada (títulos e descrições com
+palavras sorteadas de um vocabulário grande, mais algumas palavras comuns)
+e mede a busca de um deles com termos raros, comuns e por prefixo.
+
+Uso (a partir do diretório `python/`):
+
+    python -m benchmarks.bench_search --tasks 100000
+"""
+
+import argparse
+import os
+import random
+import string
+import tempfile
+import time
+
+from db.database import connect
+from db.migrations import migrate
+from repositories import tasks_repo
+
+
+COMMON_WORDS = (
+    "comprar pão leite estudar python relatório reunião academia mercado "
+    "pagar"
+).split()
+
+
+def prepare_database(path: str, tasks: int) -> list:
+    """Cria o banco com dois usuários; retorna o vocabulário usado."""
+    rng = random.Random(1)
+    vocabulary = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+        for _ in range(20000)
+    ]
+    conn = connect(path)
+    migrate(conn)
+    conn.execute(
+        "INSERT INTO users (email, password_hash) "
+        "VALUES ('a@bench.com', 'x'), ('b@bench.com', 'x')"
+    )
+    for user_id in (1, 2):
+        conn.executemany(
+            "INSERT INTO tasks (user_id, titulo, descricao) VALUES (?, ?, ?)",
+            [
+                (
+                    user_id,
+                    " ".join([rng.choice(COMMON_WORDS)]
+                             + rng.choices(vocabulary, k=3)),
+                    " ".join(rng.choices(vocabulary, k=15))
+                )
+                for _ in range(tasks)
+            ]
+        )
+    conn.commit()
+    conn.close()
+    return vocabulary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-"), "todolist.db")
+    vocabulary = prepare_database(path, args.tasks)
+    conn = connect(path)
+
+    queries = (
+        ("termo raro", vocabulary[0]),
+        ("dois termos raros", f"{vocabulary[1]} {vocabulary[2]}"),
+        ("prefixo raro", vocabulary[3][:4] + "*"),
+        ("termo comum", "comprar"),
+        ("prefixo comum", "re*"),
+    )
+    for name, q in queries:
+        results = tasks_repo.search_tasks(conn, 1, q, args.limit)
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            tasks_repo.search_tasks(conn, 1, q, args.limit)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        print(
+            f"{name:18} {q!r:24} {len(results):3} resultados  "
+            f"p50 {timings[len(timings) // 2] * 1000:7.2f} ms  "
+            f"máx {timings[-1] * 1000:7.2f} ms"
+        )
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
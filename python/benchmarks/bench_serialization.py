@@ -0,0 +1,126 @@
+"""
+Serialização da listagem de tarefas: sqlite3.Row + dict + jsonable_encoder x
+linhas como dicionário + orjson.
+
+Reproduz, fora do HTTP, o trabalho de `GET /tasks` depois da consulta: no
+modo "antes" as linhas são `sqlite3.Row`, convertidas com `dict(row)` e
+passadas pelo `jsonable_encoder` antes do `JSONResponse`; no modo "depois"
+as linhas já chegam como dicionários (`db.database.dict_row`) e vão direto
+para o `ORJSONResponse`.
+
+Uso (a partir do diretório `python/`):
+
+    python -m benchmarks.bench_serialization --tasks 1000 --subtasks 3
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Callable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from db.database import connect, dict_row
+from db.migrations import migrate
+from repositories import subtasks_repo, tasks_repo
+
+
+def prepare_database(path: str, tasks: int, subtasks: int) -> int:
+    """Cria o banco com as tarefas de um usuário; retorna o ID do usuário."""
+    conn = connect(path)
+    migrate(conn)
+    user_id = conn.execute(
+        "INSERT INTO users (email, password_hash) VALUES ('bench@test.com', 'x')"
+    ).lastrowid
+    conn.executemany(
+        "INSERT INTO tasks (user_id, titulo, descricao, status, data_vencimento) "
+        "VALUES (?, ?, ?, 'pendente', '2025-01-31')",
+        [(user_id, f"Tarefa {i}", "Descrição " * 8) for i in range(tasks)]
+    )
+    for n in range(subtasks):
+        conn.execute(
+            "INSERT INTO subtasks (task_id, titulo, ordem) "
+            "SELECT id, ?, ? FROM tasks WHERE user_id = ?",
+            (f"Subtarefa {n}", n, user_id)
+        )
+    conn.commit()
+    conn.close()
+    return user_id
+
+
+def list_tasks(conn: sqlite3.Connection, user_id: int):
+    """As mesmas consultas de GET /tasks."""
+    tasks = tasks_repo.get_tasks_by_user(conn, user_id)
+    return tasks, subtasks_repo.get_subtasks_by_tasks(
+        conn, [t["id"] for t in tasks]
+    )
+
+
+def before(conn: sqlite3.Connection, user_id: int) -> bytes:
+    tasks, subtasks_by_task = list_tasks(conn, user_id)
+    result = []
+    for task in tasks:
+        task_dict = dict(task)
+        task_dict["subtasks"] = [dict(s) for s in subtasks_by_task[task["id"]]]
+        result.append(task_dict)
+    return JSONResponse(jsonable_encoder(result)).body
+
+
+def after(conn: sqlite3.Connection, user_id: int) -> bytes:
+    tasks, subtasks_by_task = list_tasks(conn, user_id)
+    for task in tasks:
+        task["subtasks"] = subtasks_by_task[task["id"]]
+    return ORJSONResponse(tasks).body
+
+
+def measure(
+    func: Callable[[sqlite3.Connection, int], bytes],
+    conn: sqlite3.Connection,
+    user_id: int,
+    repeat: int
+) -> dict:
+    """Executa `func` `repeat` vezes (após um aquecimento) e mede o tempo."""
+    body = func(conn, user_id)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(conn, user_id)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {
+        "mean_ms": sum(timings) / len(timings) * 1000,
+        "p50_ms": timings[len(timings) // 2] * 1000,
+        "bytes": len(body),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--subtasks", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-"), "todolist.db")
+    user_id = prepare_database(path, args.tasks, args.subtasks)
+    conn = connect(path)
+
+    modes = (
+        ("antes", sqlite3.Row, before),
+        ("depois", dict_row, after),
+    )
+    for name, row_factory, func in modes:
+        conn.row_factory = row_factory
+        result = measure(func, conn, user_id, args.repeat)
+        print(
+            f"{name:7} média {result['mean_ms']:8.2f} ms  "
+            f"p50 {result['p50_ms']:8.2f} ms  ({result['bytes']} bytes)"
+        )
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Pico de memória de GET /tasks: lista completa x streaming.
+
+Cada modo roda em um processo separado, que chama a aplicação ASGI
+diretamente e descarta o corpo à medida que ele chega (um cliente HTTP em
+processo guardaria a resposta inteira e mascararia a medição). O valor
+reportado é o pico de RSS do processo (`ru_maxrss`) menos o RSS atual logo
+antes da requisição.
+
+Uso (a partir do diretório `python/`, Linux):
+
+    python -m benchmarks.bench_stream_memory --tasks 20000 --subtasks 3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+
+MODES = {
+    "lista": ("/tasks", "application/json"),
+    "stream json": ("/tasks?stream=true", "application/json"),
+    "stream ndjson": ("/tasks", "application/x-ndjson"),
+}
+
+
+def seed(path: str, tasks: int, subtasks: int) -> None:
+    """Cria o banco com um usuário dono de todas as tarefas."""
+    from db.database import connect
+    from db.migrations import migrate
+
+    conn = connect(path)
+    migrate(conn)
+    user_id = conn.execute(
+        "INSERT INTO users (email, password_hash) VALUES ('bench@test.com', 'x')"
+    ).lastrowid
+    conn.executemany(
+        "INSERT INTO tasks (user_id, titulo, descricao, status) "
+        "VALUES (?, ?, ?, 'pendente')",
+        [
+            (user_id, f"Tarefa {i}", "Descrição de tamanho médio " * 4)
+            for i in range(tasks)
+        ]
+    )
+    for n in range(subtasks):
+        conn.execute(
+            "INSERT INTO subtasks (task_id, titulo, ordem) "
+            "SELECT id, ?, ? FROM tasks WHERE user_id = ?",
+            (f"Subtarefa {n}", n, user_id)
+        )
+    conn.commit()
+    conn.close()
+
+
+async def request(app, path: str, accept: str, token: str) -> int:
+    """Executa uma requisição GET na aplicação e retorna os bytes recebidos."""
+    route, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": route,
+        "raw_path": route.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [
+            (b"host", b"bench"),
+            (b"accept", accept.encode()),
+            (b"authorization", f"Bearer {token}".encode()),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("bench", 80),
+    }
+    received = 0
+    status = None
+    sent_request = False
+    done = asyncio.Event()
+
+    async def receive():
+        nonlocal sent_request
+        if not sent_request:
+            sent_request = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Só "desconecta" depois de receber a resposta inteira
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal received, status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            received += len(message.get("body", b""))
+            if not message.get("more_body", False):
+                done.set()
+
+    await app(scope, receive, send)
+    if status != 200:
+        raise RuntimeError(f"{path}: status {status}")
+    return received
+
+
+def current_rss_kb() -> int:
+    """RSS atual do processo em KiB (lido de /proc no Linux)."""
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def child(mode: str) -> None:
+    """Mede um modo no processo atual e imprime o resultado em JSON."""
+    from core.security import create_access_token
+    from main import app
+
+    path, accept = MODES[mode]
+    token = create_access_token({"sub": "bench@test.com"}, 60)
+
+    before = current_rss_kb()
+    start = time.perf_counter()
+    size = asyncio.run(request(app, path, accept, token))
+    elapsed = time.perf_counter() - start
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(json.dumps({
+        "bytes": size,
+        "seconds": elapsed,
+        "peak_growth_kb": after - before,
+        "peak_kb": after,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--subtasks", type=int, default=3)
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-"), "todolist.db")
+    seed(path, args.tasks, args.subtasks)
+    env = {**os.environ, "DATABASE_PATH": path}
+
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_stream_memory",
+             "--child", mode],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"{mode:14} {result['bytes'] / 1024 / 1024:7.1f} MiB enviados  "
+            f"{result['seconds']:6.2f} s  "
+            f"pico de RSS +{result['peak_growth_kb'] / 1024:7.1f} MiB "
+            f"(total {result['peak_kb'] / 1024:.1f} MiB)"
+        )
+
+
+if __name__ == "__main__":
+    main()
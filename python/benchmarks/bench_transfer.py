@@ -0,0 +1,185 @@
+"""
+Memória e tempo de GET /export e POST /import com contas grandes.
+
+Cada fase roda em um processo separado, que chama a aplicação ASGI
+diretamente: a exportação grava o corpo em um arquivo à medida que ele
+chega e a importação envia esse arquivo em pedaços de 64 KiB para um
+segundo usuário. O valor reportado é o pico de RSS do processo
+(`ru_maxrss`) menos o RSS atual logo antes da requisição.
+
+Uso (a partir do diretório `python/`, Linux):
+
+    python -m benchmarks.bench_transfer --tasks 200000 --subtasks 3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_stream_memory import current_rss_kb
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+def seed(path: str, tasks: int, subtasks: int) -> None:
+    """Cria o banco com um usuário dono de todos os dados e um vazio."""
+    from db.database import connect
+    from db.migrations import migrate
+
+    conn = connect(path)
+    migrate(conn)
+    conn.execute(
+        "INSERT INTO users (email, password_hash) "
+        "VALUES ('bench@test.com', 'x'), ('import@test.com', 'x')"
+    )
+    conn.executemany(
+        "INSERT INTO categories (user_id, nome) VALUES (1, ?)",
+        [(f"Categoria {i}",) for i in range(10)]
+    )
+    conn.executemany(
+        "INSERT INTO tasks (user_id, categoria_id, titulo, descricao) "
+        "VALUES (1, ?, ?, ?)",
+        [
+            (i % 10 + 1, f"Tarefa {i}", "Descrição de tamanho médio " * 4)
+            for i in range(tasks)
+        ]
+    )
+    for n in range(subtasks):
+        conn.execute(
+            "INSERT INTO subtasks (task_id, titulo, ordem) "
+            "SELECT id, ?, ? FROM tasks WHERE user_id = 1",
+            (f"Subtarefa {n}", n)
+        )
+    conn.commit()
+    conn.close()
+
+
+async def call(app, method: str, path: str, headers: list, body_file=None,
+               output=None) -> int:
+    """Executa uma requisição na aplicação; retorna o status."""
+    route, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": route,
+        "raw_path": route.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"bench"), *headers],
+        "client": ("127.0.0.1", 0),
+        "server": ("bench", 80),
+    }
+    status = None
+    sent_body = False
+    done = asyncio.Event()
+
+    async def receive():
+        nonlocal sent_body
+        if not sent_body:
+            chunk = body_file.read(CHUNK_SIZE) if body_file else b""
+            sent_body = not chunk
+            return {"type": "http.request", "body": chunk, "more_body": bool(chunk)}
+        # Só "desconecta" depois de receber a resposta inteira
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            if output is not None:
+                output.write(message.get("body", b""))
+            if not message.get("more_body", False):
+                done.set()
+
+    await app(scope, receive, send)
+    return status
+
+
+def child(phase: str, fmt: str, path: str) -> None:
+    """Executa uma fase no processo atual e imprime o resultado em JSON."""
+    from core.security import create_access_token
+    from main import app
+
+    email = "bench@test.com" if phase == "export" else "import@test.com"
+    token = create_access_token({"sub": email}, 60)
+    headers = [(b"authorization", f"Bearer {token}".encode())]
+
+    before = current_rss_kb()
+    start = time.perf_counter()
+    if phase == "export":
+        with open(path, "wb") as output:
+            status = asyncio.run(
+                call(app, "GET", f"/export?format={fmt}", headers,
+                     output=output)
+            )
+    else:
+        content_type = b"text/csv" if fmt == "csv" else b"application/x-ndjson"
+        with open(path, "rb") as body:
+            status = asyncio.run(
+                call(app, "POST", "/import",
+                     headers + [(b"content-type", content_type)],
+                     body_file=body)
+            )
+    elapsed = time.perf_counter() - start
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(json.dumps({
+        "status": status,
+        "seconds": elapsed,
+        "bytes": os.path.getsize(path),
+        "peak_growth_kb": after - before,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=200000)
+    parser.add_argument("--subtasks", type=int, default=3)
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    directory = tempfile.mkdtemp(prefix="bench-")
+    database = os.path.join(directory, "todolist.db")
+    seed(database, args.tasks, args.subtasks)
+    env = {**os.environ, "DATABASE_PATH": database, "LOG_LEVEL": "WARNING"}
+    records = 10 + args.tasks * (1 + args.subtasks)
+
+    for fmt in ("ndjson", "csv"):
+        path = os.path.join(directory, f"export.{fmt}")
+        for phase in ("export", "import"):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_transfer",
+                 "--child", phase, fmt, path],
+                env=env,
+                check=True,
+                capture_output=True,
+                text=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{phase:6} {fmt:6} status {result['status']}  "
+                f"{result['bytes'] / 1024 / 1024:7.1f} MiB  "
+                f"{result['seconds']:6.2f} s "
+                f"({records / result['seconds']:8.0f} registros/s)  "
+                f"pico de RSS +{result['peak_growth_kb'] / 1024:6.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""
+Suíte de carga e latência da API.
+
+Gera um banco SQLite com dados realistas (muitos usuários, distribuição de
+tarefas concentrada em poucos deles), executa a aplicação FastAPI no
+próprio processo por um cliente ASGI com concorrência configurável e
+reporta latência (p50/p95/p99) e vazão por rota. O resultado vai para um
+arquivo JSON que pode ser comparado com um baseline.
+
+Uso (a partir do diretório `python/`):
+
+    # Gera o banco (uma vez; com o tamanho padrão leva alguns minutos)
+    python -m benchmarks.suite seed --database /tmp/bench.db
+
+    # Mede e grava o resultado
+    python -m benchmarks.suite run --database /tmp/bench.db \\
+        --concurrency 50 --output resultado.json
+
+    # Mede e compara com um resultado anterior (sai com 1 se piorar)
+    python -m benchmarks.suite run --database /tmp/bench.db \\
+        --baseline baseline.json --output resultado.json
+
+    # Só compara dois arquivos
+    python -m benchmarks.suite compare resultado.json baseline.json
+
+O `run` altera o banco (cria subtarefas); para comparações justas, gere
+o banco de novo ou copie o arquivo original antes de cada execução.
+"""
@@ -0,0 +1,174 @@
+"""
+Linha de comando da suíte (`python -m benchmarks.suite --help`).
+"""
+
+import argparse
+import asyncio
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _seed(args) -> None:
+    from benchmarks.suite import dataset
+
+    if os.path.exists(args.database):
+        sys.exit(f"{args.database} já existe; remova-o ou use outro caminho")
+    started = time.perf_counter()
+    counts = dataset.seed(
+        args.database, args.users, args.tasks, args.subtasks,
+        args.skew, args.seed
+    )
+    print(f"banco gerado em {time.perf_counter() - started:.1f} s: {counts}")
+
+
+def _run(args) -> int:
+    from benchmarks.suite import dataset, report, runner
+    from db.database import connect
+
+    if not os.path.exists(args.database):
+        _seed(args)
+
+    routes = args.routes or list(runner.DEFAULT_ROUTES)
+    unknown = [route for route in routes if route not in runner.ROUTES]
+    if unknown:
+        sys.exit(f"rotas desconhecidas: {unknown}; opções: {list(runner.ROUTES)}")
+    requests = {route: args.requests for route in routes}
+    if "POST /login" in requests:
+        # O login é dominado pelo bcrypt; menos requisições bastam
+        requests["POST /login"] = args.login_requests
+
+    conn = connect(args.database)
+    counts = dataset.table_counts(conn)
+    conn.close()
+
+    actors = runner.load_actors(args.database, args.actors, args.seed)
+    results = asyncio.run(runner.run_routes(
+        routes, actors, requests, args.concurrency, args.warmup,
+        args.page_size, args.seed
+    ))
+
+    result = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "environment": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "dataset": counts,
+        "settings": {
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "page_size": args.page_size,
+            "actors": len({actor[0] for actor in actors}),
+        },
+        "routes": results,
+    }
+    report.print_routes(result)
+    if args.output:
+        report.save(result, args.output)
+        print(f"\nresultado gravado em {args.output}")
+
+    if args.baseline:
+        if report.compare(result, report.load(args.baseline), args.tolerance):
+            return 1
+    return 0
+
+
+def _compare(args) -> int:
+    from benchmarks.suite import report
+
+    current = report.load(args.current)
+    report.print_routes(current)
+    return int(report.compare(current, report.load(args.baseline), args.tolerance))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.suite",
+        description="Suíte de carga e latência da API"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_options = argparse.ArgumentParser(add_help=False)
+    seed_options.add_argument("--database", default="bench.db")
+    seed_options.add_argument("--users", type=int, default=10000)
+    seed_options.add_argument("--tasks", type=int, default=1000000)
+    seed_options.add_argument("--subtasks", type=int, default=3000000)
+    seed_options.add_argument(
+        "--skew", type=float, default=1.0,
+        help="expoente da concentração de tarefas por usuário (0 = uniforme)"
+    )
+    seed_options.add_argument("--seed", type=int, default=1)
+
+    compare_options = argparse.ArgumentParser(add_help=False)
+    compare_options.add_argument(
+        "--tolerance", type=float, default=0.15,
+        help="piora aceita em p95/p99/vazão antes de acusar regressão"
+    )
+
+    commands.add_parser(
+        "seed", parents=[seed_options], help="gera o banco de dados"
+    )
+
+    run = commands.add_parser(
+        "run", parents=[seed_options, compare_options],
+        help="mede as rotas (gera o banco antes, se não existir)"
+    )
+    run.add_argument(
+        "--routes", nargs="+", metavar="ROTA",
+        help="rotas medidas, ex.: 'GET /tasks' (padrão: login, tarefas, "
+             "subtarefas e categorias)"
+    )
+    run.add_argument("--requests", type=int, default=2000)
+    run.add_argument("--login-requests", type=int, default=200)
+    run.add_argument("--concurrency", type=int, default=20)
+    run.add_argument("--warmup", type=int, default=50)
+    run.add_argument("--page-size", type=int, default=50)
+    run.add_argument(
+        "--actors", type=int, default=2000,
+        help="tarefas sorteadas para escolher os usuários das requisições"
+    )
+    run.add_argument("--output", help="arquivo JSON do resultado")
+    run.add_argument("--baseline", help="resultado anterior para comparar")
+
+    compare = commands.add_parser(
+        "compare", parents=[compare_options],
+        help="compara dois arquivos de resultado"
+    )
+    compare.add_argument("current")
+    compare.add_argument("baseline")
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        return _compare(args)
+
+    # Antes de qualquer import da aplicação, que lê a configuração do ambiente
+    os.environ["DATABASE_PATH"] = os.path.abspath(args.database)
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+    os.environ.setdefault("LOG_SAMPLE_RATE", "0")
+
+    if args.command == "seed":
+        _seed(args)
+        return 0
+    return _run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+Geração do banco de dados da suíte.
+
+As tabelas base (usuários, categorias, tarefas e subtarefas) são
+preenchidas com inserts em lote no esquema da migração 2, antes dos
+triggers; em seguida as demais migrações rodam normalmente e montam, com
+os próprios backfills, o índice de busca, os contadores de estatísticas e
+o log de sincronização.
+"""
+
+import math
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Tuple
+
+from core.config import BCRYPT_ROUNDS
+from core.security import hash_password
+from db.database import connect
+from db.migrations import migrate
+
+
+PASSWORD = "bench123"
+
+# Primeira migração com triggers; os dados entram antes dela
+_BASE_SCHEMA_VERSION = 2
+
+_BATCH = 50000
+
+_WORDS = (
+    "comprar pagar estudar revisar enviar ligar agendar organizar limpar "
+    "relatório reunião mercado academia projeto conta email documento "
+    "apresentação viagem consulta curso leitura backup orçamento cliente"
+).split()
+_STATUSES = ("pendente", "pendente", "pendente", "concluida")
+_COLORS = ("#F97316", "#3B82F6", "#10B981", "#EF4444", "#8B5CF6", "#EAB308")
+
+
+def email_for(user_id: int) -> str:
+    """Email do usuário de benchmark com o ID informado."""
+    return f"user{user_id}@bench.com"
+
+
+def skewed_counts(total: int, buckets: int, skew: float) -> List[int]:
+    """
+    Distribui `total` itens entre `buckets` com peso 1/(posição+1)^skew.
+
+    Com skew 0 a distribuição é uniforme; com skew 1 (Zipf) o primeiro
+    recebe cerca de 10% de tudo entre 10 mil baldes.
+    """
+    weights = [1 / (i + 1) ** skew for i in range(buckets)]
+    scale = total / sum(weights)
+    counts = [int(w * scale) for w in weights]
+    for i in range(total - sum(counts)):
+        counts[i % buckets] += 1
+    return counts
+
+
+def _batched(rows: Iterator[tuple]) -> Iterator[List[tuple]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= _BATCH:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _insert(conn: sqlite3.Connection, sql: str, rows: Iterator[tuple]) -> int:
+    inserted = 0
+    for batch in _batched(rows):
+        conn.executemany(sql, batch)
+        inserted += len(batch)
+    return inserted
+
+
+def seed(
+    path: str,
+    users: int,
+    tasks: int,
+    subtasks: int,
+    skew: float = 1.0,
+    seed_value: int = 1
+) -> Dict[str, int]:
+    """
+    Cria o banco da suíte em `path` (que não deve existir).
+
+    Args:
+        path: Arquivo do banco
+        users: Quantidade de usuários (todos com a senha PASSWORD)
+        tasks: Total de tarefas, distribuídas com `skewed_counts`
+        subtasks: Total aproximado de subtarefas (geométrica por tarefa)
+        skew: Expoente da concentração de tarefas por usuário
+        seed_value: Semente do gerador aleatório
+
+    Returns:
+        Dict[str, int]: Quantidade de linhas de cada tabela
+    """
+    rng = random.Random(seed_value)
+    now = datetime(2025, 1, 1)
+    # Um único hash: o custo do login continua sendo o do BCRYPT_ROUNDS
+    password_hash = hash_password(PASSWORD, BCRYPT_ROUNDS)
+
+    conn = connect(path)
+    conn.execute("PRAGMA synchronous = OFF")
+    migrate(conn, target=_BASE_SCHEMA_VERSION)
+
+    started = time.perf_counter()
+    conn.execute("BEGIN")
+    _insert(
+        conn,
+        "INSERT INTO users (id, email, password_hash) VALUES (?, ?, ?)",
+        ((i, email_for(i), password_hash) for i in range(1, users + 1))
+    )
+
+    categories: Dict[int, Tuple[int, int]] = {}
+
+    def category_rows():
+        next_id = 1
+        for user_id in range(1, users + 1):
+            count = rng.randint(0, 6)
+            categories[user_id] = (next_id, count)
+            for n in range(count):
+                yield (next_id, user_id, f"{rng.choice(_WORDS).title()} {n}",
+                       rng.choice(_COLORS))
+                next_id += 1
+
+    _insert(
+        conn,
+        "INSERT INTO categories (id, user_id, nome, cor) VALUES (?, ?, ?, ?)",
+        category_rows()
+    )
+
+    per_user = skewed_counts(tasks, users, skew)
+    # A concentração não acompanha o ID: usuários pesados ficam espalhados
+    rng.shuffle(per_user)
+    mean_subtasks = subtasks / tasks if tasks else 0
+    # Geométrica com média `mean_subtasks`
+    keep = mean_subtasks / (mean_subtasks + 1) if mean_subtasks else 0
+    subtask_counts: List[int] = []
+
+    def task_rows():
+        task_id = 0
+        for user_id, count in enumerate(per_user, start=1):
+            first_category, category_count = categories[user_id]
+            for _ in range(count):
+                task_id += 1
+                created = now - timedelta(seconds=rng.randint(0, 365 * 86400))
+                due = None
+                if rng.random() < 0.6:
+                    due = (now + timedelta(days=rng.randint(-30, 90))).date()
+                category = None
+                if category_count and rng.random() < 0.7:
+                    category = first_category + rng.randrange(category_count)
+                n = 0
+                if keep:
+                    n = int(math.log(1 - rng.random()) / math.log(keep))
+                subtask_counts.append(n)
+                yield (
+                    task_id, user_id, category,
+                    " ".join(rng.choices(_WORDS, k=3)),
+                    " ".join(rng.choices(_WORDS, k=10)),
+                    rng.choice(_STATUSES),
+                    created.strftime("%Y-%m-%d %H:%M:%S"),
+                    due.isoformat() if due else None,
+                )
+
+    _insert(
+        conn,
+        "INSERT INTO tasks (id, user_id, categoria_id, titulo, descricao, "
+        "status, data_criacao, data_vencimento) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        task_rows()
+    )
+
+    def subtask_rows():
+        for task_id, count in enumerate(subtask_counts, start=1):
+            for n in range(count):
+                yield (task_id, f"Passo {n + 1}", rng.random() < 0.4, n)
+
+    _insert(
+        conn,
+        "INSERT INTO subtasks (task_id, titulo, concluida, ordem) "
+        "VALUES (?, ?, ?, ?)",
+        subtask_rows()
+    )
+    conn.commit()
+    print(f"dados base inseridos em {time.perf_counter() - started:.1f} s")
+
+    started = time.perf_counter()
+    migrate(conn)
+    conn.execute("ANALYZE")
+    print(f"migrações e backfills em {time.perf_counter() - started:.1f} s")
+
+    result = table_counts(conn)
+    conn.close()
+    return result
+
+
+def table_counts(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Quantidade de linhas das tabelas base."""
+    return {
+        table: conn.execute(f"SELECT COUNT(*) AS n FROM {table}").fetchone()["n"]
+        for table in ("users", "categories", "tasks", "subtasks")
+    }
@@ -0,0 +1,118 @@
+"""
+Estatísticas, arquivo de resultado e comparação com baseline.
+"""
+
+import json
+import math
+from typing import Dict, List, Optional
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Percentil pelo método nearest-rank (`sorted_values` já ordenado)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict:
+    """
+    Resume as medições de uma rota.
+
+    Args:
+        latencies: Duração de cada requisição, em segundos
+        errors: Requisições com status fora de 2xx
+        elapsed: Duração total da rodada, em segundos
+
+    Returns:
+        Dict: Contagens, vazão (req/s) e latências em milissegundos
+    """
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        "requests": count,
+        "errors": errors,
+        "rps": round(count / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(sum(values) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3) if count else 0.0,
+    }
+
+
+def save(result: Dict, path: str) -> None:
+    """Grava o resultado em JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def load(path: str) -> Dict:
+    """Lê um resultado gravado por `save`."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def print_routes(result: Dict) -> None:
+    """Imprime a tabela de rotas de um resultado."""
+    print(
+        f"{'rota':32} {'req':>6} {'erros':>6} {'req/s':>8} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    )
+    for route, stats in result["routes"].items():
+        print(
+            f"{route:32} {stats['requests']:6} {stats['errors']:6} "
+            f"{stats['rps']:8.1f} {stats['p50_ms']:9.2f} "
+            f"{stats['p95_ms']:9.2f} {stats['p99_ms']:9.2f}"
+        )
+
+
+def _change(current: float, baseline: float) -> Optional[float]:
+    if not baseline:
+        return None
+    return (current - baseline) / baseline
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> bool:
+    """
+    Compara dois resultados rota a rota e imprime as diferenças.
+
+    Uma rota regride quando o p95 ou o p99 sobem, ou a vazão cai, mais que
+    `tolerance` (fração; 0.15 = 15%), ou quando passa a ter erros.
+
+    Returns:
+        bool: True se alguma rota regrediu
+    """
+    regressed = False
+    print(f"\ncomparação com o baseline (tolerância {tolerance:.0%})")
+    for route, stats in current["routes"].items():
+        base = baseline.get("routes", {}).get(route)
+        if base is None:
+            print(f"{route:32} sem baseline")
+            continue
+
+        changes = {
+            "p95": _change(stats["p95_ms"], base["p95_ms"]),
+            "p99": _change(stats["p99_ms"], base["p99_ms"]),
+            "rps": _change(stats["rps"], base["rps"]),
+        }
+        problems = [
+            name for name, change in changes.items()
+            if change is not None
+            and (change < -tolerance if name == "rps" else change > tolerance)
+        ]
+        if stats["errors"] and not base["errors"]:
+            problems.append("erros")
+
+        regressed = regressed or bool(problems)
+        formatted = "  ".join(
+            f"{name} {'n/d' if change is None else f'{change:+.1%}'}"
+            for name, change in changes.items()
+        )
+        verdict = f"REGRESSÃO ({', '.join(problems)})" if problems else "ok"
+        print(f"{route:32} {formatted}  {verdict}")
+
+    if current.get("dataset") != baseline.get("dataset"):
+        print("atenção: os bancos das duas execuções têm tamanhos diferentes")
+    return regressed
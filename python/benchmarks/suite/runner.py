@@ -0,0 +1,180 @@
+"""
+Execução da carga contra a aplicação, no próprio processo.
+
+As requisições passam pela pilha ASGI completa (middlewares, dependências,
+pool de conexões e executor do banco) por meio do `httpx.ASGITransport`,
+sem rede nem servidor. Os usuários de cada requisição são sorteados a
+partir de tarefas aleatórias, então quem tem mais tarefas aparece mais,
+como na distribuição de uso real.
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+
+from benchmarks.suite.dataset import PASSWORD
+from benchmarks.suite.report import summarize
+
+
+# Usuário sorteado: (id, email, token, ID de uma tarefa dele)
+Actor = Tuple[int, str, str, int]
+RequestSpec = Tuple[str, str, Dict[str, Any]]
+
+
+def _auth(actor: Actor) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {actor[2]}"}
+
+
+def _login(actor: Actor, page_size: int) -> RequestSpec:
+    return "POST", "/login", {"data": {"username": actor[1], "password": PASSWORD}}
+
+
+def _tasks(actor: Actor, page_size: int) -> RequestSpec:
+    return "GET", "/tasks", {"params": {"limit": page_size}, "headers": _auth(actor)}
+
+
+def _subtasks(actor: Actor, page_size: int) -> RequestSpec:
+    return "POST", f"/tasks/{actor[3]}/subtasks", {
+        "json": {"titulo": "Subtarefa de benchmark"},
+        "headers": _auth(actor),
+    }
+
+
+def _categories(actor: Actor, page_size: int) -> RequestSpec:
+    return "GET", "/categories", {"headers": _auth(actor)}
+
+
+def _stats(actor: Actor, page_size: int) -> RequestSpec:
+    return "GET", "/tasks/stats", {"headers": _auth(actor)}
+
+
+def _search(actor: Actor, page_size: int) -> RequestSpec:
+    return "GET", "/tasks/search", {
+        "params": {"q": "relatório", "limit": 20},
+        "headers": _auth(actor),
+    }
+
+
+ROUTES: Dict[str, Callable[[Actor, int], RequestSpec]] = {
+    "POST /login": _login,
+    "GET /tasks": _tasks,
+    "POST /tasks/{task_id}/subtasks": _subtasks,
+    "GET /categories": _categories,
+    "GET /tasks/stats": _stats,
+    "GET /tasks/search": _search,
+}
+
+DEFAULT_ROUTES = (
+    "POST /login",
+    "GET /tasks",
+    "POST /tasks/{task_id}/subtasks",
+    "GET /categories",
+)
+
+
+def load_actors(path: str, count: int, seed_value: int) -> List[Actor]:
+    """
+    Sorteia `count` tarefas e devolve os donos delas, com token JWT.
+
+    Sortear tarefas em vez de usuários dá a cada usuário um peso
+    proporcional à quantidade de tarefas que ele tem.
+    """
+    from core.security import create_access_token
+    from db.database import connect
+
+    rng = random.Random(seed_value)
+    conn = connect(path)
+    max_id = conn.execute("SELECT MAX(id) AS n FROM tasks").fetchone()["n"] or 0
+    ids = [rng.randint(1, max_id) for _ in range(count)] if max_id else []
+    rows = conn.execute(
+        "SELECT t.id, t.user_id, u.email FROM json_each(?) j "
+        "JOIN tasks t ON t.id = j.value JOIN users u ON u.id = t.user_id",
+        (str(ids),)
+    ).fetchall()
+    conn.close()
+
+    tokens: Dict[str, str] = {}
+    actors = []
+    for row in rows:
+        email = row["email"]
+        if email not in tokens:
+            tokens[email] = create_access_token({"sub": email}, 24 * 60)
+        actors.append((row["user_id"], email, tokens[email], row["id"]))
+    if not actors:
+        raise RuntimeError("O banco não tem tarefas; gere-o com `seed` antes")
+    return actors
+
+
+async def _drive(
+    client: httpx.AsyncClient,
+    specs: List[RequestSpec],
+    concurrency: int
+) -> Tuple[List[float], int, float]:
+    """Executa as requisições com `concurrency` workers; mede cada uma."""
+    latencies: List[float] = []
+    errors = 0
+    pending = iter(specs)
+
+    async def worker():
+        nonlocal errors
+        for method, url, kwargs in pending:
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - start)
+            if not 200 <= response.status_code < 300:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+async def run_routes(
+    routes: List[str],
+    actors: List[Actor],
+    requests: Dict[str, int],
+    concurrency: int,
+    warmup: int,
+    page_size: int,
+    seed_value: int
+) -> Dict[str, Dict]:
+    """
+    Mede cada rota em sequência, com a aplicação iniciada pelo lifespan.
+
+    Args:
+        routes: Nomes das rotas (chaves de ROUTES)
+        actors: Usuários sorteados por `load_actors`
+        requests: Quantidade de requisições medidas por rota
+        concurrency: Requisições simultâneas
+        warmup: Requisições descartadas antes da medição de cada rota
+        page_size: `limit` de GET /tasks
+        seed_value: Semente do sorteio dos usuários de cada requisição
+
+    Returns:
+        Dict[str, Dict]: Resumo (`report.summarize`) por rota
+    """
+    from main import app
+
+    rng = random.Random(seed_value)
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=None
+        ) as client:
+            for route in routes:
+                build = ROUTES[route]
+                count = requests[route]
+                specs = [
+                    build(rng.choice(actors), page_size)
+                    for _ in range(warmup + count)
+                ]
+                await _drive(client, specs[:warmup], concurrency)
+                latencies, errors, elapsed = await _drive(
+                    client, specs[warmup:], concurrency
+                )
+                results[route] = summarize(latencies, errors, elapsed)
+    return results
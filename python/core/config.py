@@ -10,3 +10,76 @@ SECRET_KEY = os.getenv(
 )
 
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+
+# Paginação da listagem de tarefas
+TASKS_PAGE_DEFAULT_LIMIT = int(os.getenv("TASKS_PAGE_DEFAULT_LIMIT", "50"))
+TASKS_PAGE_MAX_LIMIT = int(os.getenv("TASKS_PAGE_MAX_LIMIT", "200"))
+
+# Tarefas por bloco na listagem em streaming (GET /tasks?stream=true)
+TASKS_STREAM_BATCH_SIZE = int(os.getenv("TASKS_STREAM_BATCH_SIZE", "200"))
+
+# Tamanho máximo de um lote em POST /tasks/bulk
+TASKS_BULK_MAX_SIZE = int(os.getenv("TASKS_BULK_MAX_SIZE", "500"))
+
+# Banco de dados
+DATABASE_PATH = os.getenv("DATABASE_PATH", "todolist.db")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+DB_CACHE_SIZE_KB = int(os.getenv("DB_CACHE_SIZE_KB", "16384"))
+DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", str(DB_POOL_SIZE)))
+# Conexões abertas na partida da aplicação (0 desliga)
+DB_POOL_WARM_SIZE = int(os.getenv("DB_POOL_WARM_SIZE", str(DB_POOL_SIZE)))
+
+# Hash de senhas (bcrypt)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32"))
+
+# Cache de tokens verificados
+AUTH_CACHE_MAXSIZE = int(os.getenv("AUTH_CACHE_MAXSIZE", "10000"))
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "300"))
+
+# Escritor único com group commit (opcional)
+DB_SINGLE_WRITER = os.getenv("DB_SINGLE_WRITER", "0").lower() in ("1", "true", "yes")
+DB_WRITER_BATCH_WINDOW_MS = float(os.getenv("DB_WRITER_BATCH_WINDOW_MS", "2"))
+DB_WRITER_MAX_BATCH = int(os.getenv("DB_WRITER_MAX_BATCH", "64"))
+
+# Eventos de alteração (GET /events)
+EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "local")  # "local" ou "sqlite"
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+EVENTS_BUFFER_SIZE = int(os.getenv("EVENTS_BUFFER_SIZE", "100"))
+EVENTS_POLL_INTERVAL_MS = float(os.getenv("EVENTS_POLL_INTERVAL_MS", "500"))
+EVENTS_LOG_RETENTION_SECONDS = float(os.getenv("EVENTS_LOG_RETENTION_SECONDS", "3600"))
+
+# Sincronização incremental (GET /sync)
+SYNC_PAGE_DEFAULT_LIMIT = int(os.getenv("SYNC_PAGE_DEFAULT_LIMIT", "1000"))
+SYNC_PAGE_MAX_LIMIT = int(os.getenv("SYNC_PAGE_MAX_LIMIT", "5000"))
+SYNC_TOMBSTONE_RETENTION_DAYS = float(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+# Intervalo da compactação automática dos tombstones (0 desliga)
+SYNC_COMPACT_INTERVAL_SECONDS = float(os.getenv("SYNC_COMPACT_INTERVAL_SECONDS", "3600"))
+
+# Exportação e importação (GET /export, POST /import)
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+# Registros por transação da importação
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "5000"))
+# Registros inválidos aceitos antes de interromper a importação
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+
+# Logs
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Fração das requisições bem-sucedidas registradas (erros e lentas: todas)
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+LOG_SLOW_REQUEST_MS = float(os.getenv("LOG_SLOW_REQUEST_MS", "500"))
+
+# Métricas (GET /metrics). Com vários workers, aponte PROMETHEUS_MULTIPROC_DIR
+# para um diretório vazio, compartilhado por eles e limpo a cada deploy
+METRICS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+# Profiler de SQL por requisição: "off", "header" (só com X-SQL-Profile: 1)
+# ou "always"
+SQL_PROFILE = os.getenv("SQL_PROFILE", "off").lower()
+# Uma instrução normalizada executada mais vezes que isto marca a
+# requisição como suspeita de N+1
+SQL_PROFILE_REPEAT_THRESHOLD = int(os.getenv("SQL_PROFILE_REPEAT_THRESHOLD", "10"))
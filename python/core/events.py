@@ -0,0 +1,292 @@
+"""
+Eventos de alteração dos dados (pub/sub).
+
+As rotas de escrita publicam, depois do commit, um evento por alteração
+(`task.created`, `subtask.deleted`, `category.updated`...) com os IDs
+afetados e a versão dos dados do usuário. `GET /events` entrega os eventos
+de cada usuário às conexões SSE abertas por ele.
+
+O transporte entre quem publica e quem assina é um backend plugável
+(EVENTS_BACKEND):
+
+- "local": entrega direta dentro do processo; serve quando há um só worker.
+- "sqlite": os eventos são gravados na tabela `event_log` e cada worker lê
+  os novos por polling, então uma escrita feita em um worker chega às
+  conexões abertas em todos os outros.
+
+Cada assinatura tem um buffer limitado (EVENTS_BUFFER_SIZE). Se o cliente
+não acompanhar, os eventos pendentes são descartados e ele recebe um único
+evento `resync`, indicando que deve recarregar os dados.
+"""
+
+import asyncio
+import contextlib
+import logging
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+import orjson
+
+from core.config import (
+    DATABASE_PATH,
+    EVENTS_BACKEND,
+    EVENTS_BUFFER_SIZE,
+    EVENTS_LOG_RETENTION_SECONDS,
+    EVENTS_POLL_INTERVAL_MS
+)
+from db.database import connect, run_db
+from repositories import events_repo
+
+
+logger = logging.getLogger(__name__)
+
+Event = Dict[str, Any]
+
+RESYNC_EVENT: Event = {"type": "resync"}
+
+
+def make_event(
+    entity: str,
+    action: str,
+    ids: List[int],
+    version: int
+) -> Event:
+    """
+    Monta um evento de alteração.
+
+    Args:
+        entity: "task", "subtask" ou "category"
+        action: "created", "updated" ou "deleted"
+        ids: IDs dos registros afetados
+        version: Versão dos dados do usuário após a alteração
+    """
+    return {
+        "type": f"{entity}.{action}",
+        "entity": entity,
+        "action": action,
+        "ids": ids,
+        "version": version,
+    }
+
+
+class Subscription:
+    """Fila limitada de eventos de uma conexão SSE."""
+
+    def __init__(self, maxsize: int):
+        self._queue: "asyncio.Queue[Event]" = asyncio.Queue(maxsize)
+
+    def push(self, event: Event) -> None:
+        """Enfileira um evento; no estouro do buffer, troca tudo por `resync`."""
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(RESYNC_EVENT)
+
+    async def get(self) -> Event:
+        """Aguarda o próximo evento."""
+        return await self._queue.get()
+
+
+class EventBroker:
+    """
+    Base dos backends de eventos.
+
+    Mantém as assinaturas do processo e as entrega (`_dispatch`); cada
+    backend define como um evento publicado chega até aqui.
+    """
+
+    def __init__(self, buffer_size: int):
+        self.buffer_size = buffer_size
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+
+    async def publish(self, user_id: int, event: Event) -> None:
+        """Publica um evento para as conexões do usuário."""
+        raise NotImplementedError
+
+    async def start(self) -> None:
+        """Inicia tarefas de fundo do backend, se houver."""
+
+    async def close(self) -> None:
+        """Encerra as tarefas de fundo do backend."""
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, user_id: int) -> AsyncIterator[Subscription]:
+        """Registra uma assinatura dos eventos do usuário enquanto durar o bloco."""
+        await self.start()
+        subscription = Subscription(self.buffer_size)
+        self._subscribers.setdefault(user_id, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscriptions = self._subscribers.get(user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscribers[user_id]
+
+    def stats(self) -> Dict[str, int]:
+        """Quantidade de usuários e de conexões com assinatura ativa."""
+        return {
+            "users": len(self._subscribers),
+            "subscriptions": sum(len(s) for s in self._subscribers.values()),
+        }
+
+    def _dispatch(self, user_id: int, event: Event) -> None:
+        for subscription in list(self._subscribers.get(user_id, ())):
+            subscription.push(event)
+
+
+class LocalBroker(EventBroker):
+    """Backend "local": entrega os eventos só dentro do processo atual."""
+
+    def __init__(self, buffer_size: int):
+        super().__init__(buffer_size)
+        self._last_id = 0
+
+    async def publish(self, user_id: int, event: Event) -> None:
+        self._last_id += 1
+        self._dispatch(user_id, {**event, "id": self._last_id})
+
+
+class SQLiteBroker(EventBroker):
+    """
+    Backend "sqlite": eventos passam pela tabela `event_log`.
+
+    Args:
+        path: Caminho do arquivo do banco
+        buffer_size: Tamanho do buffer de cada assinatura
+        poll_interval: Intervalo, em segundos, entre leituras do log
+        retention: Idade máxima, em segundos, dos eventos mantidos no log
+    """
+
+    # Eventos lidos por consulta de polling
+    _BATCH = 500
+
+    def __init__(
+        self,
+        path: str,
+        buffer_size: int,
+        poll_interval: float,
+        retention: float
+    ):
+        super().__init__(buffer_size)
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._conn = None
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        # Várias assinaturas chegando juntas não podem criar dois pollers
+        self._start_lock = asyncio.Lock()
+        self._last_id = 0
+        self._last_prune = 0.0
+
+    def _execute(self, func, *args):
+        """Executa uma função do repositório na conexão própria do backend."""
+        with self._lock:
+            if self._conn is None:
+                self._conn = connect(self.path)
+                # Autocommit: cada evento é gravado assim que publicado
+                self._conn.isolation_level = None
+            return func(self._conn, *args)
+
+    async def publish(self, user_id: int, event: Event) -> None:
+        await run_db(
+            self._execute,
+            events_repo.insert_event,
+            user_id,
+            orjson.dumps(event).decode("utf-8")
+        )
+
+    async def start(self) -> None:
+        async with self._start_lock:
+            if self._task is None:
+                self._last_id = await run_db(
+                    self._execute, events_repo.get_last_event_id
+                )
+                self._task = asyncio.create_task(self._poll())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self._poll_once()
+            except Exception as e:
+                logger.error(f"Falha ao ler o log de eventos: {e}")
+
+    async def _poll_once(self) -> None:
+        rows = await run_db(
+            self._execute,
+            events_repo.get_events_after,
+            self._last_id,
+            self._BATCH
+        )
+        for row in rows:
+            self._last_id = row["id"]
+            event = orjson.loads(row["payload"])
+            self._dispatch(row["user_id"], {**event, "id": row["id"]})
+
+        now = time.time()
+        if now - self._last_prune >= self.retention / 10:
+            self._last_prune = now
+            await run_db(
+                self._execute,
+                events_repo.delete_events_before,
+                now - self.retention
+            )
+
+
+_broker: Optional[EventBroker] = None
+
+
+def get_broker() -> EventBroker:
+    """Retorna o backend de eventos configurado em EVENTS_BACKEND."""
+    global _broker
+    if _broker is None:
+        if EVENTS_BACKEND == "sqlite":
+            _broker = SQLiteBroker(
+                DATABASE_PATH,
+                EVENTS_BUFFER_SIZE,
+                EVENTS_POLL_INTERVAL_MS / 1000,
+                EVENTS_LOG_RETENTION_SECONDS
+            )
+        elif EVENTS_BACKEND == "local":
+            _broker = LocalBroker(EVENTS_BUFFER_SIZE)
+        else:
+            raise ValueError(f"EVENTS_BACKEND inválido: {EVENTS_BACKEND!r}")
+    return _broker
+
+
+async def close_broker() -> None:
+    """Encerra o backend de eventos, se existir."""
+    global _broker
+    if _broker is not None:
+        await _broker.close()
+        _broker = None
+
+
+async def publish_event(user_id: int, event: Event) -> None:
+    """
+    Publica um evento sem propagar falhas.
+
+    Usada como tarefa de fundo das rotas: a escrita já foi commitada e
+    respondida, então um erro aqui só é registrado.
+    """
+    try:
+        await get_broker().publish(user_id, event)
+    except Exception as e:
+        logger.error(f"Falha ao publicar evento {event.get('type')}: {e}")
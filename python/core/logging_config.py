@@ -0,0 +1,89 @@
+"""
+Configuração dos logs da aplicação.
+
+Os handlers da aplicação não escrevem direto no stream: o logger raiz
+recebe um `QueueHandler`, que só enfileira o registro, e um
+`QueueListener` em uma thread própria formata e escreve. Assim a
+formatação e a E/S dos logs ficam fora do caminho das requisições.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+from typing import Optional
+
+from core.config import LOG_LEVEL, LOG_QUEUE_SIZE
+
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que não formata nem bloqueia quem registra o log.
+
+    O registro vai para a fila como está (a mensagem é montada pelo
+    listener), e com a fila cheia ele é descartado e contado em `dropped`.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # A fila é do próprio processo: não é preciso serializar o registro
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_handler: Optional[_NonBlockingQueueHandler] = None
+
+
+def setup_logging() -> None:
+    """
+    Configura o logger raiz com a fila de logs e inicia o listener.
+
+    Idempotente: chamadas seguintes não fazem nada. O listener é parado (e
+    a fila esvaziada) na saída do processo.
+    """
+    global _listener, _handler
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    log_queue: queue.Queue = queue.Queue(LOG_QUEUE_SIZE)
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    _handler = _NonBlockingQueueHandler(log_queue)
+    root.addHandler(_handler)
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Escreve os logs pendentes, para o listener e remove a fila do logger raiz."""
+    global _listener, _handler
+    if _listener is not None:
+        logging.getLogger().removeHandler(_handler)
+        _listener.stop()
+        _listener = None
+        _handler = None
+
+
+def dropped_logs() -> int:
+    """Quantidade de registros descartados por fila cheia."""
+    return _handler.dropped if _handler is not None else 0
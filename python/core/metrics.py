@@ -0,0 +1,117 @@
+"""
+Métricas da aplicação no formato do Prometheus (`GET /metrics`).
+
+As métricas são agregadas no próprio processo pelo `prometheus_client`.
+Com vários workers (ex.: `uvicorn --workers 4`), defina a variável
+PROMETHEUS_MULTIPROC_DIR: cada worker grava seus valores em arquivos
+mapeados em memória nesse diretório e `GET /metrics`, atendido por
+qualquer um deles, soma os valores de todos.
+
+Os filhos por combinação de labels ficam em cache (`LabelCache`), então o
+caminho quente não passa pela trava que `labels()` usa para criá-los.
+"""
+
+import os
+from typing import Dict, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess
+)
+
+from core.config import METRICS_MULTIPROC_DIR
+
+
+class LabelCache:
+    """
+    Cache dos filhos de uma métrica com labels.
+
+    `labels()` do prometheus_client pega uma trava a cada chamada; aqui a
+    busca é um `dict.get` e a trava só é usada na primeira vez de cada
+    combinação.
+    """
+
+    def __init__(self, metric):
+        self._metric = metric
+        self._children: Dict[Tuple[str, ...], object] = {}
+
+    def get(self, *values: str):
+        """Retorna o filho da métrica para os valores de label informados."""
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._metric.labels(*values)
+        return child
+
+
+# Até ~10 s; rotas mais lentas que isso caem em +Inf
+_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0
+)
+_QUERY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0
+)
+
+REQUEST_DURATION = LabelCache(Histogram(
+    "http_request_duration_seconds",
+    "Duração das requisições HTTP, por rota (template) e status",
+    ["method", "route", "status"],
+    buckets=_LATENCY_BUCKETS
+))
+
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requisições HTTP em andamento",
+    # Soma só os workers vivos
+    multiprocess_mode="livesum"
+)
+
+DB_QUERY_DURATION = LabelCache(Histogram(
+    "db_query_duration_seconds",
+    "Duração das funções de repositório executadas no banco",
+    ["function"],
+    buckets=_QUERY_BUCKETS
+))
+
+BCRYPT_OPERATIONS = LabelCache(Counter(
+    "bcrypt_operations_total",
+    "Operações de bcrypt executadas no pool de hash",
+    ["operation"]
+))
+
+AUTH_FAILURES = LabelCache(Counter(
+    "auth_failures_total",
+    "Falhas de autenticação, por motivo",
+    ["reason"]
+))
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Gera o texto de exposição das métricas.
+
+    Returns:
+        Tuple[bytes, str]: Corpo da resposta e o Content-Type
+    """
+    if METRICS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead() -> None:
+    """
+    Remove os valores "live" deste worker no modo multiprocesso.
+
+    Chamada no encerramento da aplicação, para que o gauge de requisições
+    em andamento não some valores de um processo que já saiu.
+    """
+    if METRICS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
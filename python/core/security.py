@@ -2,28 +2,55 @@
 Funções de segurança.
 
 Este módulo contém funções para hash de senhas e geração de tokens JWT.
+
+O bcrypt é intencionalmente lento (centenas de ms por operação), então as
+rotas usam as versões assíncronas, que executam o trabalho em um pool de
+processos de tamanho limitado e com fila máxima.
+
+`bcrypt` e `jwt` são importados no primeiro uso: o bcrypt só roda nos
+processos do pool, e nenhum dos dois pesa na partida da aplicação.
 """
 
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
+from typing import Optional
+
+from core.config import (
+    SECRET_KEY,
+    ALGORITHM,
+    BCRYPT_ROUNDS,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_MAX_QUEUE
+)
+from core.metrics import BCRYPT_OPERATIONS
+
 
-import bcrypt
-import jwt
+logger = logging.getLogger(__name__)
 
-from core.config import SECRET_KEY, ALGORITHM
+class PasswordHasherBusy(Exception):
+    """O pool de hash de senhas está com a fila cheia."""
 
 
-def hash_password(password: str) -> str:
+def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
     """
     Gera um hash bcrypt da senha fornecida.
 
     Args:
         password: Senha em texto plano
+        rounds: Fator de custo do bcrypt
 
     Returns:
         str: Hash da senha
     """
+    import bcrypt
+
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
@@ -39,11 +66,135 @@ def verify_password(password: str, hashed: str) -> bool:
     Returns:
         bool: True se a senha corresponder, False caso contrário
     """
+    import bcrypt
+
     password_bytes = password.encode('utf-8')
     hashed_bytes = hashed.encode('utf-8')
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
+def password_needs_rehash(hashed: str) -> bool:
+    """
+    Indica se o hash foi gerado com um custo diferente do configurado.
+
+    Args:
+        hashed: Hash bcrypt no formato `$2b$<custo>$<salt+hash>`
+
+    Returns:
+        bool: True se o hash deve ser refeito com BCRYPT_ROUNDS
+    """
+    try:
+        return int(hashed.split('$')[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+_hash_pool: Optional[ProcessPoolExecutor] = None
+_hash_pending = 0
+_hash_lock = threading.Lock()
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    """Retorna o pool de processos de hash, criando-o na primeira chamada."""
+    global _hash_pool
+    if _hash_pool is None:
+        # spawn evita herdar threads e conexões abertas do processo da API
+        _hash_pool = ProcessPoolExecutor(
+            max_workers=PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _hash_pool
+
+
+def _replace_broken_pool(broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+    """
+    Troca o pool quebrado (um processo morreu) por um novo.
+
+    Várias operações podem descobrir a quebra ao mesmo tempo; só a primeira
+    descarta o pool, as demais já recebem o substituto.
+    """
+    global _hash_pool
+    with _hash_lock:
+        if _hash_pool is broken:
+            logger.warning("Processo do pool de hash morreu; recriando o pool")
+            _hash_pool = None
+            broken.shutdown(wait=False, cancel_futures=True)
+        return _get_hash_pool()
+
+
+async def _run_in_hash_pool(func, *args):
+    """
+    Executa `func` no pool de processos de hash.
+
+    Se um processo do pool tiver morrido (OOM, kill), o pool é recriado e a
+    operação é repetida uma vez.
+
+    Raises:
+        PasswordHasherBusy: Se já houver PASSWORD_HASH_MAX_QUEUE operações
+            aguardando além das que estão em execução
+    """
+    global _hash_pending
+    with _hash_lock:
+        if _hash_pending >= PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_QUEUE:
+            raise PasswordHasherBusy("Fila de hash de senhas cheia")
+        _hash_pending += 1
+        pool = _get_hash_pool()
+
+    try:
+        try:
+            return await asyncio.wrap_future(pool.submit(func, *args))
+        except BrokenProcessPool:
+            pool = _replace_broken_pool(pool)
+            return await asyncio.wrap_future(pool.submit(func, *args))
+    finally:
+        with _hash_lock:
+            _hash_pending -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    """Versão assíncrona de `hash_password`, executada no pool de processos."""
+    hashed = await _run_in_hash_pool(hash_password, password, BCRYPT_ROUNDS)
+    BCRYPT_OPERATIONS.get("hash").inc()
+    return hashed
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    """Versão assíncrona de `verify_password`, executada no pool de processos."""
+    valid = await _run_in_hash_pool(verify_password, password, hashed)
+    BCRYPT_OPERATIONS.get("verify").inc()
+    return valid
+
+
+def _warm_worker() -> None:
+    """Carrega o bcrypt no processo do pool."""
+    import bcrypt  # noqa: F401
+
+
+async def warm_password_pool() -> None:
+    """
+    Inicia os processos do pool de hash (chamado na partida da aplicação).
+
+    Sem isso, o primeiro login pagaria o spawn dos processos e o import do
+    bcrypt neles.
+    """
+    with _hash_lock:
+        pool = _get_hash_pool()
+    # Uma tarefa por processo: cada submit sem processo livre cria um novo
+    await asyncio.gather(*[
+        asyncio.wrap_future(pool.submit(_warm_worker))
+        for _ in range(PASSWORD_HASH_WORKERS)
+    ])
+
+
+def shutdown_password_pool() -> None:
+    """Encerra o pool de processos de hash, se existir."""
+    global _hash_pool
+    with _hash_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown(wait=True, cancel_futures=True)
+            _hash_pool = None
+
+
 def create_access_token(data: dict, expires_minutes: int) -> str:
     """
     Cria um token JWT com os dados fornecidos.
@@ -55,9 +206,30 @@ def create_access_token(data: dict, expires_minutes: int) -> str:
     Returns:
         str: Token JWT codificado
     """
+    import jwt
+
     payload = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=expires_minutes)
     payload["exp"] = expire
 
     token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
-    return token
\ No newline at end of file
+    return token
+
+
+def decode_access_token(token: str) -> Optional[dict]:
+    """
+    Decodifica e valida um token JWT gerado por `create_access_token`.
+
+    Args:
+        token: Token JWT
+
+    Returns:
+        Optional[dict]: Dados do token, ou None se ele for inválido ou
+        estiver expirado
+    """
+    import jwt
+
+    try:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.PyJWTError:
+        return None
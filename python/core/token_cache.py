@@ -0,0 +1,110 @@
+"""
+Cache de tokens verificados.
+
+Guarda, por token, o usuário resolvido em `get_current_user` (só `id` e
+`email`), para que requisições seguidas com o mesmo token não repitam
+`jwt.decode` e a busca do usuário no banco.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from core.config import AUTH_CACHE_MAXSIZE, AUTH_CACHE_TTL_SECONDS
+
+
+class TokenCache:
+    """
+    Cache LRU com expiração, indexado pelo token JWT.
+
+    Cada entrada vale até o `exp` do token ou até `ttl` segundos, o que vier
+    primeiro. O cache é por processo: com vários workers, uma alteração de
+    usuário só invalida o worker que a executou, e o `ttl` limita por quanto
+    tempo os demais podem servir o valor antigo.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[Any]:
+        """Retorna o usuário associado ao token, se estiver no cache e válido."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, user = entry
+            if expires_at <= now:
+                self._remove(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return user
+
+    def put(self, token: str, user: Any, exp: Optional[float] = None) -> None:
+        """
+        Guarda o usuário resolvido para o token.
+
+        Args:
+            token: Token JWT já verificado
+            user: Usuário resolvido (`id` e `email`)
+            exp: Expiração do token (timestamp Unix), se houver
+        """
+        expires_at = time.time() + self.ttl
+        if exp is not None:
+            expires_at = min(expires_at, exp)
+
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (expires_at, user)
+            self._tokens_by_user.setdefault(user["id"], set()).add(token)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int) -> None:
+        """
+        Remove todas as entradas de um usuário (alterado ou excluído).
+
+        Deve ser chamado depois do commit da alteração; antes dele, outra
+        requisição pode ler a linha antiga e guardá-la de novo.
+        """
+        with self._lock:
+            for token in list(self._tokens_by_user.get(user_id, ())):
+                self._remove(token)
+
+    def clear(self) -> None:
+        """Remove todas as entradas."""
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Retorna tamanho atual e contadores de acerto/erro do cache."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _remove(self, token: str) -> None:
+        """Remove uma entrada; deve ser chamado com o lock adquirido."""
+        _, user = self._entries.pop(token)
+        tokens = self._tokens_by_user.get(user["id"])
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[user["id"]]
+
+
+token_cache = TokenCache(AUTH_CACHE_MAXSIZE, AUTH_CACHE_TTL_SECONDS)
@@ -1,34 +1,514 @@
 """
 Gerenciamento de conexão com banco de dados.
 
-Este módulo fornece funções para obter conexões com o banco SQLite.
+Este módulo mantém um pool de conexões SQLite já configuradas e fornece
+as dependências usadas pelas rotas para obter uma conexão. As rotas
+assíncronas executam as consultas em um executor dedicado ao banco, para
+não ocupar o event loop nem o threadpool do Starlette.
 """
 
-from asyncio.log import logger
-from http.client import HTTPException
+import asyncio
+import contextlib
+import contextvars
+import functools
+import logging
 import sqlite3
-from typing import Generator
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Generator,
+    List,
+    Optional
+)
+
+from fastapi import HTTPException
+
+from core.config import (
+    DATABASE_PATH,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_BUSY_TIMEOUT_MS,
+    DB_CACHE_SIZE_KB,
+    DB_EXECUTOR_WORKERS
+)
+from core.metrics import DB_QUERY_DURATION
+from db.profiler import current_profile
+
+
+logger = logging.getLogger(__name__)
+
+# Linha retornada pelas consultas (veja `dict_row`)
+Row = Dict[str, Any]
+
+# Funções de escrita (`writer_op`) chamadas na unidade de trabalho atual
+# (`db_session_async`); None fora de uma unidade
+_unit_writes: contextvars.ContextVar[Optional[List[str]]] = (
+    contextvars.ContextVar("unit_writes", default=None)
+)
+
+
+def dict_row(cursor: sqlite3.Cursor, row: tuple) -> Row:
+    """
+    Row factory que monta cada linha direto como dicionário.
+
+    O resultado já está pronto para serialização em JSON, sem a conversão
+    `dict(row)` que um `sqlite3.Row` exigiria nas rotas.
+    """
+    return dict(zip([column[0] for column in cursor.description], row))
+
+
+def connect(path: str = DATABASE_PATH) -> sqlite3.Connection:
+    """
+    Abre uma conexão SQLite com a configuração padrão da aplicação.
+
+    Args:
+        path: Caminho do arquivo do banco
+
+    Returns:
+        sqlite3.Connection: Conexão com WAL, busy_timeout,
+        synchronous=NORMAL, foreign_keys e cache maior aplicados, que
+        retorna as linhas como dicionários
+    """
+    conn = sqlite3.connect(
+        path,
+        timeout=DB_BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False
+    )
+    conn.row_factory = dict_row
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute(f"PRAGMA busy_timeout = {int(DB_BUSY_TIMEOUT_MS)}")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA foreign_keys = ON")
+    # Valor negativo = tamanho em KiB
+    conn.execute(f"PRAGMA cache_size = -{int(DB_CACHE_SIZE_KB)}")
+    return conn
+
+
+class PoolTimeoutError(Exception):
+    """Nenhuma conexão ficou livre dentro do tempo limite."""
+
+
+class ConnectionPool:
+    """
+    Pool de conexões SQLite de tamanho fixo.
+
+    As conexões são criadas sob demanda até `size` e reutilizadas entre
+    requisições, já com WAL, busy_timeout, synchronous=NORMAL, foreign_keys
+    e cache maior aplicados. Uma conexão é usada por uma requisição de cada
+    vez, mas pode trocar de thread (as rotas síncronas e as dependências do
+    FastAPI rodam em threads diferentes do threadpool), por isso as conexões
+    são abertas com check_same_thread=False.
+    """
+
+    def __init__(self, path: str, size: int, timeout: float):
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self._idle: List[sqlite3.Connection] = []
+        self._cond = threading.Condition()
+        self._created = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Abre e configura uma nova conexão."""
+        return connect(self.path)
+
+    def acquire(self, timeout: Optional[float] = None) -> sqlite3.Connection:
+        """
+        Retira uma conexão do pool, esperando se todas estiverem em uso.
+
+        Args:
+            timeout: Tempo máximo de espera em segundos (padrão do pool)
+
+        Returns:
+            sqlite3.Connection: Conexão pronta para uso
+
+        Raises:
+            PoolTimeoutError: Se nenhuma conexão ficar livre a tempo
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Pool de conexões encerrado")
+            self._waiting += 1
+            try:
+                while not self._idle and self._created >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._cond.wait(remaining):
+                        raise PoolTimeoutError(
+                            "Tempo esgotado aguardando conexão do banco"
+                        )
+            finally:
+                self._waiting -= 1
+
+            self._in_use += 1
+            if self._idle:
+                return self._idle.pop()
+            # Reserva a vaga antes de abrir a conexão fora do lock
+            self._created += 1
+
+        try:
+            return self._connect()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """
+        Devolve uma conexão ao pool.
+
+        Transações deixadas abertas são desfeitas; conexões com erro são
+        descartadas e a vaga volta a ficar disponível.
+        """
+        broken = False
+        try:
+            # Remove o trace do profiler de SQL, se a requisição ativou
+            conn.set_trace_callback(None)
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            broken = True
+
+        with self._cond:
+            self._in_use -= 1
+            if broken or self._closed:
+                self._created -= 1
+                conn.close()
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+
+    def warm(self, count: Optional[int] = None) -> int:
+        """
+        Abre conexões ociosas até o pool ter `count` (padrão: `size`).
+
+        Cada conexão também lê o esquema do banco, trabalho que a primeira
+        consulta de uma conexão nova faria durante uma requisição.
+
+        Returns:
+            int: Quantidade de conexões abertas
+        """
+        count = self.size if count is None else min(count, self.size)
+        opened = 0
+        while True:
+            with self._cond:
+                if self._closed or self._created >= count:
+                    return opened
+                # Reserva a vaga antes de abrir a conexão fora do lock
+                self._created += 1
+            try:
+                conn = self._connect()
+                conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+            except Exception:
+                with self._cond:
+                    self._created -= 1
+                raise
+            with self._cond:
+                self._idle.append(conn)
+                self._cond.notify()
+            opened += 1
+
+    def close(self) -> None:
+        """Fecha as conexões ociosas e recusa novas aquisições."""
+        with self._cond:
+            self._closed = True
+            for conn in self._idle:
+                conn.close()
+            self._created -= len(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Retorna estatísticas de uso do pool.
+
+        Returns:
+            dict: Tamanho máximo, conexões criadas, em uso, ociosas e
+            requisições aguardando conexão
+        """
+        with self._cond:
+            return {
+                "size": self.size,
+                "created": self._created,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+            }
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Retorna o pool de conexões da aplicação, criando-o na primeira chamada."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DATABASE_PATH, DB_POOL_SIZE, DB_POOL_TIMEOUT)
+    return _pool
+
+
+def close_pool() -> None:
+    """Fecha o pool de conexões da aplicação, se existir."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
 
 
 def get_db() -> Generator:
     """
-    Cria e gerencia uma conexão com o banco de dados SQLite.
+    Obtém uma conexão do pool com o banco de dados SQLite.
+
+    A dependência funciona como unidade de trabalho: os repositórios não
+    fazem commit, e tudo o que a requisição gravou é commitado uma única
+    vez ao final. Se a requisição levantar uma exceção, a transação é
+    desfeita ao devolver a conexão ao pool.
 
     Yields:
         sqlite3.Connection: Conexão com o banco de dados
 
     Note:
-        A conexão é automaticamente fechada após o uso.
+        A conexão é devolvida ao pool após o uso.
         Row factory configurado para retornar dicionários.
     """
+    pool = get_pool()
+    try:
+        conn = pool.acquire()
+    except PoolTimeoutError as e:
+        logger.warning(f"Pool de conexões esgotado: {e}")
+        raise HTTPException(503, "Serviço temporariamente indisponível")
+
+    try:
+        yield conn
+        if conn.in_transaction:
+            conn.commit()
+    except sqlite3.Error as e:
+        logger.error(f"Erro no banco de dados: {e}")
+        raise HTTPException(500, "Erro interno do servidor")
+    finally:
+        pool.release(conn)
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Retorna o executor dedicado às consultas, criando-o na primeira chamada."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=DB_EXECUTOR_WORKERS,
+                    thread_name_prefix="db"
+                )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Encerra o executor do banco, aguardando as consultas em andamento."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+
+async def run_db(func: Callable, *args, **kwargs):
+    """
+    Executa uma função bloqueante de banco no executor dedicado.
+
+    Args:
+        func: Função síncrona (normalmente de um repositório)
+        *args: Argumentos posicionais repassados para a função
+        **kwargs: Argumentos nomeados repassados para a função
+
+    Returns:
+        O valor retornado por `func`
+
+    Note:
+        `func` roda com uma cópia do contexto (contextvars) de quem chamou,
+        então enxerga o estado da requisição, como o `current_profile`.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        get_executor(),
+        context.run,
+        _call_db,
+        functools.partial(func, *args, **kwargs)
+    )
+
+
+def _call_db(call: Callable):
+    """Executa a chamada ao banco e, se houver profiler, marca o fim dela."""
+    try:
+        return call()
+    finally:
+        profile = current_profile.get()
+        if profile is not None:
+            profile.end_call()
+
+
+def to_async(func: Callable) -> Callable:
+    """
+    Cria a versão assíncrona de uma função de repositório.
+
+    A função original continua sendo executada como está, só que no
+    executor do banco (veja `run_db`). Funções de escrita marcadas com
+    `db.writer.writer_op`, no modo de escritor único, são enviadas direto
+    para a thread de escrita, sem ocupar uma thread do executor esperando.
+
+    A duração de cada chamada vai para o histograma `db_query_duration_seconds`
+    com o label `modulo.funcao` (ex.: `tasks_repo.get_tasks_by_user`). No
+    executor só a execução é medida; na thread de escrita, a espera pelo
+    lote e o commit também entram.
+
+    Uma unidade de trabalho (`db_session_async`) chama no máximo uma função
+    de escrita: no modo de escritor único cada chamada é commitada sozinha,
+    então duas delas não seriam atômicas. Escritas que precisam ir juntas
+    ficam em uma única função `writer_op` do repositório, como
+    `tasks_repo.create_tasks_bulk` (tarefas e subtarefas). A regra vale nos
+    dois modos, para que os testes a cubram.
+
+    Raises:
+        RuntimeError: Na segunda função de escrita da mesma unidade de
+        trabalho, antes de executá-la
+    """
+    submit_write = getattr(func, "submit_write", None)
+    label = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+    histogram = DB_QUERY_DURATION.get(label)
+
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - start)
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if submit_write is not None:
+            _claim_unit_write(label)
+            # A conexão da requisição não é usada pela thread de escrita
+            start = time.perf_counter()
+            future = submit_write(*args[1:], **kwargs)
+            if future is not None:
+                try:
+                    return await asyncio.wrap_future(future)
+                finally:
+                    histogram.observe(time.perf_counter() - start)
+        return await run_db(timed, *args, **kwargs)
+
+    return wrapper
+
+
+def _claim_unit_write(label: str) -> None:
+    """Registra a escrita na unidade de trabalho atual (veja `to_async`)."""
+    writes = _unit_writes.get()
+    if writes is None:
+        return
+    if writes:
+        raise RuntimeError(
+            f"{label}: a unidade de trabalho já gravou com {writes[0]}; "
+            "escritas que precisam ser atômicas devem ficar em uma única "
+            "função writer_op"
+        )
+    writes.append(label)
+
+
+async def acquire_async() -> sqlite3.Connection:
+    """
+    Obtém uma conexão do pool a partir de código assíncrono.
+
+    Returns:
+        sqlite3.Connection: Conexão que deve ser devolvida com
+        `get_pool().release`
+
+    Raises:
+        HTTPException: 503 se nenhuma conexão ficar livre a tempo
+
+    Note:
+        Se houver conexão livre ela é obtida sem bloquear; caso contrário a
+        espera acontece fora do event loop e fora do executor do banco, para
+        que as requisições que já têm conexão continuem executando consultas.
+    """
+    pool = get_pool()
+    try:
+        try:
+            conn = pool.acquire(timeout=0)
+        except PoolTimeoutError:
+            conn = await asyncio.to_thread(pool.acquire)
+    except PoolTimeoutError as e:
+        logger.warning(f"Pool de conexões esgotado: {e}")
+        raise HTTPException(503, "Serviço temporariamente indisponível")
+
+    # Requisição com profiler de SQL: registra as instruções desta conexão
+    profile = current_profile.get()
+    if profile is not None:
+        conn.set_trace_callback(profile.trace)
+    return conn
+
+
+@contextlib.asynccontextmanager
+async def db_session_async() -> AsyncIterator[sqlite3.Connection]:
+    """
+    Unidade de trabalho em uma conexão do pool, pelo tempo de um bloco.
+
+    Commit único ao sair do bloco, ou rollback se ele levantar uma exceção.
+    Serve para código que não deve segurar a conexão durante toda a
+    requisição (por exemplo, enquanto espera o hash de uma senha).
+
+    Yields:
+        sqlite3.Connection: Conexão com o banco de dados (veja `acquire_async`)
+
+    Note:
+        O bloco chama no máximo uma função de escrita (veja `to_async`).
+    """
+    pool = get_pool()
+    conn = await acquire_async()
+    writes = _unit_writes.set([])
 
     try:
-        conn = sqlite3.connect("todolist.db")
-        conn.row_factory = sqlite3.Row
         yield conn
+        if conn.in_transaction:
+            await run_db(conn.commit)
     except sqlite3.Error as e:
-        logger.error(f"Erro ao conectar ao banco: {e}")
+        logger.error(f"Erro no banco de dados: {e}")
         raise HTTPException(500, "Erro interno do servidor")
     finally:
-        if conn:
-            conn.close()
\ No newline at end of file
+        _unit_writes.reset(writes)
+        # release() desfaz qualquer transação que tenha ficado aberta
+        await run_db(pool.release, conn)
+
+
+async def get_async_db() -> AsyncGenerator:
+    """
+    Versão assíncrona de `get_db` para rotas `async def`.
+
+    Também é a unidade de trabalho da requisição: commit único ao final,
+    ou rollback se a rota levantar uma exceção (veja `db_session_async`).
+
+    Yields:
+        sqlite3.Connection: Conexão com o banco de dados (veja `acquire_async`)
+    """
+    async with db_session_async() as conn:
+        yield conn
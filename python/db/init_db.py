@@ -1,15 +1,62 @@
 """
 Inicialização do banco de dados.
 
-Este módulo cria as tabelas necessárias no banco SQLite.
+Este módulo leva o esquema do banco SQLite à versão atual. É chamado na
+partida da aplicação (lifespan), uma vez por worker.
 """
 
-from db.database import get_db
+import contextlib
+import logging
+import time
+from typing import Iterator
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
-def init_db():
+from core.config import DATABASE_PATH
+from db.database import connect
+from db.migrations import LATEST_VERSION, get_schema_version, migrate
+
+
+logger = logging.getLogger(__name__)
+
+
+@contextlib.contextmanager
+def _migration_lock(path: str) -> Iterator[None]:
     """
-    Inicializa o banco de dados criando as tabelas necessárias.
+    Lock exclusivo entre processos no arquivo `<banco>.migrate.lock`.
+
+    Garante que só um worker aplique as migrações; os demais esperam e, em
+    seguida, encontram o esquema já atualizado.
+    """
+    with open(f"{path}.migrate.lock", "a+b") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK desiste depois de ~10 s; continua esperando
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def init_db(path: str = DATABASE_PATH) -> int:
+    """
+    Inicializa o banco de dados aplicando as migrações pendentes.
 
     Cria as seguintes tabelas:
         - users: Armazena usuários do sistema
@@ -17,65 +64,35 @@ def init_db():
         - tasks: Armazena tarefas dos usuários
         - subtasks: Armazena subtarefas das tarefas
 
+    Além dos índices usados pelas consultas dos repositórios.
+
+    Args:
+        path: Caminho do arquivo do banco
+
+    Returns:
+        int: Versão do esquema
+
     Note:
-        Esta função é idempotente - pode ser executada múltiplas vezes
-        sem causar erros, pois usa CREATE TABLE IF NOT EXISTS.
+        Esta função é idempotente - a versão do esquema fica em
+        `PRAGMA user_version`. Se ela já for a atual, nenhum DDL é
+        executado; caso contrário as migrações novas são aplicadas sob um
+        lock de arquivo, para que vários workers iniciando juntos não
+        migrem ao mesmo tempo.
     """
-    for conn in get_db():
-        # Tabela de usuários
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                email TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL
-            )
-        """)
-
-        # Tabela de categorias
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS categories (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                nome TEXT NOT NULL,
-                cor TEXT DEFAULT '#F97316',
-                FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-            )
-        """)
-
-
-        
-        # Tabela de tarefas
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                categoria_id INTEGER,
-                titulo TEXT NOT NULL,
-                descricao TEXT,
-                status TEXT DEFAULT 'pendente',
-                data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                data_vencimento DATE,
-                FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
-                FOREIGN KEY (categoria_id) REFERENCES categories (id) ON DELETE SET NULL
-            )
-        """)
-
-        cursor = conn.execute(f"PRAGMA table_info(tasks);")
-
-        columns = [info[1] for info in cursor.fetchall()]
-
-        print(columns)
-
-        # Tabela de subtarefas
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS subtasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                task_id INTEGER NOT NULL,
-                titulo TEXT NOT NULL,
-                concluida BOOLEAN DEFAULT 0,
-                ordem INTEGER DEFAULT 0,
-                FOREIGN KEY (task_id) REFERENCES tasks (id) ON DELETE CASCADE
-            )
-        """)
-
-        conn.commit()
\ No newline at end of file
+    conn = connect(path)
+    try:
+        version = get_schema_version(conn)
+        if version >= LATEST_VERSION:
+            return version
+
+        start = time.perf_counter()
+        with _migration_lock(path):
+            # Outro worker pode ter migrado enquanto este esperava o lock
+            version = migrate(conn)
+        logger.info(
+            f"Esquema do banco na versão {version} "
+            f"({(time.perf_counter() - start) * 1000:.0f} ms)"
+        )
+        return version
+    finally:
+        conn.close()
@@ -0,0 +1,158 @@
+"""
+Comandos de manutenção do banco de dados.
+
+Uso (a partir do diretório `python/`):
+
+    python -m db.maintenance stats-check     # compara task_stats com as tarefas
+    python -m db.maintenance stats-rebuild   # recria task_stats
+    python -m db.maintenance sync-compact    # remove tombstones antigos de /sync
+
+Antes de cada comando o esquema é migrado por `init_db`, sob o mesmo lock de
+arquivo usado pelos workers. A compactação dos tombstones também roda
+periodicamente na aplicação (`run_sync_compaction`).
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+
+from db.database import connect
+from db.init_db import init_db
+from repositories import stats_repo, sync_repo
+
+
+logger = logging.getLogger(__name__)
+
+
+def stats_check(args) -> int:
+    """Lista as divergências de `task_stats`; retorna 1 se houver alguma."""
+    init_db(args.database)
+    conn = connect(args.database)
+    try:
+        mismatches = stats_repo.check_stats(conn)
+    finally:
+        conn.close()
+
+    for item in mismatches:
+        print(
+            f"usuário {item['user_id']} categoria {item['categoria_id']} "
+            f"status {item['status']!r}: esperado {item['esperado']}, "
+            f"atual {item['atual']}"
+        )
+    print(f"{len(mismatches)} divergência(s) em task_stats")
+    return 1 if mismatches else 0
+
+
+def stats_rebuild(args) -> int:
+    """Recria `task_stats` em uma transação."""
+    init_db(args.database)
+    conn = connect(args.database)
+    try:
+        # IMMEDIATE: nenhuma escrita entra entre a limpeza e a recontagem
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            written = stats_repo.rebuild_stats(conn)
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+    finally:
+        conn.close()
+
+    print(f"task_stats recriada com {written} contador(es)")
+    return 0
+
+
+def compact_sync_tombstones(path: str, days: float) -> int:
+    """
+    Remove, em uma transação, os tombstones de `sync_changes` mais antigos
+    que `days` dias.
+
+    Args:
+        path: Caminho do arquivo do banco
+        days: Retenção em dias
+
+    Returns:
+        int: Número de tombstones removidos
+    """
+    before = int(time.time() - days * 86400)
+    conn = connect(path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            removed = sync_repo.compact_tombstones(conn, before)
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+    finally:
+        conn.close()
+    return removed
+
+
+async def run_sync_compaction(path: str, days: float, interval: float) -> None:
+    """
+    Compacta os tombstones a cada `interval` segundos, até ser cancelada.
+
+    Tarefa de fundo iniciada no lifespan. Com vários workers, cada um roda a
+    sua; a compactação é idempotente e a transação IMMEDIATE as serializa.
+    Falhas são registradas e a próxima rodada tenta de novo.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            removed = await asyncio.to_thread(
+                compact_sync_tombstones, path, days
+            )
+        except Exception as e:
+            logger.error(f"Falha ao compactar os tombstones de sync: {e}")
+        else:
+            if removed:
+                logger.info(
+                    f"{removed} tombstone(s) removido(s) de sync_changes"
+                )
+
+
+def sync_compact(args) -> int:
+    """Remove os tombstones de `sync_changes` mais antigos que `--days`."""
+    init_db(args.database)
+    removed = compact_sync_tombstones(args.database, args.days)
+    print(f"{removed} tombstone(s) removido(s) de sync_changes")
+    return 0
+
+
+def main(argv=None) -> int:
+    from core.config import DATABASE_PATH, SYNC_TOMBSTONE_RETENTION_DAYS
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--database",
+        default=DATABASE_PATH,
+        help="Arquivo do banco (padrão: DATABASE_PATH)"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser(
+        "stats-check", help="Compara task_stats com as tarefas"
+    ).set_defaults(handler=stats_check)
+    commands.add_parser(
+        "stats-rebuild", help="Recria task_stats a partir das tarefas"
+    ).set_defaults(handler=stats_rebuild)
+    compact = commands.add_parser(
+        "sync-compact", help="Remove tombstones antigos de sync_changes"
+    )
+    compact.add_argument(
+        "--days",
+        type=float,
+        default=SYNC_TOMBSTONE_RETENTION_DAYS,
+        help="Retenção em dias (padrão: SYNC_TOMBSTONE_RETENTION_DAYS)"
+    )
+    compact.set_defaults(handler=sync_compact)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
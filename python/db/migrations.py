@@ -0,0 +1,598 @@
+"""
+Migrações do esquema do banco de dados.
+
+Este módulo mantém a lista ordenada de migrações do esquema SQLite. A versão
+aplicada fica guardada em `PRAGMA user_version`, então cada migração roda uma
+única vez por banco, dentro de uma transação própria.
+"""
+
+import sqlite3
+from typing import List, NamedTuple, Optional
+
+
+class Migration(NamedTuple):
+    """
+    Passo de migração do esquema.
+
+    Attributes:
+        version: Versão do esquema após aplicar o passo
+        description: Descrição curta da mudança
+        statements: Comandos SQL executados em ordem
+    """
+
+    version: int
+    description: str
+    statements: List[str]
+
+
+def _sync_trigger(table: str, entity: str, event: str) -> str:
+    """
+    Trigger de versão + log de alterações (`sync_changes`) de uma tabela.
+
+    Incrementa a versão do dono dos dados, como na migração 3, e grava na
+    mesma hora a versão resultante na linha da entidade em `sync_changes`
+    (DELETE vira tombstone). Os dois passos ficam no mesmo trigger porque o
+    SQLite não garante a ordem entre triggers do mesmo evento.
+    """
+    ref = "OLD" if event == "DELETE" else "NEW"
+    if table == "subtasks":
+        # O dono da subtarefa é o dono da tarefa
+        bump = f"SELECT user_id, 1 FROM tasks WHERE id = {ref}.task_id"
+        source = (
+            "FROM tasks t JOIN user_data_versions v ON v.user_id = t.user_id "
+            f"WHERE t.id = {ref}.task_id"
+        )
+    else:
+        bump = f"VALUES ({ref}.user_id, 1)"
+        source = f"FROM user_data_versions v WHERE v.user_id = {ref}.user_id"
+
+    statements = f"""
+            INSERT INTO user_data_versions (user_id, version)
+            {bump}
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+            INSERT INTO sync_changes
+                (entity, entity_id, user_id, version, deleted, changed_at)
+            SELECT '{entity}', {ref}.id, v.user_id, v.version,
+                   {int(event == "DELETE")},
+                   CAST(strftime('%s', 'now') AS INTEGER)
+            {source}
+            ON CONFLICT (entity, entity_id) DO UPDATE SET
+                user_id = excluded.user_id,
+                version = excluded.version,
+                deleted = excluded.deleted,
+                changed_at = excluded.changed_at;"""
+    if table == "subtasks" and event == "DELETE":
+        # Excluída em cascata com a tarefa: a tarefa já não existe, então
+        # não há versão a gravar; o tombstone da tarefa cobre a subtarefa
+        statements += """
+            DELETE FROM sync_changes
+            WHERE entity = 'subtask' AND entity_id = OLD.id
+              AND NOT EXISTS (SELECT 1 FROM tasks WHERE id = OLD.task_id);"""
+
+    return f"""
+        CREATE TRIGGER trg_{table}_version_{event.lower()}
+        AFTER {event} ON {table}
+        BEGIN{statements}
+        END
+        """
+
+
+_SYNC_TABLES = (("tasks", "task"), ("subtasks", "subtask"), ("categories", "category"))
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Tabelas iniciais", [
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS categories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            nome TEXT NOT NULL,
+            cor TEXT DEFAULT '#F97316',
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            categoria_id INTEGER,
+            titulo TEXT NOT NULL,
+            descricao TEXT,
+            status TEXT DEFAULT 'pendente',
+            data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            data_vencimento DATE,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+            FOREIGN KEY (categoria_id) REFERENCES categories (id) ON DELETE SET NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS subtasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id INTEGER NOT NULL,
+            titulo TEXT NOT NULL,
+            concluida BOOLEAN DEFAULT 0,
+            ordem INTEGER DEFAULT 0,
+            FOREIGN KEY (task_id) REFERENCES tasks (id) ON DELETE CASCADE
+        )
+        """,
+    ]),
+    Migration(2, "Índices das consultas dos repositórios", [
+        # tasks_repo.get_tasks_by_user: filtro por usuário + ordenação/cursor
+        """
+        CREATE INDEX IF NOT EXISTS idx_tasks_user_criacao
+        ON tasks (user_id, data_criacao DESC, id DESC)
+        """,
+        # tasks_repo.get_tasks_by_user com filtro de categoria
+        """
+        CREATE INDEX IF NOT EXISTS idx_tasks_user_categoria_criacao
+        ON tasks (user_id, categoria_id, data_criacao DESC, id DESC)
+        """,
+        # tasks_repo.get_tasks_by_user com filtro de vencimento
+        """
+        CREATE INDEX IF NOT EXISTS idx_tasks_user_vencimento
+        ON tasks (user_id, data_vencimento)
+        """,
+        # ON DELETE SET NULL ao excluir uma categoria
+        """
+        CREATE INDEX IF NOT EXISTS idx_tasks_categoria
+        ON tasks (categoria_id)
+        """,
+        # subtasks_repo: busca por tarefa ordenada e MAX(ordem)
+        """
+        CREATE INDEX IF NOT EXISTS idx_subtasks_task_ordem
+        ON subtasks (task_id, ordem, id)
+        """,
+        # categories_repo.get_categories_by_user
+        """
+        CREATE INDEX IF NOT EXISTS idx_categories_user_nome
+        ON categories (user_id, nome)
+        """,
+    ]),
+    Migration(3, "Versão dos dados por usuário (ETag)", [
+        """
+        CREATE TABLE IF NOT EXISTS user_data_versions (
+            user_id INTEGER PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        # Toda escrita em tarefas, subtarefas e categorias incrementa a
+        # versão do dono dos dados
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_version_insert
+        AFTER INSERT ON tasks
+        BEGIN
+            INSERT INTO user_data_versions (user_id, version)
+            VALUES (NEW.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_version_update
+        AFTER UPDATE ON tasks
+        BEGIN
+            INSERT INTO user_data_versions (user_id, version)
+            VALUES (NEW.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_version_delete
+        AFTER DELETE ON tasks
+        BEGIN
+            INSERT INTO user_data_versions (user_id, version)
+            VALUES (OLD.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_categories_version_insert
+        AFTER INSERT ON categories
+        BEGIN
+            INSERT INTO user_data_versions (user_id, version)
+            VALUES (NEW.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_categories_version_update
+        AFTER UPDATE ON categories
+        BEGIN
+            INSERT INTO user_data_versions (user_id, version)
+            VALUES (NEW.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_categories_version_delete
+        AFTER DELETE ON categories
+        BEGIN
+            INSERT INTO user_data_versions (user_id, version)
+            VALUES (OLD.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_subtasks_version_insert
+        AFTER INSERT ON subtasks
+        BEGIN
+            INSERT INTO user_data_versions (user_id, version)
+            SELECT user_id, 1 FROM tasks WHERE id = NEW.task_id
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_subtasks_version_update
+        AFTER UPDATE ON subtasks
+        BEGIN
+            INSERT INTO user_data_versions (user_id, version)
+            SELECT user_id, 1 FROM tasks WHERE id = NEW.task_id
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_subtasks_version_delete
+        AFTER DELETE ON subtasks
+        BEGIN
+            INSERT INTO user_data_versions (user_id, version)
+            SELECT user_id, 1 FROM tasks WHERE id = OLD.task_id
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+        END
+        """,
+    ]),
+    Migration(4, "Busca textual (FTS5) em tarefas e subtarefas", [
+        # Uma linha por tarefa (rowid = tasks.id); `subtarefas` junta os
+        # títulos das subtarefas da tarefa
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+            titulo,
+            descricao,
+            subtarefas,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+        """,
+        """
+        INSERT INTO tasks_fts (rowid, titulo, descricao, subtarefas)
+        SELECT
+            t.id,
+            t.titulo,
+            t.descricao,
+            (SELECT group_concat(s.titulo, ' ') FROM subtasks s
+             WHERE s.task_id = t.id)
+        FROM tasks t
+        WHERE t.id NOT IN (SELECT rowid FROM tasks_fts)
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_insert
+        AFTER INSERT ON tasks
+        BEGIN
+            INSERT INTO tasks_fts (rowid, titulo, descricao, subtarefas)
+            VALUES (NEW.id, NEW.titulo, NEW.descricao, NULL);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_update
+        AFTER UPDATE OF titulo, descricao ON tasks
+        BEGIN
+            UPDATE tasks_fts
+            SET titulo = NEW.titulo,
+                descricao = NEW.descricao
+            WHERE rowid = NEW.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_delete
+        AFTER DELETE ON tasks
+        BEGIN
+            DELETE FROM tasks_fts WHERE rowid = OLD.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_subtasks_fts_insert
+        AFTER INSERT ON subtasks
+        BEGIN
+            UPDATE tasks_fts
+            SET subtarefas = (SELECT group_concat(titulo, ' ') FROM subtasks
+                              WHERE task_id = NEW.task_id)
+            WHERE rowid = NEW.task_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_subtasks_fts_update
+        AFTER UPDATE OF titulo, task_id ON subtasks
+        BEGIN
+            UPDATE tasks_fts
+            SET subtarefas = (SELECT group_concat(titulo, ' ') FROM subtasks
+                              WHERE task_id = tasks_fts.rowid)
+            WHERE rowid IN (OLD.task_id, NEW.task_id);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_subtasks_fts_delete
+        AFTER DELETE ON subtasks
+        BEGIN
+            UPDATE tasks_fts
+            SET subtarefas = (SELECT group_concat(titulo, ' ') FROM subtasks
+                              WHERE task_id = OLD.task_id)
+            WHERE rowid = OLD.task_id;
+        END
+        """,
+    ]),
+    Migration(5, "Contadores de tarefas por usuário, categoria e status", [
+        # categoria_id 0 = sem categoria; status NULL vira ''
+        """
+        CREATE TABLE IF NOT EXISTS task_stats (
+            user_id INTEGER NOT NULL,
+            categoria_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            total INTEGER NOT NULL,
+            PRIMARY KEY (user_id, categoria_id, status)
+        ) WITHOUT ROWID
+        """,
+        """
+        INSERT INTO task_stats (user_id, categoria_id, status, total)
+        SELECT user_id, IFNULL(categoria_id, 0), IFNULL(status, ''), COUNT(*)
+        FROM tasks
+        GROUP BY 1, 2, 3
+        ON CONFLICT DO NOTHING
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_stats_insert
+        AFTER INSERT ON tasks
+        BEGIN
+            INSERT INTO task_stats (user_id, categoria_id, status, total)
+            VALUES (NEW.user_id, IFNULL(NEW.categoria_id, 0),
+                    IFNULL(NEW.status, ''), 1)
+            ON CONFLICT DO UPDATE SET total = total + 1;
+        END
+        """,
+        # Também dispara no ON DELETE SET NULL ao excluir uma categoria
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_stats_update
+        AFTER UPDATE OF user_id, categoria_id, status ON tasks
+        WHEN OLD.user_id IS NOT NEW.user_id
+          OR OLD.categoria_id IS NOT NEW.categoria_id
+          OR OLD.status IS NOT NEW.status
+        BEGIN
+            UPDATE task_stats SET total = total - 1
+            WHERE user_id = OLD.user_id
+              AND categoria_id = IFNULL(OLD.categoria_id, 0)
+              AND status = IFNULL(OLD.status, '');
+            DELETE FROM task_stats
+            WHERE user_id = OLD.user_id
+              AND categoria_id = IFNULL(OLD.categoria_id, 0)
+              AND status = IFNULL(OLD.status, '')
+              AND total <= 0;
+            INSERT INTO task_stats (user_id, categoria_id, status, total)
+            VALUES (NEW.user_id, IFNULL(NEW.categoria_id, 0),
+                    IFNULL(NEW.status, ''), 1)
+            ON CONFLICT DO UPDATE SET total = total + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_stats_delete
+        AFTER DELETE ON tasks
+        BEGIN
+            UPDATE task_stats SET total = total - 1
+            WHERE user_id = OLD.user_id
+              AND categoria_id = IFNULL(OLD.categoria_id, 0)
+              AND status = IFNULL(OLD.status, '');
+            DELETE FROM task_stats
+            WHERE user_id = OLD.user_id
+              AND categoria_id = IFNULL(OLD.categoria_id, 0)
+              AND status = IFNULL(OLD.status, '')
+              AND total <= 0;
+        END
+        """,
+        # stats_repo.count_overdue: só tarefas em aberto entram no índice
+        """
+        CREATE INDEX IF NOT EXISTS idx_tasks_user_open_vencimento
+        ON tasks (user_id, data_vencimento)
+        WHERE status IS NOT 'concluida' AND data_vencimento IS NOT NULL
+        """,
+    ]),
+    Migration(6, "Log de eventos compartilhado entre workers (SSE)", [
+        """
+        CREATE TABLE IF NOT EXISTS event_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            payload TEXT NOT NULL,
+            created_at REAL NOT NULL
+        )
+        """,
+        # events_repo.delete_events_before
+        """
+        CREATE INDEX IF NOT EXISTS idx_event_log_created
+        ON event_log (created_at)
+        """,
+    ]),
+    Migration(7, "Log de alterações para sincronização incremental (GET /sync)", [
+        # Uma linha por entidade com a versão da última alteração; exclusões
+        # ficam como tombstone (deleted = 1) até a compactação
+        """
+        CREATE TABLE IF NOT EXISTS sync_changes (
+            entity TEXT NOT NULL,
+            entity_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            version INTEGER NOT NULL,
+            deleted INTEGER NOT NULL DEFAULT 0,
+            changed_at INTEGER NOT NULL,
+            PRIMARY KEY (entity, entity_id)
+        ) WITHOUT ROWID
+        """,
+        # sync_repo.get_changes: O(alterações) a partir de `since`
+        """
+        CREATE INDEX IF NOT EXISTS idx_sync_changes_user_version
+        ON sync_changes (user_id, version)
+        """,
+        # sync_repo.compact_tombstones
+        """
+        CREATE INDEX IF NOT EXISTS idx_sync_changes_tombstones
+        ON sync_changes (changed_at) WHERE deleted = 1
+        """,
+        # Maior versão cujos tombstones já foram compactados
+        """
+        ALTER TABLE user_data_versions
+        ADD COLUMN pruned_version INTEGER NOT NULL DEFAULT 0
+        """,
+        # Dados existentes: uma versão nova e distinta para cada entidade,
+        # depois da versão atual do usuário
+        """
+        INSERT INTO sync_changes
+            (entity, entity_id, user_id, version, deleted, changed_at)
+        SELECT
+            x.entity,
+            x.id,
+            x.user_id,
+            IFNULL(v.version, 0) + ROW_NUMBER() OVER (
+                PARTITION BY x.user_id ORDER BY x.entity, x.id
+            ),
+            0,
+            CAST(strftime('%s', 'now') AS INTEGER)
+        FROM (
+            SELECT 'category' AS entity, id, user_id FROM categories
+            UNION ALL
+            SELECT 'task', id, user_id FROM tasks
+            UNION ALL
+            SELECT 'subtask', s.id, t.user_id
+            FROM subtasks s JOIN tasks t ON t.id = s.task_id
+        ) x
+        LEFT JOIN user_data_versions v ON v.user_id = x.user_id
+        WHERE true
+        ON CONFLICT DO NOTHING
+        """,
+        """
+        INSERT INTO user_data_versions (user_id, version)
+        SELECT user_id, MAX(version) FROM sync_changes GROUP BY user_id
+        ON CONFLICT (user_id) DO UPDATE SET version = excluded.version
+        """,
+        *(
+            f"DROP TRIGGER IF EXISTS trg_{table}_version_{event}"
+            for table, _ in _SYNC_TABLES
+            for event in ("insert", "update", "delete")
+        ),
+        *(
+            _sync_trigger(table, entity, event)
+            for table, entity in _SYNC_TABLES
+            for event in ("INSERT", "UPDATE", "DELETE")
+        ),
+    ]),
+    Migration(8, "Índice para a contagem de subtarefas da listagem", [
+        # GET /tasks?include=subtask_counts: as duas contagens por tarefa
+        # saem só do índice, sem ler as linhas de subtasks
+        """
+        CREATE INDEX IF NOT EXISTS idx_subtasks_task_concluida
+        ON subtasks (task_id, concluida)
+        """,
+    ]),
+    Migration(9, "Dono da tarefa no índice textual (busca por usuário)", [
+        # `owner` guarda o token "u<user_id>"; a busca exige esse token no
+        # MATCH, então o FTS5 só ranqueia e devolve as tarefas do usuário
+        "DROP TRIGGER IF EXISTS trg_tasks_fts_insert",
+        "DROP TRIGGER IF EXISTS trg_tasks_fts_update",
+        "DROP TABLE IF EXISTS tasks_fts",
+        """
+        CREATE VIRTUAL TABLE tasks_fts USING fts5(
+            titulo,
+            descricao,
+            subtarefas,
+            owner,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+        """,
+        """
+        INSERT INTO tasks_fts (rowid, titulo, descricao, subtarefas, owner)
+        SELECT
+            t.id,
+            t.titulo,
+            t.descricao,
+            (SELECT group_concat(s.titulo, ' ') FROM subtasks s
+             WHERE s.task_id = t.id),
+            'u' || t.user_id
+        FROM tasks t
+        """,
+        """
+        CREATE TRIGGER trg_tasks_fts_insert
+        AFTER INSERT ON tasks
+        BEGIN
+            INSERT INTO tasks_fts (rowid, titulo, descricao, subtarefas, owner)
+            VALUES (NEW.id, NEW.titulo, NEW.descricao, NULL,
+                    'u' || NEW.user_id);
+        END
+        """,
+        """
+        CREATE TRIGGER trg_tasks_fts_update
+        AFTER UPDATE OF titulo, descricao, user_id ON tasks
+        BEGIN
+            UPDATE tasks_fts
+            SET titulo = NEW.titulo,
+                descricao = NEW.descricao,
+                owner = 'u' || NEW.user_id
+            WHERE rowid = NEW.id;
+        END
+        """,
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """
+    Retorna a versão do esquema gravada no banco.
+
+    Args:
+        conn: Conexão com o banco de dados
+
+    Returns:
+        int: Valor atual de `PRAGMA user_version`
+    """
+    return conn.execute("PRAGMA user_version").fetchone()["user_version"]
+
+
+def migrate(conn: sqlite3.Connection, target: Optional[int] = None) -> int:
+    """
+    Aplica, em ordem, as migrações ainda não aplicadas.
+
+    Args:
+        conn: Conexão com o banco de dados
+        target: Última versão a aplicar (padrão: todas)
+
+    Returns:
+        int: Versão do esquema após a migração
+
+    Note:
+        Cada passo roda em uma transação junto com a atualização de
+        `user_version`; se falhar, nada do passo é gravado. Os comandos
+        usam IF NOT EXISTS, então bancos criados antes do controle de
+        versão são adotados sem erro.
+    """
+    current = get_schema_version(conn)
+
+    for migration in MIGRATIONS:
+        if migration.version <= current:
+            continue
+        if target is not None and migration.version > target:
+            break
+
+        conn.execute("BEGIN")
+        try:
+            for statement in migration.statements:
+                conn.execute(statement)
+            # PRAGMA não aceita parâmetros; a versão vem da lista acima
+            conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        conn.commit()
+        current = migration.version
+
+    return current
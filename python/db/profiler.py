@@ -0,0 +1,158 @@
+"""
+Profiler de SQL por requisição.
+
+Quando ativado (veja `api.middleware.SQLProfilerMiddleware`), cada
+requisição ganha um `QueryProfile` em `current_profile`. As conexões
+obtidas por ela recebem o trace callback do sqlite3, que registra cada
+instrução executada; `to_async` marca o fim de cada chamada de
+repositório. No final, as instruções são agrupadas pela forma normalizada
+(literais trocados por `?`) para contar execuções, somar tempos e apontar
+padrões de N+1.
+"""
+
+import contextvars
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+current_profile: contextvars.ContextVar[Optional["QueryProfile"]] = (
+    contextvars.ContextVar("current_profile", default=None)
+)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Forma normalizada de uma instrução: literais viram `?`, listas de
+    valores viram `(?, ...)` e espaços são compactados.
+
+    O trace do sqlite3 entrega o SQL com os parâmetros já expandidos;
+    normalizar junta as execuções da mesma instrução com valores diferentes.
+    """
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _VALUE_LIST.sub("(?, ...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class QueryProfile:
+    """
+    Instruções SQL executadas durante uma requisição.
+
+    Args:
+        repeat_threshold: Execuções de uma mesma forma normalizada acima das
+            quais a requisição é marcada como suspeita de N+1
+
+    Note:
+        O tempo de cada instrução vai do seu início até o início da próxima
+        ou o fim da chamada de repositório que a executou (o trace do
+        sqlite3 só avisa o início). Os programas de trigger disparam o
+        trace com o mesmo texto da instrução que os acionou; repetições
+        consecutivas idênticas são contadas uma vez só, com o tempo dos
+        triggers somado ao da instrução. O mesmo vale para as instruções
+        internas de tabelas virtuais, como o índice FTS5.
+    """
+
+    def __init__(self, repeat_threshold: int):
+        self.repeat_threshold = repeat_threshold
+        self.started = time.perf_counter()
+        # (instante, SQL); SQL None marca o fim de uma chamada ao banco
+        self._events: List[Tuple[float, Optional[str]]] = []
+        self._last_sql: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def trace(self, sql: str) -> None:
+        """Trace callback do sqlite3 (`Connection.set_trace_callback`)."""
+        # Instruções internas (ex.: as que o FTS5 executa nas suas tabelas)
+        # chegam como comentário "-- ..."; o tempo delas fica com a
+        # instrução que as disparou
+        if sql.startswith("--"):
+            return
+        with self._lock:
+            if sql == self._last_sql:
+                return
+            self._last_sql = sql
+            self._events.append((time.perf_counter(), sql))
+
+    def end_call(self) -> None:
+        """Marca o fim de uma chamada ao banco (a instrução em curso termina)."""
+        with self._lock:
+            self._last_sql = None
+            self._events.append((time.perf_counter(), None))
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Resume as instruções registradas até agora.
+
+        Returns:
+            Dict[str, Any]: `queries` (execuções), `db_ms` (tempo total),
+            `statements` (por forma normalizada, da mais cara para a mais
+            barata, com `count` e `total_ms`) e `repeated` (formas acima do
+            limite de repetições)
+        """
+        with self._lock:
+            events = list(self._events)
+        now = time.perf_counter()
+
+        shapes: Dict[str, Dict[str, Any]] = {}
+        queries = 0
+        total = 0.0
+        for index, (started, sql) in enumerate(events):
+            if sql is None:
+                continue
+            ended = events[index + 1][0] if index + 1 < len(events) else now
+            elapsed = (ended - started) * 1000
+            shape = shapes.setdefault(
+                normalize_sql(sql), {"count": 0, "total_ms": 0.0}
+            )
+            shape["count"] += 1
+            shape["total_ms"] += elapsed
+            queries += 1
+            total += elapsed
+
+        statements = sorted(
+            (
+                {"sql": sql, "count": s["count"],
+                 "total_ms": round(s["total_ms"], 3)}
+                for sql, s in shapes.items()
+            ),
+            key=lambda s: s["total_ms"],
+            reverse=True
+        )
+        return {
+            "queries": queries,
+            "db_ms": round(total, 3),
+            "statements": statements,
+            "repeated": [
+                s for s in statements if s["count"] > self.repeat_threshold
+            ],
+        }
+
+    def server_timing(self) -> str:
+        """
+        Valor do cabeçalho `Server-Timing` com o resumo atual.
+
+        `db` traz o tempo total no banco e a quantidade de instruções; cada
+        forma acima do limite de repetições vira uma entrada `sql-repeat`.
+        """
+        summary = self.summary()
+        elapsed = (time.perf_counter() - self.started) * 1000
+        entries = [
+            f'db;dur={summary["db_ms"]:.1f};desc="{summary["queries"]} queries"',
+            f"app;dur={elapsed:.1f}",
+        ]
+        for statement in summary["repeated"][:3]:
+            desc = f'{statement["count"]}x {statement["sql"][:80]}'
+            # quoted-string do cabeçalho: sem aspas, barras ou não-ASCII
+            desc = desc.replace('"', "'").replace("\\", "/")
+            desc = desc.encode("ascii", "replace").decode("ascii")
+            entries.append(
+                f'sql-repeat;dur={statement["total_ms"]:.1f};desc="{desc}"'
+            )
+        return ", ".join(entries)
@@ -0,0 +1,269 @@
+"""
+Escritor único com group commit.
+
+O SQLite aceita um escritor por vez. Com DB_SINGLE_WRITER ativo, as funções
+de escrita dos repositórios (marcadas com `writer_op`) deixam de usar a
+conexão da requisição: elas são enfileiradas para uma única thread, que
+junta as escritas que chegam dentro de uma janela curta em uma só transação
+(group commit) e devolve o resultado de cada uma pelo seu Future.
+
+Cada escrita roda em um SAVEPOINT próprio, então a falha de uma não desfaz
+as outras do mesmo grupo. Em compensação, no modo de escritor único cada
+escrita é commitada assim que o grupo fecha, e não ao final da requisição.
+Por isso uma unidade de trabalho chama no máximo uma função de escrita
+(veja `db.database.to_async`): escritas que precisam ser atômicas ficam em
+uma única função `writer_op`, que roda inteira no mesmo SAVEPOINT.
+"""
+
+import contextlib
+import functools
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.config import (
+    DATABASE_PATH,
+    DB_SINGLE_WRITER,
+    DB_WRITER_BATCH_WINDOW_MS,
+    DB_WRITER_MAX_BATCH
+)
+from db.database import connect
+
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+_WriteItem = Tuple[Future, Callable, Tuple[Any, ...], Dict[str, Any]]
+
+
+class WriteQueue:
+    """
+    Fila de escritas atendida por uma única thread com conexão própria.
+
+    Args:
+        path: Caminho do arquivo do banco
+        window: Janela, em segundos, para agrupar escritas em um commit
+        max_batch: Quantidade máxima de escritas por commit
+    """
+
+    def __init__(self, path: str, window: float, max_batch: int):
+        self.path = path
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run,
+            name="db-writer",
+            daemon=True
+        )
+        self._thread.start()
+
+    def is_writer_thread(self) -> bool:
+        """Indica se o código atual está rodando na thread de escrita."""
+        return threading.current_thread() is self._thread
+
+    def submit(
+        self,
+        func: Callable,
+        args: Tuple[Any, ...] = (),
+        kwargs: Optional[Dict[str, Any]] = None
+    ) -> Future:
+        """
+        Enfileira `func(conn, *args, **kwargs)` para a thread de escrita.
+
+        Returns:
+            Future: Resolvido com o retorno de `func` após o commit do grupo
+
+        Raises:
+            RuntimeError: Se a thread de escrita já foi encerrada
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Fila de escrita encerrada")
+            self._queue.put((future, func, args, kwargs or {}))
+        return future
+
+    def close(self) -> None:
+        """Processa o que já está na fila e encerra a thread de escrita."""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(_STOP)
+        self._thread.join()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Abre a conexão da thread de escrita."""
+        conn = connect(self.path)
+        # Controle manual: BEGIN/SAVEPOINT/COMMIT explícitos
+        conn.isolation_level = None
+        return conn
+
+    def _run(self) -> None:
+        try:
+            self._loop()
+        finally:
+            # Se a thread sair por qualquer motivo, nenhuma escrita fica
+            # esperando para sempre: novas chamadas de submit() falham e as
+            # que já estão na fila recebem erro
+            with self._lock:
+                self._closed = True
+            error = RuntimeError("Fila de escrita encerrada")
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    _fail([item], error)
+
+    def _loop(self) -> None:
+        conn: Optional[sqlite3.Connection] = None
+        stopping = False
+
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            batch: List[_WriteItem] = [item]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = (
+                        self._queue.get(timeout=remaining)
+                        if remaining > 0 else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                if conn is None:
+                    conn = self._connect()
+                self._execute(conn, batch)
+            except Exception as e:
+                # Falha fora de uma escrita (conexão, SAVEPOINT, COMMIT ou
+                # ROLLBACK): o grupo inteiro falha e a conexão é descartada,
+                # o que desfaz a transação; a thread segue atendendo a fila
+                logger.error(f"Falha na thread de escrita: {e}")
+                _fail(batch, e)
+                if conn is not None:
+                    with contextlib.suppress(sqlite3.Error):
+                        conn.close()
+                    conn = None
+
+        if conn is not None:
+            conn.close()
+
+    def _execute(self, conn: sqlite3.Connection, batch: List[_WriteItem]):
+        """Executa um grupo de escritas em uma transação e resolve os Futures."""
+        outcomes = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error as e:
+            _fail(batch, e)
+            return
+
+        for future, func, args, kwargs in batch:
+            if not future.set_running_or_notify_cancel():
+                continue
+            conn.execute("SAVEPOINT write_item")
+            try:
+                result = func(conn, *args, **kwargs)
+            except BaseException as e:
+                conn.execute("ROLLBACK TO write_item")
+                conn.execute("RELEASE write_item")
+                outcomes.append((future, None, e))
+            else:
+                conn.execute("RELEASE write_item")
+                outcomes.append((future, result, None))
+
+        try:
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            logger.error(f"Falha no commit do grupo de escritas: {e}")
+            conn.execute("ROLLBACK")
+            outcomes = [(future, None, e) for future, _, _ in outcomes]
+
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+def _fail(batch: List[_WriteItem], error: BaseException) -> None:
+    """Resolve com `error` os Futures do grupo que ainda não terminaram."""
+    for future, *_ in batch:
+        if future.done():
+            continue
+        if future.running() or future.set_running_or_notify_cancel():
+            future.set_exception(error)
+
+
+_writer: Optional[WriteQueue] = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> WriteQueue:
+    """Retorna a fila de escrita da aplicação, criando-a na primeira chamada."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = WriteQueue(
+                    DATABASE_PATH,
+                    DB_WRITER_BATCH_WINDOW_MS / 1000,
+                    DB_WRITER_MAX_BATCH
+                )
+    return _writer
+
+
+def close_writer() -> None:
+    """Encerra a fila de escrita da aplicação, se existir."""
+    global _writer
+    with _writer_lock:
+        if _writer is not None:
+            _writer.close()
+            _writer = None
+
+
+def writer_op(func: Callable) -> Callable:
+    """
+    Marca uma função de escrita de repositório (primeiro argumento `conn`).
+
+    Com DB_SINGLE_WRITER desligado a função é chamada normalmente. Ligado,
+    a chamada é enfileirada para a thread de escrita e a conexão recebida é
+    ignorada; o chamador espera o commit do grupo. A função decorada ganha
+    `submit_write(*args, **kwargs)`, usado por `db.database.to_async` para
+    aguardar o Future sem bloquear uma thread.
+    """
+    def submit_write(*args, **kwargs) -> Optional[Future]:
+        if not DB_SINGLE_WRITER:
+            return None
+        writer = get_writer()
+        if writer.is_writer_thread():
+            return None
+        return writer.submit(func, args, kwargs)
+
+    @functools.wraps(func)
+    def wrapper(conn, *args, **kwargs):
+        future = submit_write(*args, **kwargs)
+        if future is None:
+            return func(conn, *args, **kwargs)
+        return future.result()
+
+    wrapper.submit_write = submit_write
+    return wrapper
@@ -5,15 +5,83 @@ Este módulo inicializa a aplicação FastAPI com todas as rotas,
 middlewares e configurações necessárias.
 """
 
+import asyncio
+import contextlib
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 
+from api.middleware import (
+    AccessLogMiddleware,
+    MetricsMiddleware,
+    SQLProfilerMiddleware
+)
 from api.routes.auth import router as auth_router
 from api.routes.tasks import router as tasks_router
 from api.routes.categories import router as categories_router
+from api.routes.events import router as events_router
+from api.routes.sync import router as sync_router
+from api.routes.transfer import router as transfer_router
+from core.config import (
+    DATABASE_PATH,
+    DB_POOL_WARM_SIZE,
+    SYNC_COMPACT_INTERVAL_SECONDS,
+    SYNC_TOMBSTONE_RETENTION_DAYS
+)
+from core.events import close_broker, get_broker
+from core.logging_config import dropped_logs, setup_logging, stop_logging
+from core.metrics import mark_worker_dead, render_metrics
+from core.security import (
+    PasswordHasherBusy,
+    shutdown_password_pool,
+    warm_password_pool
+)
+from core.token_cache import token_cache
+from db.database import close_pool, get_pool, shutdown_executor
 from db.init_db import init_db
+from db.maintenance import run_sync_compaction
+from db.writer import close_writer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Prepara a aplicação na partida e libera os recursos no encerramento.
+
+    O import do módulo não toca no banco: o esquema é verificado (e migrado,
+    se preciso) e o pool de conexões é aquecido aqui, antes da primeira
+    requisição, fora do event loop. Os processos do pool de hash de senhas
+    também são iniciados agora, e não no primeiro login. A compactação
+    periódica dos tombstones de /sync roda como tarefa de fundo até o
+    encerramento.
+    """
+    # Configuração de logging (fila + listener em thread própria)
+    setup_logging()
+    await asyncio.to_thread(init_db)
+    await asyncio.to_thread(get_pool().warm, DB_POOL_WARM_SIZE)
+    await warm_password_pool()
+    compaction = None
+    if SYNC_COMPACT_INTERVAL_SECONDS > 0:
+        compaction = asyncio.create_task(run_sync_compaction(
+            DATABASE_PATH,
+            SYNC_TOMBSTONE_RETENTION_DAYS,
+            SYNC_COMPACT_INTERVAL_SECONDS
+        ))
+    yield
+    if compaction is not None:
+        compaction.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await compaction
+    await close_broker()
+    shutdown_password_pool()
+    shutdown_executor()
+    close_writer()
+    close_pool()
+    mark_worker_dead()
+    stop_logging()
 
-import logging
 
 # Inicializa a aplicação FastAPI
 app = FastAPI(
@@ -21,28 +89,20 @@ app = FastAPI(
     description="API para gerenciamento de tarefas com autenticação JWT",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# Inicializa o banco de dados
-init_db()
-
-
-# Configuração de logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 
-# Logger para a aplicação
-logger = logging.getLogger("__name__")
-
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    logger.info(f"{request.method} {request.url}")
-    response = await call_next(request)
-    logger.info(f"Status: {response.status_code}")
-    return response
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    """Responde 503 imediatamente quando o pool de hash está saturado."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Serviço ocupado, tente novamente em instantes"},
+        headers={"Retry-After": "1"}
+    )
 
 
 # Configuração de CORS
@@ -59,16 +119,28 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Server-Timing"],
 )
 
+# Profiler de SQL opcional (SQL_PROFILE)
+app.add_middleware(SQLProfilerMiddleware)
+
+# Métricas e log de acesso; adicionados por último para envolver os demais
+# middlewares
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(AccessLogMiddleware)
+
 # Inclui as rotas
 app.include_router(auth_router, tags=["Autenticação"])
 app.include_router(tasks_router, tags=["Tarefas"])
 app.include_router(categories_router, tags=["Categorias"])
+app.include_router(events_router, tags=["Eventos"])
+app.include_router(sync_router, tags=["Sincronização"])
+app.include_router(transfer_router, tags=["Exportação e importação"])
 
 
 @app.get("/", tags=["Health Check"])
-def read_root():
+async def read_root():
     """
     Endpoint raiz para verificar se a API está funcionando.
 
@@ -83,11 +155,31 @@ def read_root():
 
 
 @app.get("/health", tags=["Health Check"])
-def health_check():
+async def health_check():
     """
     Endpoint de health check para monitoramento.
 
     Returns:
-        dict: Status da aplicação
+        dict: Status da aplicação, estatísticas do pool de conexões, do
+        cache de tokens, das conexões de eventos e dos logs descartados
+    """
+    return {
+        "status": "healthy",
+        "database": get_pool().stats(),
+        "auth_cache": token_cache.stats(),
+        "events": get_broker().stats(),
+        "logs": {"dropped": dropped_logs()}
+    }
+
+
+@app.get("/metrics", tags=["Health Check"])
+def metrics():
+    """
+    Métricas no formato de exposição do Prometheus.
+
+    Latência das requisições por rota e status, requisições em andamento,
+    duração das funções de repositório, operações de bcrypt e falhas de
+    autenticação. Com PROMETHEUS_MULTIPROC_DIR, soma todos os workers.
     """
-    return {"status": "healthy"}
\ No newline at end of file
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
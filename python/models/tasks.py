@@ -2,9 +2,11 @@
 Modelos Pydantic para tarefas.
 """
 
-from typing import Optional
-from datetime import date, datetime
-from pydantic import BaseModel, Field, field_validator
+from typing import Annotated, List, Literal, Optional, Union
+from datetime import date, datetime, timezone
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from core.config import TASKS_BULK_MAX_SIZE
 
 
 class SubtaskCreate(BaseModel):
@@ -43,6 +45,10 @@ class TaskCreate(BaseModel):
         }
 
 
+class TaskBulkItem(TaskCreate):
+    subtasks: List[SubtaskCreate] = Field(default_factory=list, max_length=100)
+
+
 class TaskUpdate(BaseModel):
     titulo: Optional[str] = Field(None, min_length=1, max_length=200)
     descricao: Optional[str] = Field(None, max_length=1000)
@@ -58,6 +64,42 @@ class TaskUpdate(BaseModel):
         return v
 
 
+class TaskFilter(BaseModel):
+    categoria_id: Optional[int] = None
+    status: Optional[str] = None
+    data_inicio: Optional[date] = None
+    data_fim: Optional[date] = None
+
+
+class TaskBatchSelection(BaseModel):
+    """Seleção de tarefas por lista de IDs ou por filtro (um dos dois)."""
+
+    ids: Optional[List[int]] = Field(
+        None, min_length=1, max_length=TASKS_BULK_MAX_SIZE
+    )
+    filter: Optional[TaskFilter] = None
+
+    @model_validator(mode='after')
+    def validate_selection(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError('Informe "ids" ou "filter" (apenas um)')
+        if self.filter is not None and not self.filter.model_dump(
+            exclude_none=True
+        ):
+            raise ValueError('O filtro precisa de pelo menos um critério')
+        return self
+
+
+class TaskBatchUpdate(TaskBatchSelection):
+    changes: TaskUpdate
+
+    @model_validator(mode='after')
+    def validate_changes(self):
+        if not self.changes.model_dump(exclude_none=True):
+            raise ValueError('Informe pelo menos um campo em "changes"')
+        return self
+
+
 class CategoryCreate(BaseModel):
     nome: str = Field(..., min_length=1, max_length=100)
     cor: Optional[str] = Field(default="#F97316", max_length=7)
@@ -79,4 +121,63 @@ class CategoryUpdate(BaseModel):
     def validate_cor(cls, v):
         if v is not None and (not v.startswith('#') or len(v) != 7):
             raise ValueError('Cor deve estar no formato hexadecimal (#RRGGBB)')
-        return v
\ No newline at end of file
+        return v
+
+
+class ImportCategory(BaseModel):
+    """Categoria de um arquivo de importação (veja `api.transfer`)."""
+
+    type: Literal["category"]
+    id: int
+    nome: str = Field(..., min_length=1, max_length=100)
+    cor: str = Field(default="#F97316", max_length=7)
+
+    @field_validator('cor')
+    @classmethod
+    def validate_cor(cls, v):
+        if not v.startswith('#') or len(v) != 7:
+            raise ValueError('Cor deve estar no formato hexadecimal (#RRGGBB)')
+        return v
+
+
+class ImportTask(BaseModel):
+    """
+    Tarefa de um arquivo de importação.
+
+    Ao contrário de `TaskCreate`, aceita vencimentos no passado e a data de
+    criação original, já que os dados vêm de uma exportação.
+    """
+
+    type: Literal["task"]
+    id: int
+    categoria_id: Optional[int] = None
+    titulo: str = Field(..., min_length=1, max_length=200)
+    descricao: Optional[str] = Field(None, max_length=1000)
+    status: Optional[str] = Field(default="pendente")
+    data_criacao: Optional[datetime] = None
+    data_vencimento: Optional[date] = None
+
+    @field_validator('data_criacao')
+    @classmethod
+    def normalize_data_criacao(cls, v):
+        # Mesmo formato do CURRENT_TIMESTAMP do SQLite (UTC, sem fuso)
+        if v is not None and v.tzinfo is not None:
+            v = v.astimezone(timezone.utc).replace(tzinfo=None)
+        return v
+
+
+class ImportSubtask(BaseModel):
+    """Subtarefa de um arquivo de importação."""
+
+    type: Literal["subtask"]
+    id: Optional[int] = None
+    task_id: int
+    titulo: str = Field(..., min_length=1, max_length=200)
+    concluida: bool = Field(default=False)
+    ordem: int = Field(default=0)
+
+
+ImportRecord = Annotated[
+    Union[ImportCategory, ImportTask, ImportSubtask],
+    Field(discriminator="type")
+]
@@ -0,0 +1,6 @@
+"""
+Repositórios assíncronos.
+
+Cada módulo expõe as mesmas funções do repositório síncrono de mesmo nome,
+executadas no executor dedicado ao banco (veja `db.database.run_db`).
+"""
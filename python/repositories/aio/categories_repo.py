@@ -0,0 +1,14 @@
+"""
+Versão assíncrona do repositório de categorias.
+"""
+
+from db.database import to_async
+from repositories import categories_repo as _repo
+
+
+get_categories_by_user = to_async(_repo.get_categories_by_user)
+create_category = to_async(_repo.create_category)
+update_category = to_async(_repo.update_category)
+delete_category = to_async(_repo.delete_category)
+get_category_by_id = to_async(_repo.get_category_by_id)
+get_category_ids_for_user = to_async(_repo.get_category_ids_for_user)
@@ -0,0 +1,10 @@
+"""
+Versão assíncrona do repositório de exportação.
+"""
+
+from db.database import to_async
+from repositories import export_repo as _repo
+
+
+begin_snapshot = to_async(_repo.begin_snapshot)
+iter_export = to_async(_repo.iter_export)
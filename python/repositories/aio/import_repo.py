@@ -0,0 +1,11 @@
+"""
+Versão assíncrona do repositório de importação.
+"""
+
+from db.database import to_async
+from repositories import import_repo as _repo
+
+
+start_import = to_async(_repo.start_import)
+finish_import = to_async(_repo.finish_import)
+import_batch = to_async(_repo.import_batch)
@@ -0,0 +1,10 @@
+"""
+Versão assíncrona do repositório de estatísticas das tarefas.
+"""
+
+from db.database import to_async
+from repositories import stats_repo as _repo
+
+
+get_status_counts = to_async(_repo.get_status_counts)
+count_overdue = to_async(_repo.count_overdue)
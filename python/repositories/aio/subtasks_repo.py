@@ -0,0 +1,14 @@
+"""
+Versão assíncrona do repositório de subtarefas.
+"""
+
+from db.database import to_async
+from repositories import subtasks_repo as _repo
+
+
+get_subtasks_by_task = to_async(_repo.get_subtasks_by_task)
+get_subtasks_by_tasks = to_async(_repo.get_subtasks_by_tasks)
+create_subtask = to_async(_repo.create_subtask)
+update_subtask = to_async(_repo.update_subtask)
+delete_subtask = to_async(_repo.delete_subtask)
+get_subtask_by_id = to_async(_repo.get_subtask_by_id)
@@ -0,0 +1,9 @@
+"""
+Versão assíncrona do repositório da sincronização incremental.
+"""
+
+from db.database import to_async
+from repositories import sync_repo as _repo
+
+
+get_sync_page = to_async(_repo.get_sync_page)
@@ -0,0 +1,18 @@
+"""
+Versão assíncrona do repositório de tarefas.
+"""
+
+from db.database import to_async
+from repositories import tasks_repo as _repo
+
+
+get_tasks_by_user = to_async(_repo.get_tasks_by_user)
+iter_tasks_by_user = to_async(_repo.iter_tasks_by_user)
+search_tasks = to_async(_repo.search_tasks)
+create_task = to_async(_repo.create_task)
+update_task = to_async(_repo.update_task)
+delete_task = to_async(_repo.delete_task)
+get_task_by_id = to_async(_repo.get_task_by_id)
+create_tasks_bulk = to_async(_repo.create_tasks_bulk)
+update_tasks_batch = to_async(_repo.update_tasks_batch)
+delete_tasks_batch = to_async(_repo.delete_tasks_batch)
@@ -0,0 +1,11 @@
+"""
+Versão assíncrona do repositório de usuários.
+"""
+
+from db.database import to_async
+from repositories import user_repo as _repo
+
+
+get_user_by_email = to_async(_repo.get_user_by_email)
+create_user = to_async(_repo.create_user)
+update_user_password_hash = to_async(_repo.update_user_password_hash)
@@ -0,0 +1,9 @@
+"""
+Versão assíncrona do repositório de versões dos dados.
+"""
+
+from db.database import to_async
+from repositories import versions_repo as _repo
+
+
+get_user_version = to_async(_repo.get_user_version)
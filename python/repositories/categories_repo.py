@@ -5,14 +5,18 @@ Este módulo contém funções para acessar e manipular dados de categorias
 no banco de dados.
 """
 
+import json
 import sqlite3
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set
+
+from db.database import Row
+from db.writer import writer_op
 
 
 def get_categories_by_user(
     conn: sqlite3.Connection,
     user_id: int
-) -> List[sqlite3.Row]:
+) -> List[Row]:
     """
     Busca todas as categorias de um usuário.
 
@@ -21,7 +25,7 @@ def get_categories_by_user(
         user_id: ID do usuário
 
     Returns:
-        List[sqlite3.Row]: Lista de categorias do usuário
+        List[Row]: Lista de categorias do usuário
     """
     cursor = conn.execute(
         "SELECT * FROM categories WHERE user_id = ? ORDER BY nome",
@@ -30,6 +34,7 @@ def get_categories_by_user(
     return cursor.fetchall()
 
 
+@writer_op
 def create_category(
     conn: sqlite3.Connection,
     user_id: int,
@@ -52,10 +57,10 @@ def create_category(
         "INSERT INTO categories (user_id, nome, cor) VALUES (?, ?, ?)",
         (user_id, nome, cor)
     )
-    conn.commit()
     return cursor.lastrowid
 
 
+@writer_op
 def update_category(
     conn: sqlite3.Connection,
     category_id: int,
@@ -84,9 +89,9 @@ def update_category(
         """,
         (nome, cor, category_id, user_id)
     )
-    conn.commit()
 
 
+@writer_op
 def delete_category(
     conn: sqlite3.Connection,
     category_id: int,
@@ -107,14 +112,13 @@ def delete_category(
         "DELETE FROM categories WHERE id = ? AND user_id = ?",
         (category_id, user_id)
     )
-    conn.commit()
 
 
 def get_category_by_id(
     conn: sqlite3.Connection,
     category_id: int,
     user_id: int
-) -> Optional[sqlite3.Row]:
+) -> Optional[Row]:
     """
     Busca uma categoria específica pelo ID.
 
@@ -124,10 +128,36 @@ def get_category_by_id(
         user_id: ID do usuário (para verificar propriedade)
 
     Returns:
-        sqlite3.Row: Dados da categoria se encontrada, None caso contrário
+        Row: Dados da categoria se encontrada, None caso contrário
     """
     cursor = conn.execute(
         "SELECT * FROM categories WHERE id = ? AND user_id = ?",
         (category_id, user_id)
     )
-    return cursor.fetchone()
\ No newline at end of file
+    return cursor.fetchone()
+
+
+def get_category_ids_for_user(
+    conn: sqlite3.Connection,
+    user_id: int,
+    category_ids: Iterable[int]
+) -> Set[int]:
+    """
+    Filtra, entre os IDs informados, as categorias que pertencem ao usuário.
+
+    Args:
+        conn: Conexão com o banco de dados
+        user_id: ID do usuário
+        category_ids: IDs de categoria a verificar
+
+    Returns:
+        Set[int]: IDs informados que existem e pertencem ao usuário
+    """
+    cursor = conn.execute(
+        """
+        SELECT id FROM categories
+        WHERE user_id = ? AND id IN (SELECT value FROM json_each(?))
+        """,
+        (user_id, json.dumps(list(category_ids)))
+    )
+    return {row["id"] for row in cursor}
@@ -0,0 +1,80 @@
+"""
+Repositório do log de eventos.
+
+A tabela `event_log` é usada pelo backend "sqlite" de eventos: cada worker
+grava nela os eventos que publica e lê, por polling, os publicados pelos
+demais.
+"""
+
+import sqlite3
+import time
+from typing import List
+
+from db.database import Row
+
+
+def insert_event(conn: sqlite3.Connection, user_id: int, payload: str) -> int:
+    """
+    Grava um evento no log.
+
+    Args:
+        conn: Conexão com o banco de dados
+        user_id: ID do usuário dono do evento
+        payload: Evento serializado em JSON
+
+    Returns:
+        int: ID do evento (crescente)
+    """
+    cursor = conn.execute(
+        "INSERT INTO event_log (user_id, payload, created_at) VALUES (?, ?, ?)",
+        (user_id, payload, time.time())
+    )
+    return cursor.lastrowid
+
+
+def get_events_after(
+    conn: sqlite3.Connection,
+    last_id: int,
+    limit: int
+) -> List[Row]:
+    """
+    Busca os eventos gravados depois de `last_id`, em ordem.
+
+    Args:
+        conn: Conexão com o banco de dados
+        last_id: ID do último evento já lido
+        limit: Quantidade máxima de eventos retornados
+
+    Returns:
+        List[Row]: Eventos com `id`, `user_id` e `payload`
+    """
+    cursor = conn.execute(
+        """
+        SELECT id, user_id, payload FROM event_log
+        WHERE id > ?
+        ORDER BY id
+        LIMIT ?
+        """,
+        (last_id, limit)
+    )
+    return cursor.fetchall()
+
+
+def get_last_event_id(conn: sqlite3.Connection) -> int:
+    """Retorna o ID do evento mais recente (0 se o log estiver vazio)."""
+    cursor = conn.execute("SELECT IFNULL(MAX(id), 0) AS last_id FROM event_log")
+    return cursor.fetchone()["last_id"]
+
+
+def delete_events_before(conn: sqlite3.Connection, timestamp: float) -> int:
+    """
+    Remove do log os eventos gravados antes de `timestamp`.
+
+    Returns:
+        int: Quantidade de eventos removidos
+    """
+    cursor = conn.execute(
+        "DELETE FROM event_log WHERE created_at < ?",
+        (timestamp,)
+    )
+    return cursor.rowcount
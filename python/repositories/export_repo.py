@@ -0,0 +1,63 @@
+"""
+Repositório da exportação dos dados de um usuário.
+
+As consultas devolvem cursores, lidos em blocos pela rota de exportação,
+então nenhum conjunto de linhas é carregado inteiro em memória.
+"""
+
+import sqlite3
+
+
+# Consultas por entidade, na ordem em que são exportadas: cada registro só
+# referencia registros de entidades anteriores
+EXPORT_QUERIES = {
+    "category": """
+        SELECT id, nome, cor FROM categories
+        WHERE user_id = ?
+        ORDER BY id
+        """,
+    "task": """
+        SELECT id, categoria_id, titulo, descricao, status,
+               data_criacao, data_vencimento
+        FROM tasks
+        WHERE user_id = ?
+        """,
+    "subtask": """
+        SELECT s.id, s.task_id, s.titulo, s.concluida, s.ordem
+        FROM tasks t
+        JOIN subtasks s ON s.task_id = t.id
+        WHERE t.user_id = ?
+        """,
+}
+
+
+def begin_snapshot(conn: sqlite3.Connection) -> None:
+    """
+    Abre uma transação de leitura na conexão.
+
+    Com WAL, todas as consultas seguintes enxergam o mesmo estado do banco
+    (o da primeira leitura), mesmo com escritas concorrentes.
+
+    Note:
+        A transação é encerrada quando a conexão volta ao pool.
+    """
+    conn.execute("BEGIN")
+
+
+def iter_export(
+    conn: sqlite3.Connection,
+    user_id: int,
+    entity: str
+) -> sqlite3.Cursor:
+    """
+    Abre o cursor com os registros de uma entidade do usuário.
+
+    Args:
+        conn: Conexão com o banco de dados
+        user_id: ID do usuário
+        entity: "category", "task" ou "subtask" (chave de EXPORT_QUERIES)
+
+    Returns:
+        sqlite3.Cursor: Cursor a ser lido com fetchmany
+    """
+    return conn.execute(EXPORT_QUERIES[entity], (user_id,))
@@ -0,0 +1,194 @@
+"""
+Repositório da importação dos dados de um usuário.
+
+Os IDs do arquivo importado são trocados pelos IDs gerados no banco. A
+correspondência fica na tabela temporária `import_ids` da conexão da
+importação, e não em memória, então o consumo não cresce com o tamanho do
+arquivo.
+"""
+
+import json
+import sqlite3
+from typing import Any, Dict, Iterable, List
+
+
+def start_import(conn: sqlite3.Connection) -> None:
+    """Cria, vazia, a tabela temporária de correspondência de IDs."""
+    conn.execute(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS import_ids (
+            entity TEXT NOT NULL,
+            old_id INTEGER NOT NULL,
+            new_id INTEGER NOT NULL,
+            PRIMARY KEY (entity, old_id)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute("DELETE FROM temp.import_ids")
+
+
+def finish_import(conn: sqlite3.Connection) -> None:
+    """Remove a tabela temporária antes de a conexão voltar ao pool."""
+    conn.execute("DROP TABLE IF EXISTS temp.import_ids")
+
+
+def _insert_mapped(
+    conn: sqlite3.Connection,
+    table: str,
+    entity: str,
+    sql: str,
+    rows: List[tuple],
+    old_ids: List[int]
+) -> None:
+    """
+    Insere as linhas com um executemany e grava a correspondência de IDs.
+
+    Como em `tasks_repo.create_tasks_bulk`, a transação mantém o lock de
+    escrita, então os IDs gerados são consecutivos e terminam no valor de
+    sqlite_sequence.
+    """
+    conn.executemany(sql, rows)
+    last_id = conn.execute(
+        "SELECT seq FROM sqlite_sequence WHERE name = ?",
+        (table,)
+    ).fetchone()["seq"]
+    conn.executemany(
+        """
+        INSERT OR REPLACE INTO temp.import_ids (entity, old_id, new_id)
+        VALUES (?, ?, ?)
+        """,
+        [
+            (entity, old_id, new_id)
+            for old_id, new_id in zip(
+                old_ids, range(last_id - len(rows) + 1, last_id + 1)
+            )
+        ]
+    )
+
+
+def _lookup(
+    conn: sqlite3.Connection,
+    entity: str,
+    old_ids: Iterable[int]
+) -> Dict[int, int]:
+    """Busca os novos IDs de uma entidade a partir dos IDs do arquivo."""
+    cursor = conn.execute(
+        """
+        SELECT old_id, new_id FROM temp.import_ids
+        WHERE entity = ? AND old_id IN (SELECT value FROM json_each(?))
+        """,
+        (entity, json.dumps(list(old_ids)))
+    )
+    return {row["old_id"]: row["new_id"] for row in cursor}
+
+
+def import_batch(
+    conn: sqlite3.Connection,
+    user_id: int,
+    categories: List[Dict[str, Any]],
+    tasks: List[Dict[str, Any]],
+    subtasks: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Insere um lote do arquivo importado.
+
+    Args:
+        conn: Conexão em que `start_import` foi chamada
+        user_id: ID do usuário que recebe os dados
+        categories: Categorias com id (do arquivo), nome e cor
+        tasks: Tarefas com id e categoria_id (do arquivo), titulo,
+            descricao, status, data_criacao e data_vencimento
+        subtasks: Subtarefas com task_id (do arquivo), titulo, concluida
+            e ordem
+        Todos os registros trazem também `line`, a linha no arquivo.
+
+    Returns:
+        dict: Quantidade inserida de `categories`, `tasks` e `subtasks` e
+        os `errors` (`line` e `error`) dos registros com referências a IDs
+        que não vieram no arquivo
+
+    Note:
+        As categorias e tarefas do lote são inseridas antes das
+        subtarefas, então um registro pode referenciar outro anterior a
+        ele no mesmo lote. Tarefas com categoria desconhecida são
+        importadas sem categoria; subtarefas de tarefa desconhecida são
+        descartadas. Não faz commit.
+    """
+    errors = []
+
+    if categories:
+        _insert_mapped(
+            conn, "categories", "category",
+            "INSERT INTO categories (user_id, nome, cor) VALUES (?, ?, ?)",
+            [(user_id, c["nome"], c["cor"]) for c in categories],
+            [c["id"] for c in categories]
+        )
+
+    if tasks:
+        category_ids = _lookup(
+            conn, "category",
+            {t["categoria_id"] for t in tasks if t["categoria_id"] is not None}
+        )
+        rows = []
+        for task in tasks:
+            categoria_id = task["categoria_id"]
+            if categoria_id is not None and categoria_id not in category_ids:
+                errors.append({
+                    "line": task["line"],
+                    "error": f"Categoria {categoria_id} não encontrada; "
+                             "tarefa importada sem categoria",
+                })
+            rows.append((
+                user_id,
+                category_ids.get(categoria_id),
+                task["titulo"],
+                task["descricao"] or "",
+                task["status"] or "pendente",
+                task["data_criacao"],
+                task["data_vencimento"],
+            ))
+        _insert_mapped(
+            conn, "tasks", "task",
+            """
+            INSERT INTO tasks
+            (user_id, categoria_id, titulo, descricao, status,
+             data_criacao, data_vencimento)
+            VALUES (?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), ?)
+            """,
+            rows,
+            [t["id"] for t in tasks]
+        )
+
+    imported_subtasks = 0
+    if subtasks:
+        task_ids = _lookup(conn, "task", {s["task_id"] for s in subtasks})
+        rows = []
+        for subtask in subtasks:
+            task_id = task_ids.get(subtask["task_id"])
+            if task_id is None:
+                errors.append({
+                    "line": subtask["line"],
+                    "error": f"Tarefa {subtask['task_id']} não encontrada",
+                })
+                continue
+            rows.append((
+                task_id,
+                subtask["titulo"],
+                int(subtask["concluida"]),
+                subtask["ordem"],
+            ))
+        conn.executemany(
+            """
+            INSERT INTO subtasks (task_id, titulo, concluida, ordem)
+            VALUES (?, ?, ?, ?)
+            """,
+            rows
+        )
+        imported_subtasks = len(rows)
+
+    return {
+        "categories": len(categories),
+        "tasks": len(tasks),
+        "subtasks": imported_subtasks,
+        "errors": errors,
+    }
@@ -0,0 +1,151 @@
+"""
+Repositório de estatísticas das tarefas.
+
+Os contadores ficam em `task_stats` (usuário × categoria × status) e são
+mantidos por triggers a cada inserção, atualização e exclusão de tarefas,
+então a leitura custa O(categorias) e não O(tarefas).
+"""
+
+import sqlite3
+from datetime import date
+from typing import Dict, List, Tuple
+
+from db.database import Row
+
+
+def get_status_counts(conn: sqlite3.Connection, user_id: int) -> List[Row]:
+    """
+    Busca os contadores de tarefas de um usuário.
+
+    Args:
+        conn: Conexão com o banco de dados
+        user_id: ID do usuário
+
+    Returns:
+        List[Row]: Uma linha por (categoria, status) com `total`, o nome e
+        a cor da categoria (`categoria_id` None = sem categoria; `status`
+        '' = tarefa sem status)
+    """
+    cursor = conn.execute(
+        """
+        SELECT NULLIF(s.categoria_id, 0) AS categoria_id,
+               c.nome AS categoria_nome,
+               c.cor AS categoria_cor,
+               s.status,
+               s.total
+        FROM task_stats s
+        LEFT JOIN categories c ON c.id = s.categoria_id
+        WHERE s.user_id = ?
+        """,
+        (user_id,)
+    )
+    return cursor.fetchall()
+
+
+def count_overdue(
+    conn: sqlite3.Connection,
+    user_id: int,
+    today: date
+) -> Dict[int, int]:
+    """
+    Conta as tarefas em aberto com vencimento anterior a `today`.
+
+    Args:
+        conn: Conexão com o banco de dados
+        user_id: ID do usuário
+        today: Data de referência
+
+    Returns:
+        Dict[int, int]: Tarefas atrasadas por categoria (None = sem
+        categoria)
+
+    Note:
+        Depende da data atual, então não é mantido em `task_stats`; a
+        contagem usa o índice parcial das tarefas em aberto e percorre só
+        as atrasadas.
+    """
+    cursor = conn.execute(
+        """
+        SELECT categoria_id, COUNT(*) AS total
+        FROM tasks
+        WHERE user_id = ?
+          AND status IS NOT 'concluida'
+          AND data_vencimento < ?
+        GROUP BY categoria_id
+        """,
+        (user_id, today.isoformat())
+    )
+    return {row["categoria_id"]: row["total"] for row in cursor}
+
+
+_StatsKey = Tuple[int, int, str]
+
+
+def _expected_counts(conn: sqlite3.Connection) -> Dict[_StatsKey, int]:
+    """Recalcula os contadores a partir da tabela de tarefas."""
+    cursor = conn.execute(
+        """
+        SELECT user_id, IFNULL(categoria_id, 0) AS categoria_id,
+               IFNULL(status, '') AS status, COUNT(*) AS total
+        FROM tasks
+        GROUP BY 1, 2, 3
+        """
+    )
+    return {
+        (row["user_id"], row["categoria_id"], row["status"]): row["total"]
+        for row in cursor
+    }
+
+
+def check_stats(conn: sqlite3.Connection) -> List[Dict]:
+    """
+    Compara `task_stats` com uma contagem completa das tarefas.
+
+    Args:
+        conn: Conexão com o banco de dados
+
+    Returns:
+        List[Dict]: Divergências encontradas, com `user_id`,
+        `categoria_id`, `status`, `esperado` e `atual` (vazia se estiver
+        consistente)
+    """
+    expected = _expected_counts(conn)
+    actual = {
+        (row["user_id"], row["categoria_id"], row["status"]): row["total"]
+        for row in conn.execute(
+            "SELECT user_id, categoria_id, status, total FROM task_stats"
+        )
+    }
+    return [
+        {
+            "user_id": key[0],
+            "categoria_id": key[1],
+            "status": key[2],
+            "esperado": expected.get(key, 0),
+            "atual": actual.get(key, 0),
+        }
+        for key in sorted(expected.keys() | actual.keys())
+        if expected.get(key, 0) != actual.get(key, 0)
+    ]
+
+
+def rebuild_stats(conn: sqlite3.Connection) -> int:
+    """
+    Recria `task_stats` a partir da tabela de tarefas.
+
+    Args:
+        conn: Conexão com o banco de dados
+
+    Returns:
+        int: Quantidade de contadores gravados
+    """
+    conn.execute("DELETE FROM task_stats")
+    cursor = conn.execute(
+        """
+        INSERT INTO task_stats (user_id, categoria_id, status, total)
+        SELECT user_id, IFNULL(categoria_id, 0), IFNULL(status, ''), COUNT(*)
+        FROM tasks
+        GROUP BY 1, 2, 3
+        """
+    )
+    return cursor.rowcount
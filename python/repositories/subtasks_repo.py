@@ -5,14 +5,18 @@ Este módulo contém funções para acessar e manipular dados de subtarefas
 no banco de dados.
 """
 
+import json
 import sqlite3
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
+
+from db.database import Row
+from db.writer import writer_op
 
 
 def get_subtasks_by_task(
     conn: sqlite3.Connection,
     task_id: int
-) -> List[sqlite3.Row]:
+) -> List[Row]:
     """
     Busca todas as subtarefas de uma tarefa.
 
@@ -21,7 +25,7 @@ def get_subtasks_by_task(
         task_id: ID da tarefa
 
     Returns:
-        List[sqlite3.Row]: Lista de subtarefas da tarefa
+        List[Row]: Lista de subtarefas da tarefa
     """
     cursor = conn.execute(
         "SELECT * FROM subtasks WHERE task_id = ? ORDER BY ordem, id",
@@ -30,6 +34,46 @@ def get_subtasks_by_task(
     return cursor.fetchall()
 
 
+def get_subtasks_by_tasks(
+    conn: sqlite3.Connection,
+    task_ids: Iterable[int]
+) -> Dict[int, List[Row]]:
+    """
+    Busca as subtarefas de várias tarefas em uma única consulta.
+
+    Args:
+        conn: Conexão com o banco de dados
+        task_ids: IDs das tarefas
+
+    Returns:
+        Dict[int, List[Row]]: Subtarefas agrupadas pelo ID da tarefa.
+        Toda tarefa informada aparece no dicionário, mesmo sem subtarefas.
+
+    Note:
+        Os IDs são enviados como um único array JSON (json_each), então a
+        consulta não esbarra no limite de parâmetros do SQLite e o custo
+        continua sendo de uma ida ao banco, independente da quantidade.
+    """
+    grouped: Dict[int, List[Row]] = {
+        task_id: [] for task_id in task_ids
+    }
+    if not grouped:
+        return grouped
+
+    cursor = conn.execute(
+        """
+        SELECT * FROM subtasks
+        WHERE task_id IN (SELECT value FROM json_each(?))
+        ORDER BY task_id, ordem, id
+        """,
+        (json.dumps(list(grouped)),)
+    )
+    for row in cursor:
+        grouped[row["task_id"]].append(row)
+    return grouped
+
+
+@writer_op
 def create_subtask(
     conn: sqlite3.Connection,
     task_id: int,
@@ -50,10 +94,13 @@ def create_subtask(
     """
     # Busca a próxima ordem disponível
     cursor = conn.execute(
-        "SELECT COALESCE(MAX(ordem), -1) + 1 FROM subtasks WHERE task_id = ?",
+        """
+        SELECT COALESCE(MAX(ordem), -1) + 1 AS ordem
+        FROM subtasks WHERE task_id = ?
+        """,
         (task_id,)
     )
-    ordem = cursor.fetchone()[0]
+    ordem = cursor.fetchone()["ordem"]
     
     cursor = conn.execute(
         """
@@ -62,10 +109,10 @@ def create_subtask(
         """,
         (task_id, titulo, int(concluida), ordem)
     )
-    conn.commit()
     return cursor.lastrowid
 
 
+@writer_op
 def update_subtask(
     conn: sqlite3.Connection,
     subtask_id: int,
@@ -89,9 +136,9 @@ def update_subtask(
         """,
         (titulo, int(concluida), subtask_id)
     )
-    conn.commit()
 
 
+@writer_op
 def delete_subtask(
     conn: sqlite3.Connection,
     subtask_id: int
@@ -107,25 +154,31 @@ def delete_subtask(
         "DELETE FROM subtasks WHERE id = ?",
         (subtask_id,)
     )
-    conn.commit()
 
 
 def get_subtask_by_id(
     conn: sqlite3.Connection,
-    subtask_id: int
-) -> Optional[sqlite3.Row]:
+    subtask_id: int,
+    user_id: int
+) -> Optional[Row]:
     """
-    Busca uma subtarefa específica pelo ID.
+    Busca uma subtarefa específica pelo ID, se a tarefa dela for do usuário.
 
     Args:
         conn: Conexão com o banco de dados
         subtask_id: ID da subtarefa
+        user_id: ID do usuário dono da tarefa
 
     Returns:
-        sqlite3.Row: Dados da subtarefa se encontrada, None caso contrário
+        Row: Dados da subtarefa se encontrada, None caso contrário
     """
     cursor = conn.execute(
-        "SELECT * FROM subtasks WHERE id = ?",
-        (subtask_id,)
+        """
+        SELECT s.*
+        FROM subtasks s
+        JOIN tasks t ON t.id = s.task_id
+        WHERE s.id = ? AND t.user_id = ?
+        """,
+        (subtask_id, user_id)
     )
     return cursor.fetchone()
\ No newline at end of file
@@ -0,0 +1,214 @@
+"""
+Repositório da sincronização incremental.
+
+A tabela `sync_changes`, mantida por triggers a cada escrita em tarefas,
+subtarefas e categorias, guarda uma linha por entidade com a versão da
+última alteração (veja a migração 7). Exclusões viram tombstones
+(`deleted = 1`), removidos pela compactação depois do período de retenção.
+"""
+
+import json
+import sqlite3
+from typing import Any, Dict, List
+
+from db.database import Row
+
+
+# Entidade em sync_changes -> chave da resposta
+ENTITY_KEYS = {"task": "tasks", "subtask": "subtasks", "category": "categories"}
+
+
+def get_sync_state(conn: sqlite3.Connection, user_id: int) -> Row:
+    """
+    Busca a versão atual dos dados de um usuário e a última compactada.
+
+    Args:
+        conn: Conexão com o banco de dados
+        user_id: ID do usuário
+
+    Returns:
+        Row: `version` e `pruned_version` (ambos 0 se o usuário nunca
+        gravou nada)
+    """
+    cursor = conn.execute(
+        """
+        SELECT version, pruned_version FROM user_data_versions
+        WHERE user_id = ?
+        """,
+        (user_id,)
+    )
+    return cursor.fetchone() or {"version": 0, "pruned_version": 0}
+
+
+def get_changes(
+    conn: sqlite3.Connection,
+    user_id: int,
+    since: int,
+    limit: int
+) -> List[Row]:
+    """
+    Busca as alterações de um usuário posteriores a uma versão.
+
+    Args:
+        conn: Conexão com o banco de dados
+        user_id: ID do usuário
+        since: Última versão que o cliente já tem (0 = nenhuma)
+        limit: Quantidade máxima de alterações retornadas
+
+    Returns:
+        List[Row]: `entity`, `entity_id`, `version` e `deleted`, em ordem
+        de versão
+
+    Note:
+        Usa o índice (user_id, version), então o custo é proporcional ao
+        número de alterações, e não ao total de dados do usuário. Com
+        `since = 0` os tombstones são omitidos: o cliente não tem nada a
+        remover.
+    """
+    cursor = conn.execute(
+        """
+        SELECT entity, entity_id, version, deleted FROM sync_changes
+        WHERE user_id = ? AND version > ? AND (? > 0 OR deleted = 0)
+        ORDER BY version
+        LIMIT ?
+        """,
+        (user_id, since, since, limit)
+    )
+    return cursor.fetchall()
+
+
+def get_changed_rows(
+    conn: sqlite3.Connection,
+    user_id: int,
+    ids_by_entity: Dict[str, List[int]]
+) -> Dict[str, List[Row]]:
+    """
+    Busca os registros atuais das entidades alteradas.
+
+    Args:
+        conn: Conexão com o banco de dados
+        user_id: ID do usuário
+        ids_by_entity: IDs por entidade ("task", "subtask", "category")
+
+    Returns:
+        Dict[str, List[Row]]: Registros por chave da resposta ("tasks",
+        "subtasks", "categories"), com as mesmas colunas das listagens
+    """
+    queries = {
+        "task": """
+            SELECT t.*, c.nome as categoria_nome, c.cor as categoria_cor
+            FROM tasks t
+            LEFT JOIN categories c ON t.categoria_id = c.id
+            WHERE t.user_id = ? AND t.id IN (SELECT value FROM json_each(?))
+            ORDER BY t.id
+        """,
+        "subtask": """
+            SELECT s.* FROM subtasks s
+            JOIN tasks t ON t.id = s.task_id
+            WHERE t.user_id = ? AND s.id IN (SELECT value FROM json_each(?))
+            ORDER BY s.task_id, s.ordem, s.id
+        """,
+        "category": """
+            SELECT * FROM categories
+            WHERE user_id = ? AND id IN (SELECT value FROM json_each(?))
+            ORDER BY nome
+        """,
+    }
+    result: Dict[str, List[Row]] = {}
+    for entity, key in ENTITY_KEYS.items():
+        ids = ids_by_entity.get(entity)
+        result[key] = (
+            conn.execute(queries[entity], (user_id, json.dumps(ids))).fetchall()
+            if ids else []
+        )
+    return result
+
+
+def get_sync_page(
+    conn: sqlite3.Connection,
+    user_id: int,
+    since: int,
+    limit: int
+) -> Dict[str, Any]:
+    """
+    Monta uma página da sincronização em um único snapshot do banco.
+
+    Args:
+        conn: Conexão com o banco de dados
+        user_id: ID do usuário
+        since: Última versão que o cliente já tem (0 = nenhuma)
+        limit: Quantidade máxima de alterações na página
+
+    Returns:
+        Dict[str, Any]: `version` (a usar no próximo `since`),
+        `pruned_version`, `has_more`, os registros alterados em "tasks",
+        "subtasks" e "categories" e os IDs excluídos em "deleted"
+
+    Note:
+        As consultas rodam dentro de um SAVEPOINT, que abre uma transação
+        de leitura se ainda não houver uma: a versão e as linhas vêm do
+        mesmo snapshot, mesmo com escritas concorrentes.
+    """
+    conn.execute("SAVEPOINT sync_page")
+    try:
+        state = get_sync_state(conn, user_id)
+        changes = get_changes(conn, user_id, since, limit + 1)
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+
+        changed: Dict[str, List[int]] = {}
+        deleted: Dict[str, List[int]] = {key: [] for key in ENTITY_KEYS.values()}
+        for change in changes:
+            if change["deleted"]:
+                deleted[ENTITY_KEYS[change["entity"]]].append(change["entity_id"])
+            else:
+                changed.setdefault(change["entity"], []).append(change["entity_id"])
+
+        page = get_changed_rows(conn, user_id, changed)
+    finally:
+        conn.execute("RELEASE sync_page")
+
+    page["deleted"] = deleted
+    page["has_more"] = has_more
+    page["pruned_version"] = state["pruned_version"]
+    page["version"] = changes[-1]["version"] if has_more else state["version"]
+    return page
+
+
+def compact_tombstones(conn: sqlite3.Connection, before: int) -> int:
+    """
+    Remove os tombstones gravados antes de um instante.
+
+    A maior versão removida de cada usuário fica em
+    `user_data_versions.pruned_version`: clientes com `since` menor que ela
+    perderam exclusões e precisam sincronizar do zero.
+
+    Args:
+        conn: Conexão com o banco de dados
+        before: Instante limite (segundos desde a época Unix)
+
+    Returns:
+        int: Quantidade de tombstones removidos
+
+    Note:
+        Deve rodar dentro de uma transação, para que `pruned_version` e a
+        remoção fiquem consistentes entre si.
+    """
+    conn.execute(
+        """
+        UPDATE user_data_versions
+        SET pruned_version = MAX(pruned_version, pruned.version)
+        FROM (
+            SELECT user_id, MAX(version) AS version FROM sync_changes
+            WHERE deleted = 1 AND changed_at < ?
+            GROUP BY user_id
+        ) AS pruned
+        WHERE user_data_versions.user_id = pruned.user_id
+        """,
+        (before,)
+    )
+    cursor = conn.execute(
+        "DELETE FROM sync_changes WHERE deleted = 1 AND changed_at < ?",
+        (before,)
+    )
+    return cursor.rowcount
@@ -5,20 +5,51 @@ Este módulo contém funções para acessar e manipular dados de tarefas
 no banco de dados.
 """
 
+import json
+import re
 import sqlite3
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from datetime import date
 
+from db.database import Row
+from db.writer import writer_op
+
+
+# Campos que a listagem pode selecionar (`fields`) -> expressão SQL
+TASK_FIELDS: Dict[str, str] = {
+    "id": "t.id",
+    "user_id": "t.user_id",
+    "categoria_id": "t.categoria_id",
+    "titulo": "t.titulo",
+    "descricao": "t.descricao",
+    "status": "t.status",
+    "data_criacao": "t.data_criacao",
+    "data_vencimento": "t.data_vencimento",
+    "categoria_nome": "c.nome",
+    "categoria_cor": "c.cor",
+}
+
+# Contagem de subtarefas por tarefa (índice idx_subtasks_task_concluida)
+_SUBTASK_COUNT_COLUMNS = """,
+        (SELECT COUNT(*) FROM subtasks s
+         WHERE s.task_id = t.id) AS subtasks_total,
+        (SELECT COUNT(*) FROM subtasks s
+         WHERE s.task_id = t.id AND s.concluida = 1) AS subtasks_concluidas"""
+
 
 def get_tasks_by_user(
     conn: sqlite3.Connection,
     user_id: int,
     categoria_id: Optional[int] = None,
     data_inicio: Optional[date] = None,
-    data_fim: Optional[date] = None
-) -> List[sqlite3.Row]:
+    data_fim: Optional[date] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[Tuple[str, int]] = None,
+    fields: Optional[Sequence[str]] = None,
+    subtask_counts: bool = False
+) -> List[Row]:
     """
-    Busca todas as tarefas de um usuário com filtros opcionais.
+    Busca as tarefas de um usuário com filtros opcionais.
 
     Args:
         conn: Conexão com o banco de dados
@@ -26,16 +57,89 @@ def get_tasks_by_user(
         categoria_id: Filtro opcional por categoria
         data_inicio: Filtro opcional de data inicial
         data_fim: Filtro opcional de data final
+        limit: Quantidade máxima de tarefas retornadas (opcional)
+        cursor: Par (data_criacao, id) da última tarefa da página anterior
+        fields: Campos selecionados (chaves de TASK_FIELDS); todos se None
+        subtask_counts: Inclui `subtasks_total` e `subtasks_concluidas`
 
     Returns:
-        List[sqlite3.Row]: Lista de tarefas do usuário
+        List[Row]: Lista de tarefas do usuário
+
+    Note:
+        A paginação é por keyset: a próxima página começa logo depois do
+        cursor na ordenação (data_criacao DESC, id DESC), então o custo
+        depende só do tamanho da página, e não da profundidade na lista.
     """
-    query = """
-        SELECT t.*, c.nome as categoria_nome, c.cor as categoria_cor
-        FROM tasks t
-        LEFT JOIN categories c ON t.categoria_id = c.id
-        WHERE t.user_id = ?
+    query, params = _tasks_query(
+        user_id, categoria_id, data_inicio, data_fim, limit, cursor,
+        fields, subtask_counts
+    )
+    return conn.execute(query, params).fetchall()
+
+
+def iter_tasks_by_user(
+    conn: sqlite3.Connection,
+    user_id: int,
+    categoria_id: Optional[int] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    fields: Optional[Sequence[str]] = None,
+    subtask_counts: bool = False
+) -> sqlite3.Cursor:
+    """
+    Abre a consulta das tarefas de um usuário sem carregar o resultado.
+
+    Mesmos filtros e ordenação de `get_tasks_by_user`, mas retorna o cursor
+    já executado para o chamador consumir aos poucos com `fetchmany`.
+
+    Args:
+        conn: Conexão com o banco de dados
+        user_id: ID do usuário
+        categoria_id: Filtro opcional por categoria
+        data_inicio: Filtro opcional de data inicial
+        data_fim: Filtro opcional de data final
+        fields: Campos selecionados (chaves de TASK_FIELDS); todos se None
+        subtask_counts: Inclui `subtasks_total` e `subtasks_concluidas`
+
+    Returns:
+        sqlite3.Cursor: Cursor posicionado antes da primeira tarefa
+
+    Note:
+        Enquanto o cursor não for esgotado, a conexão mantém a transação de
+        leitura aberta: as demais consultas feitas nela no meio tempo (as
+        subtarefas, por exemplo) enxergam o mesmo snapshot do banco.
+    """
+    query, params = _tasks_query(
+        user_id, categoria_id, data_inicio, data_fim,
+        fields=fields, subtask_counts=subtask_counts
+    )
+    return conn.execute(query, params)
+
+
+def _tasks_query(
+    user_id: int,
+    categoria_id: Optional[int] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[Tuple[str, int]] = None,
+    fields: Optional[Sequence[str]] = None,
+    subtask_counts: bool = False
+) -> Tuple[str, Tuple[Any, ...]]:
+    """
+    Monta a consulta da listagem de tarefas e seus parâmetros.
+
+    Só as colunas de `fields` entram no SELECT, e o JOIN com categorias só
+    é feito se algum campo da categoria for pedido.
     """
+    names = list(fields or TASK_FIELDS)
+    columns = ", ".join(f"{TASK_FIELDS[name]} AS {name}" for name in names)
+    if subtask_counts:
+        columns += _SUBTASK_COUNT_COLUMNS
+    query = f"SELECT {columns} FROM tasks t"
+    if any(TASK_FIELDS[name].startswith("c.") for name in names):
+        query += " LEFT JOIN categories c ON t.categoria_id = c.id"
+    query += " WHERE t.user_id = ?"
     params = [user_id]
     
     if categoria_id is not None:
@@ -49,13 +153,100 @@ def get_tasks_by_user(
     if data_fim is not None:
         query += " AND t.data_vencimento <= ?"
         params.append(data_fim)
-    
-    query += " ORDER BY t.data_criacao DESC"
-    
-    cursor = conn.execute(query, tuple(params))
+
+    if cursor is not None:
+        query += " AND (t.data_criacao, t.id) < (?, ?)"
+        params.extend(cursor)
+
+    query += " ORDER BY t.data_criacao DESC, t.id DESC"
+
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+
+    return query, tuple(params)
+
+
+# Termo da busca: letras/dígitos, com `*` opcional no final para prefixo
+_SEARCH_TERM = re.compile(r"(\w+)(\*?)")
+
+
+def _fts_query(user_id: int, q: str) -> Optional[str]:
+    """
+    Converte o texto digitado em uma consulta FTS5 segura.
+
+    Cada termo vira uma frase entre aspas (a sintaxe do FTS5 digitada pelo
+    usuário não é interpretada); termos terminados em `*` buscam por
+    prefixo. Todos os termos precisam aparecer na tarefa, seja no título,
+    na descrição ou nas subtarefas, e a tarefa precisa ter o token do
+    usuário na coluna `owner`.
+
+    Returns:
+        str: Expressão para MATCH, ou None se não houver termos
+    """
+    terms = [
+        f'"{word}"{"*" if prefix else ""}'
+        for word, prefix in _SEARCH_TERM.findall(q)
+    ]
+    if not terms:
+        return None
+    return (
+        f'owner : "u{int(user_id)}" AND '
+        f'{{titulo descricao subtarefas}} : ({" ".join(terms)})'
+    )
+
+
+def search_tasks(
+    conn: sqlite3.Connection,
+    user_id: int,
+    q: str,
+    limit: int
+) -> List[Row]:
+    """
+    Busca textual nas tarefas de um usuário (título, descrição e subtarefas).
+
+    Args:
+        conn: Conexão com o banco de dados
+        user_id: ID do usuário
+        q: Texto da busca (ex.: "comprar pão", "compr*")
+        limit: Quantidade máxima de resultados
+
+    Returns:
+        List[Row]: Tarefas encontradas, da mais relevante para a menos
+        relevante, com `snippet` (trecho com os termos entre <mark>) e
+        `rank` (bm25; quanto menor, mais relevante)
+
+    Note:
+        O índice `tasks_fts` é mantido por triggers (migrações 4 e 9). O
+        dono de cada tarefa faz parte do documento (coluna `owner`) e da
+        expressão do MATCH, então o FTS5 só ranqueia as tarefas do usuário,
+        e não as de todos os usuários que usam o mesmo termo. O peso do
+        bm25 favorece o título, depois a descrição e as subtarefas; `owner`
+        tem peso zero. O CROSS JOIN fixa a ordem da junção: primeiro o
+        índice textual, depois a tarefa pelo rowid.
+    """
+    match = _fts_query(user_id, q)
+    if match is None:
+        return []
+
+    cursor = conn.execute(
+        """
+        SELECT t.*, c.nome as categoria_nome, c.cor as categoria_cor,
+               snippet(tasks_fts, -1, '<mark>', '</mark>', '…', 12) AS snippet,
+               bm25(tasks_fts, 10.0, 4.0, 2.0, 0.0) AS rank
+        FROM tasks_fts
+        CROSS JOIN tasks t ON t.id = tasks_fts.rowid
+        LEFT JOIN categories c ON t.categoria_id = c.id
+        WHERE tasks_fts MATCH ? AND t.user_id = ?
+        ORDER BY rank
+        LIMIT ?
+        """,
+        (match, user_id, limit)
+    )
     return cursor.fetchall()
 
 
+@writer_op
 def create_task(
     conn: sqlite3.Connection,
     user_id: int,
@@ -88,10 +279,74 @@ def create_task(
         """,
         (user_id, categoria_id, titulo, descricao, status, data_vencimento)
     )
-    conn.commit()
     return cursor.lastrowid
 
 
+@writer_op
+def create_tasks_bulk(
+    conn: sqlite3.Connection,
+    user_id: int,
+    tasks: List[Dict[str, Any]]
+) -> List[int]:
+    """
+    Cria várias tarefas (e suas subtarefas) em uma única transação.
+
+    Args:
+        conn: Conexão com o banco de dados
+        user_id: ID do usuário proprietário das tarefas
+        tasks: Tarefas com as chaves titulo, descricao, status,
+            categoria_id, data_vencimento e, opcionalmente, subtasks
+            (lista com titulo e concluida)
+
+    Returns:
+        List[int]: IDs das tarefas criadas, na mesma ordem da entrada
+
+    Note:
+        As tarefas são inseridas com um único executemany. Como a tabela usa
+        AUTOINCREMENT e a transação mantém o lock de escrita, os IDs gerados
+        são consecutivos e terminam no valor de sqlite_sequence.
+    """
+    if not tasks:
+        return []
+
+    conn.executemany(
+        """
+        INSERT INTO tasks
+        (user_id, categoria_id, titulo, descricao, status, data_vencimento)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (
+                user_id,
+                task.get("categoria_id"),
+                task["titulo"],
+                task.get("descricao") or "",
+                task.get("status") or "pendente",
+                task.get("data_vencimento")
+            )
+            for task in tasks
+        ]
+    )
+    last_id = conn.execute(
+        "SELECT seq FROM sqlite_sequence WHERE name = 'tasks'"
+    ).fetchone()["seq"]
+    task_ids = list(range(last_id - len(tasks) + 1, last_id + 1))
+
+    conn.executemany(
+        """
+        INSERT INTO subtasks (task_id, titulo, concluida, ordem)
+        VALUES (?, ?, ?, ?)
+        """,
+        [
+            (task_id, subtask["titulo"], int(subtask["concluida"]), ordem)
+            for task_id, task in zip(task_ids, tasks)
+            for ordem, subtask in enumerate(task.get("subtasks") or [])
+        ]
+    )
+    return task_ids
+
+
+@writer_op
 def update_task(
     conn: sqlite3.Connection,
     task_id: int,
@@ -124,23 +379,138 @@ def update_task(
         """,
         (titulo, descricao, status, categoria_id, data_vencimento, task_id, user_id)
     )
-    conn.commit()
 
 
+_BATCH_UPDATABLE_COLUMNS = (
+    "titulo", "descricao", "status", "categoria_id", "data_vencimento"
+)
+
+
+def _batch_where(
+    user_id: int,
+    ids: Optional[List[int]],
+    categoria_id: Optional[int],
+    status: Optional[str],
+    data_inicio: Optional[date],
+    data_fim: Optional[date]
+) -> Tuple[str, List[Any]]:
+    """Monta o WHERE que seleciona as tarefas de uma operação em lote."""
+    clauses = ["user_id = ?"]
+    params: List[Any] = [user_id]
+
+    if ids is not None:
+        clauses.append("id IN (SELECT value FROM json_each(?))")
+        params.append(json.dumps(ids))
+    if categoria_id is not None:
+        clauses.append("categoria_id = ?")
+        params.append(categoria_id)
+    if status is not None:
+        clauses.append("status = ?")
+        params.append(status)
+    if data_inicio is not None:
+        clauses.append("data_vencimento >= ?")
+        params.append(data_inicio)
+    if data_fim is not None:
+        clauses.append("data_vencimento <= ?")
+        params.append(data_fim)
+
+    return " AND ".join(clauses), params
+
+
+@writer_op
+def update_tasks_batch(
+    conn: sqlite3.Connection,
+    user_id: int,
+    changes: Dict[str, Any],
+    ids: Optional[List[int]] = None,
+    categoria_id: Optional[int] = None,
+    status: Optional[str] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None
+) -> List[int]:
+    """
+    Atualiza de uma vez as tarefas selecionadas por IDs e/ou filtros.
+
+    Args:
+        conn: Conexão com o banco de dados
+        user_id: ID do usuário (só tarefas dele são afetadas)
+        changes: Colunas a alterar e seus novos valores
+        ids: IDs das tarefas (opcional)
+        categoria_id: Filtro opcional por categoria
+        status: Filtro opcional por status
+        data_inicio: Filtro opcional de vencimento inicial
+        data_fim: Filtro opcional de vencimento final
+
+    Returns:
+        List[int]: IDs das tarefas atualizadas
+
+    Note:
+        É um único UPDATE; o commit fica a cargo da transação da requisição.
+    """
+    columns = [c for c in _BATCH_UPDATABLE_COLUMNS if c in changes]
+    if not columns:
+        return []
+
+    where, params = _batch_where(
+        user_id, ids, categoria_id, status, data_inicio, data_fim
+    )
+    cursor = conn.execute(
+        f"UPDATE tasks SET {', '.join(f'{c} = ?' for c in columns)} "
+        f"WHERE {where} RETURNING id",
+        [changes[c] for c in columns] + params
+    )
+    return [row["id"] for row in cursor.fetchall()]
+
+
+@writer_op
+def delete_tasks_batch(
+    conn: sqlite3.Connection,
+    user_id: int,
+    ids: Optional[List[int]] = None,
+    categoria_id: Optional[int] = None,
+    status: Optional[str] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None
+) -> List[int]:
+    """
+    Exclui de uma vez as tarefas selecionadas por IDs e/ou filtros.
+
+    Args:
+        conn: Conexão com o banco de dados
+        user_id: ID do usuário (só tarefas dele são afetadas)
+        ids: IDs das tarefas (opcional)
+        categoria_id: Filtro opcional por categoria
+        status: Filtro opcional por status
+        data_inicio: Filtro opcional de vencimento inicial
+        data_fim: Filtro opcional de vencimento final
+
+    Returns:
+        List[int]: IDs das tarefas excluídas
+    """
+    where, params = _batch_where(
+        user_id, ids, categoria_id, status, data_inicio, data_fim
+    )
+    cursor = conn.execute(
+        f"DELETE FROM tasks WHERE {where} RETURNING id",
+        params
+    )
+    return [row["id"] for row in cursor.fetchall()]
+
+
+@writer_op
 def delete_task(conn: sqlite3.Connection, task_id: int, user_id: int) -> None:
     """Exclui uma tarefa do banco de dados."""
     conn.execute(
         "DELETE FROM tasks WHERE id = ? AND user_id = ?",
         (task_id, user_id)
     )
-    conn.commit()
 
 
 def get_task_by_id(
     conn: sqlite3.Connection,
     task_id: int,
     user_id: int
-) -> Optional[sqlite3.Row]:
+) -> Optional[Row]:
     """Busca uma tarefa específica pelo ID."""
     cursor = conn.execute(
         """
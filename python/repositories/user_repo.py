@@ -8,8 +8,11 @@ no banco de dados.
 import sqlite3
 from typing import Optional
 
+from db.database import Row
+from db.writer import writer_op
 
-def get_user_by_email(conn: sqlite3.Connection, email: str) -> Optional[sqlite3.Row]:
+
+def get_user_by_email(conn: sqlite3.Connection, email: str) -> Optional[Row]:
     """
     Busca um usuário pelo email.
 
@@ -18,7 +21,7 @@ def get_user_by_email(conn: sqlite3.Connection, email: str) -> Optional[sqlite3.
         email: Email do usuário a ser buscado
 
     Returns:
-        sqlite3.Row: Dados do usuário se encontrado, None caso contrário
+        Row: Dados do usuário se encontrado, None caso contrário
     """
     cursor = conn.execute(
         "SELECT * FROM users WHERE email = ?",
@@ -27,6 +30,7 @@ def get_user_by_email(conn: sqlite3.Connection, email: str) -> Optional[sqlite3.
     return cursor.fetchone()
 
 
+@writer_op
 def create_user(conn: sqlite3.Connection, email: str, password_hash: str) -> None:
     """
     Cria um novo usuário no banco de dados.
@@ -37,10 +41,33 @@ def create_user(conn: sqlite3.Connection, email: str, password_hash: str) -> Non
         password_hash: Hash da senha do usuário
 
     Note:
-        A transação é automaticamente commitada após a inserção.
+        O commit fica a cargo de quem controla a transação (veja get_db).
     """
     conn.execute(
         "INSERT INTO users (email, password_hash) VALUES (?, ?)",
         (email, password_hash)
     )
-    conn.commit()
\ No newline at end of file
+
+
+@writer_op
+def update_user_password_hash(
+    conn: sqlite3.Connection,
+    user_id: int,
+    password_hash: str
+) -> None:
+    """
+    Substitui o hash de senha de um usuário.
+
+    Args:
+        conn: Conexão com o banco de dados
+        user_id: ID do usuário
+        password_hash: Novo hash da senha
+
+    Note:
+        O commit fica a cargo de quem controla a transação; os tokens em
+        cache do usuário devem ser invalidados só depois dele.
+    """
+    conn.execute(
+        "UPDATE users SET password_hash = ? WHERE id = ?",
+        (password_hash, user_id)
+    )
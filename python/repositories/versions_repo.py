@@ -0,0 +1,27 @@
+"""
+Repositório de versões dos dados.
+
+Cada usuário tem um contador em `user_data_versions`, incrementado por
+triggers a cada escrita em tarefas, subtarefas e categorias dele.
+"""
+
+import sqlite3
+
+
+def get_user_version(conn: sqlite3.Connection, user_id: int) -> int:
+    """
+    Busca a versão atual dos dados de um usuário.
+
+    Args:
+        conn: Conexão com o banco de dados
+        user_id: ID do usuário
+
+    Returns:
+        int: Versão atual (0 se o usuário nunca gravou nada)
+    """
+    cursor = conn.execute(
+        "SELECT version FROM user_data_versions WHERE user_id = ?",
+        (user_id,)
+    )
+    row = cursor.fetchone()
+    return row["version"] if row else 0
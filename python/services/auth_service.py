@@ -3,62 +3,101 @@ Serviço de autenticação.
 
 Este módulo contém a lógica de negócio para registro e autenticação
 de usuários.
+
+O hash e a verificação de senhas (bcrypt) demoram centenas de
+milissegundos; durante esse tempo nenhuma conexão do pool fica reservada.
+Cada acesso ao banco usa uma unidade de trabalho curta (`db_session_async`).
 """
 
 import sqlite3
 from typing import Optional
 
-from repositories.user_repo import get_user_by_email, create_user
-from core.security import hash_password, verify_password
-
-
-def register(conn: sqlite3.Connection, email: str, password: str) -> bool:
+from db.database import Row, db_session_async
+from repositories.aio.user_repo import (
+    get_user_by_email,
+    create_user,
+    update_user_password_hash
+)
+from core.token_cache import token_cache
+from core.security import (
+    PasswordHasherBusy,
+    hash_password_async,
+    verify_password_async,
+    password_needs_rehash
+)
+
+
+async def register(email: str, password: str) -> bool:
     """
     Registra um novo usuário no sistema.
 
     Args:
-        conn: Conexão com o banco de dados
         email: Email do usuário
         password: Senha em texto plano
 
     Returns:
         bool: True se o registro foi bem-sucedido, False se o usuário já existe
+
+    Raises:
+        PasswordHasherBusy: Se o pool de hash de senhas estiver saturado
     """
     # Verifica se o usuário já existe
-    if get_user_by_email(conn, email):
-        return False
-
-    # Cria hash da senha e salva o usuário
-    password_hash = hash_password(password)
-    create_user(conn, email, password_hash)
+    async with db_session_async() as conn:
+        if await get_user_by_email(conn, email):
+            return False
+
+    # Cria hash da senha (no pool de processos) e salva o usuário
+    password_hash = await hash_password_async(password)
+    async with db_session_async() as conn:
+        try:
+            await create_user(conn, email, password_hash)
+        except sqlite3.IntegrityError:
+            # Outro registro com o mesmo email entrou durante o hash
+            return False
 
     return True
 
 
-def authenticate(
-    conn: sqlite3.Connection,
-    email: str,
-    password: str
-) -> Optional[sqlite3.Row]:
+async def authenticate(email: str, password: str) -> Optional[Row]:
     """
     Autentica um usuário verificando email e senha.
 
     Args:
-        conn: Conexão com o banco de dados
         email: Email do usuário
         password: Senha em texto plano
 
     Returns:
-        sqlite3.Row: Dados do usuário se autenticado, None caso contrário
+        Row: Dados do usuário se autenticado, None caso contrário
+
+    Raises:
+        PasswordHasherBusy: Se o pool de hash de senhas estiver saturado
+
+    Note:
+        Se o hash armazenado usar um custo diferente de BCRYPT_ROUNDS, ele
+        é refeito com a senha recebida e salvo no banco.
     """
-    user = get_user_by_email(conn, email)
+    async with db_session_async() as conn:
+        user = await get_user_by_email(conn, email)
 
     # Verifica se o usuário existe
     if not user:
         return None
 
     # Verifica se a senha está correta
-    if not verify_password(password, user["password_hash"]):
+    if not await verify_password_async(password, user["password_hash"]):
         return None
 
-    return user
\ No newline at end of file
+    # Atualiza hashes antigos quando o custo configurado muda
+    if password_needs_rehash(user["password_hash"]):
+        try:
+            new_hash = await hash_password_async(password)
+        except PasswordHasherBusy:
+            # O login já foi validado; o rehash fica para a próxima vez
+            return user
+        async with db_session_async() as conn:
+            await update_user_password_hash(conn, user["id"], new_hash)
+        # Depois do commit: antes dele, outra requisição poderia ler a
+        # linha antiga e guardá-la de novo no cache
+        token_cache.invalidate_user(user["id"])
+
+    return user
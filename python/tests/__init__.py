@@ -0,0 +1,7 @@
+"""
+Testes da API.
+
+Executados com pytest a partir do diretório `python/`:
+
+    python -m pytest
+"""
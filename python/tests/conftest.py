@@ -0,0 +1,89 @@
+"""
+Fixtures comuns dos testes.
+
+A configuração da aplicação é lida na importação (`core.config`), então as
+variáveis de ambiente são definidas aqui, antes de qualquer import dela. O
+banco da sessão de testes fica em um diretório temporário.
+"""
+
+import os
+import tempfile
+import uuid
+
+import pytest
+
+_TMP_DIR = tempfile.mkdtemp(prefix="todolist-tests-")
+os.environ["DATABASE_PATH"] = os.path.join(_TMP_DIR, "todolist.db")
+os.environ["SECRET_KEY"] = "todolist-tests-" + "x" * 32
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["DB_SINGLE_WRITER"] = "0"
+os.environ["LOG_LEVEL"] = "WARNING"
+os.environ["LOG_SAMPLE_RATE"] = "0"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+PASSWORD = "secret123"
+
+
+@pytest.fixture(scope="session")
+def app():
+    from main import app
+    return app
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """Cliente da aplicação, com o lifespan (migrações, pool) executado."""
+    with TestClient(app) as client:
+        yield client
+
+
+def _new_user_headers(client):
+    email = f"{uuid.uuid4().hex}@test.com"
+    client.post(
+        "/register", json={"email": email, "password": PASSWORD}
+    ).raise_for_status()
+    response = client.post(
+        "/login", data={"username": email, "password": PASSWORD}
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Cabeçalho Authorization de um usuário novo, criado para o teste."""
+    return _new_user_headers(client)
+
+
+@pytest.fixture
+def other_headers(client):
+    """Cabeçalho Authorization de um segundo usuário (testes de isolamento)."""
+    return _new_user_headers(client)
+
+
+@pytest.fixture
+def statements(app):
+    """
+    Instruções SQL executadas na conexão da requisição (`get_async_db`).
+
+    A lista recebe o texto de cada instrução pelo trace callback do sqlite3;
+    as linhas que começam com "--" são instruções internas (triggers, FTS).
+    """
+    from db.database import db_session_async, get_async_db
+
+    executed = []
+
+    async def traced_db():
+        async with db_session_async() as conn:
+            conn.set_trace_callback(executed.append)
+            yield conn
+
+    app.dependency_overrides[get_async_db] = traced_db
+    yield executed
+    app.dependency_overrides.pop(get_async_db, None)
+
+
+def sql(executed):
+    """Instruções executadas diretamente, sem as internas ("--")."""
+    return [s for s in executed if not s.startswith("--")]
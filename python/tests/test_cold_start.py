@@ -0,0 +1,93 @@
+"""
+Partida a frio: importar a aplicação não pode ter efeitos no banco.
+
+O esquema é preparado no lifespan (`init_db`), e não na importação de
+`main`; com o esquema já na versão atual, `init_db` não executa DDL. Os
+testes rodam em um processo novo, como um worker recém-iniciado.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+
+# Importa `main`, lista o diretório do banco e depois chama init_db duas
+# vezes, registrando as instruções da segunda chamada
+SCRIPT = """
+import json, os, sys
+
+import main  # noqa: F401
+
+directory = sys.argv[1]
+after_import = sorted(os.listdir(directory))
+
+from db import init_db as module
+
+first_version = module.init_db()
+
+executed = []
+connect = module.connect
+
+
+def traced_connect(*args, **kwargs):
+    conn = connect(*args, **kwargs)
+    conn.set_trace_callback(executed.append)
+    return conn
+
+
+module.connect = traced_connect
+second_version = module.init_db()
+
+print(json.dumps({
+    "after_import": after_import,
+    "first_version": first_version,
+    "second_version": second_version,
+    "executed": executed,
+}))
+"""
+
+
+@pytest.fixture(scope="module")
+def cold_start(tmp_path_factory):
+    """Resultado do SCRIPT em um processo novo, com um banco ainda inexistente."""
+    tmp_path = tmp_path_factory.mktemp("cold-start")
+    env = {
+        **os.environ,
+        "DATABASE_PATH": str(tmp_path / "todolist.db"),
+        "LOG_LEVEL": "WARNING",
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT, str(tmp_path)],
+        cwd=PYTHON_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_does_not_touch_database(cold_start):
+    assert cold_start["after_import"] == []
+
+
+def test_init_db_on_current_schema_runs_no_ddl(cold_start):
+    result = cold_start
+    # O trace funcionou: a versão do esquema foi lida
+    assert result["executed"]
+    assert result["second_version"] == result["first_version"]
+
+    ddl = [
+        s for s in result["executed"]
+        if s.lstrip().split(None, 1)[0].upper() in ("CREATE", "ALTER", "DROP")
+    ]
+    assert ddl == []
+    # Só a leitura da versão: nenhuma transação de migração
+    assert not any(s.strip().upper().startswith("BEGIN") for s in result["executed"])
@@ -0,0 +1,151 @@
+"""ETag e 304 das listagens; versão dos dados mantida por triggers."""
+
+from core.config import DATABASE_PATH
+from db.database import connect
+from repositories.versions_repo import get_user_version
+from tests.conftest import sql
+
+
+def _create_task(client, headers, titulo="Tarefa"):
+    response = client.post("/tasks", json={"titulo": titulo}, headers=headers)
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def _version(client, headers):
+    user_id = client.get("/me", headers=headers).json()["id"]
+    conn = connect(DATABASE_PATH)
+    try:
+        return get_user_version(conn, user_id)
+    finally:
+        conn.close()
+
+
+def test_unchanged_list_returns_304(client, auth_headers, statements):
+    _create_task(client, auth_headers)
+    response = client.get("/tasks", headers=auth_headers)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "private, no-cache"
+
+    statements.clear()
+    response = client.get(
+        "/tasks", headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    # Só a versão foi lida; as consultas da listagem não rodaram
+    assert not any("FROM tasks" in s for s in sql(statements))
+
+    # Comparação fraca: o ETag sem W/ também vale
+    response = client.get(
+        "/tasks",
+        headers={**auth_headers, "If-None-Match": etag.removeprefix("W/")}
+    )
+    assert response.status_code == 304
+
+
+def test_writes_change_the_etag(client, auth_headers):
+    task_id = _create_task(client, auth_headers)
+    etags = [client.get("/tasks", headers=auth_headers).headers["etag"]]
+
+    writes = [
+        lambda: client.put(
+            f"/tasks/{task_id}", json={"titulo": "Nova"}, headers=auth_headers
+        ),
+        lambda: client.post(
+            f"/tasks/{task_id}/subtasks",
+            json={"titulo": "Item"},
+            headers=auth_headers
+        ),
+        lambda: client.delete(f"/tasks/{task_id}", headers=auth_headers),
+    ]
+    for write in writes:
+        write().raise_for_status()
+        response = client.get(
+            "/tasks", headers={**auth_headers, "If-None-Match": etags[-1]}
+        )
+        assert response.status_code == 200
+        etags.append(response.headers["etag"])
+
+    assert len(set(etags)) == len(etags)
+
+
+def test_etag_depends_on_query(client, auth_headers):
+    _create_task(client, auth_headers)
+    full = client.get("/tasks", headers=auth_headers).headers["etag"]
+
+    response = client.get(
+        "/tasks?include=none", headers={**auth_headers, "If-None-Match": full}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != full
+
+
+def test_other_user_writes_keep_the_etag(client, auth_headers, other_headers):
+    _create_task(client, auth_headers)
+    etag = client.get("/tasks", headers=auth_headers).headers["etag"]
+
+    _create_task(client, other_headers)
+
+    response = client.get(
+        "/tasks", headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+
+def test_categories_etag(client, auth_headers):
+    etag = client.get("/categories", headers=auth_headers).headers["etag"]
+    response = client.get(
+        "/categories", headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+    client.post(
+        "/categories", json={"nome": "Casa"}, headers=auth_headers
+    ).raise_for_status()
+    response = client.get(
+        "/categories", headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert [c["nome"] for c in response.json()] == ["Casa"]
+
+
+def test_version_triggers(client, auth_headers, other_headers):
+    """Cada escrita nas tabelas do usuário incrementa a versão dele."""
+    assert _version(client, auth_headers) == 0
+
+    category_id = client.post(
+        "/categories", json={"nome": "Casa"}, headers=auth_headers
+    ).json()["id"]
+    after_category = _version(client, auth_headers)
+    assert after_category > 0
+
+    task_id = _create_task(client, auth_headers)
+    after_task = _version(client, auth_headers)
+    assert after_task > after_category
+
+    subtask_id = client.post(
+        f"/tasks/{task_id}/subtasks", json={"titulo": "Item"},
+        headers=auth_headers
+    ).json()["id"]
+    after_subtask = _version(client, auth_headers)
+    assert after_subtask > after_task
+
+    client.put(
+        f"/subtasks/{subtask_id}", json={"concluida": True},
+        headers=auth_headers
+    ).raise_for_status()
+    after_update = _version(client, auth_headers)
+    assert after_update > after_subtask
+
+    client.delete(
+        f"/categories/{category_id}", headers=auth_headers
+    ).raise_for_status()
+    after_delete = _version(client, auth_headers)
+    assert after_delete > after_update
+
+    # Escritas de outro usuário não mexem na versão
+    _create_task(client, other_headers)
+    assert _version(client, auth_headers) == after_delete
@@ -0,0 +1,45 @@
+"""Pool de processos de hash de senhas (`core.security`)."""
+
+import asyncio
+import os
+import signal
+import time
+
+from core import security
+from tests.conftest import PASSWORD
+
+
+def test_pool_is_started_by_lifespan(client):
+    pool = security._hash_pool
+    assert pool is not None
+    assert len(pool._processes) == security.PASSWORD_HASH_WORKERS
+
+
+def test_hash_works_after_worker_dies(client):
+    asyncio.run(security.hash_password_async("antes"))
+    pool = security._hash_pool
+    pid = next(iter(pool._processes))
+    os.kill(pid, signal.SIGKILL)
+    # O executor percebe a morte do processo e marca o pool como quebrado
+    deadline = time.monotonic() + 5
+    while not pool._broken and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    hashed = asyncio.run(security.hash_password_async("depois"))
+    assert security.verify_password("depois", hashed)
+    assert security._hash_pool is not pool
+
+
+def test_login_works_after_worker_dies(client, auth_headers):
+    email = client.get("/me", headers=auth_headers).json()["email"]
+    pool = security._hash_pool
+    for pid in list(pool._processes):
+        os.kill(pid, signal.SIGKILL)
+    deadline = time.monotonic() + 5
+    while not pool._broken and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    response = client.post(
+        "/login", data={"username": email, "password": PASSWORD}
+    )
+    assert response.status_code == 200
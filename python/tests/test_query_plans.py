@@ -0,0 +1,157 @@
+"""
+Planos das consultas dos repositórios.
+
+Cada função de `tasks_repo`, `subtasks_repo` e `categories_repo` é
+executada em um banco migrado; as instruções que ela executa são
+capturadas pelo trace do sqlite3 e passadas por EXPLAIN QUERY PLAN. Nenhuma
+pode varrer (SCAN) uma tabela base: toda busca tem que usar um índice.
+"""
+
+import re
+from datetime import date
+
+import pytest
+
+from db.database import connect
+from db.migrations import migrate
+from repositories import categories_repo, subtasks_repo, tasks_repo
+from tests.conftest import sql
+
+
+BASE_TABLES = {"users", "categories", "tasks", "subtasks"}
+# Apelidos usados nas consultas dos repositórios
+ALIASES = {"t": "tasks", "c": "categories", "s": "subtasks"}
+
+_SCAN = re.compile(r"^SCAN (\w+)")
+
+TODAY = date.today()
+
+CALLS = {
+    "tasks_repo.get_tasks_by_user": lambda conn: tasks_repo.get_tasks_by_user(
+        conn, 1
+    ),
+    "tasks_repo.get_tasks_by_user (filtros e página)":
+        lambda conn: tasks_repo.get_tasks_by_user(
+            conn, 1, 1, TODAY, TODAY, 10, ("2099-01-01 00:00:00", 10),
+            None, True
+        ),
+    "tasks_repo.get_tasks_by_user (datas)":
+        lambda conn: tasks_repo.get_tasks_by_user(
+            conn, 1, data_inicio=TODAY, data_fim=TODAY
+        ),
+    "tasks_repo.iter_tasks_by_user": lambda conn: tasks_repo.iter_tasks_by_user(
+        conn, 1, fields=["id", "titulo"]
+    ).fetchall(),
+    "tasks_repo.search_tasks": lambda conn: tasks_repo.search_tasks(
+        conn, 1, "tarefa compr*", 10
+    ),
+    "tasks_repo.get_task_by_id": lambda conn: tasks_repo.get_task_by_id(
+        conn, 1, 1
+    ),
+    "tasks_repo.create_task": lambda conn: tasks_repo.create_task(
+        conn, 1, "Nova", None, "pendente", 1, None
+    ),
+    "tasks_repo.create_tasks_bulk": lambda conn: tasks_repo.create_tasks_bulk(
+        conn, 1,
+        [{"titulo": "Lote", "descricao": None, "status": "pendente",
+          "categoria_id": None, "data_vencimento": None,
+          "subtasks": [{"titulo": "Sub", "concluida": False}]}]
+    ),
+    "tasks_repo.update_task": lambda conn: tasks_repo.update_task(
+        conn, 1, 1, "Alterada", None, "concluida", None, None
+    ),
+    "tasks_repo.update_tasks_batch (ids)":
+        lambda conn: tasks_repo.update_tasks_batch(
+            conn, 1, {"status": "concluida"}, ids=[1, 2]
+        ),
+    "tasks_repo.update_tasks_batch (filtro)":
+        lambda conn: tasks_repo.update_tasks_batch(
+            conn, 1, {"status": "concluida"}, categoria_id=1,
+            status="pendente"
+        ),
+    "tasks_repo.delete_tasks_batch": lambda conn: tasks_repo.delete_tasks_batch(
+        conn, 1, ids=[2, 3]
+    ),
+    "tasks_repo.delete_task": lambda conn: tasks_repo.delete_task(conn, 1, 1),
+    "subtasks_repo.get_subtasks_by_task":
+        lambda conn: subtasks_repo.get_subtasks_by_task(conn, 1),
+    "subtasks_repo.get_subtasks_by_tasks":
+        lambda conn: subtasks_repo.get_subtasks_by_tasks(conn, [1, 2, 3]),
+    "subtasks_repo.get_subtask_by_id":
+        lambda conn: subtasks_repo.get_subtask_by_id(conn, 1, 1),
+    "subtasks_repo.create_subtask":
+        lambda conn: subtasks_repo.create_subtask(conn, 1, "Nova"),
+    "subtasks_repo.update_subtask":
+        lambda conn: subtasks_repo.update_subtask(conn, 1, "Alterada", True),
+    "subtasks_repo.delete_subtask":
+        lambda conn: subtasks_repo.delete_subtask(conn, 1),
+    "categories_repo.get_categories_by_user":
+        lambda conn: categories_repo.get_categories_by_user(conn, 1),
+    "categories_repo.get_category_by_id":
+        lambda conn: categories_repo.get_category_by_id(conn, 1, 1),
+    "categories_repo.get_category_ids_for_user":
+        lambda conn: categories_repo.get_category_ids_for_user(conn, 1, {1, 2}),
+    "categories_repo.create_category":
+        lambda conn: categories_repo.create_category(conn, 1, "Nova", "#000000"),
+    "categories_repo.update_category":
+        lambda conn: categories_repo.update_category(
+            conn, 1, 1, "Alterada", "#ffffff"
+        ),
+    "categories_repo.delete_category":
+        lambda conn: categories_repo.delete_category(conn, 1, 1),
+}
+
+
+@pytest.fixture(scope="module")
+def conn(tmp_path_factory):
+    """Banco migrado com dois usuários, categorias, tarefas e subtarefas."""
+    conn = connect(str(tmp_path_factory.mktemp("plans") / "todolist.db"))
+    migrate(conn)
+    for user_id in (1, 2):
+        conn.execute(
+            "INSERT INTO users (email, password_hash) VALUES (?, 'x')",
+            (f"user{user_id}@test.com",)
+        )
+        category_id = categories_repo.create_category(
+            conn, user_id, "Casa", "#112233"
+        )
+        for i in range(20):
+            task_id = tasks_repo.create_task(
+                conn, user_id, f"Tarefa {i} comprar", None, "pendente",
+                category_id if i % 2 else None, TODAY
+            )
+            for j in range(3):
+                subtasks_repo.create_subtask(conn, task_id, f"Sub {j}")
+    conn.commit()
+    conn.execute("ANALYZE")
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize("name", CALLS)
+def test_repository_query_uses_indexes(conn, name):
+    executed = []
+    conn.set_trace_callback(executed.append)
+    try:
+        CALLS[name](conn)
+    finally:
+        conn.set_trace_callback(None)
+        # As escritas são desfeitas para não afetar os demais casos
+        conn.rollback()
+
+    statements = [
+        s for s in sql(executed)
+        if s.split(None, 1)[0].upper() in ("SELECT", "INSERT", "UPDATE",
+                                           "DELETE", "WITH")
+    ]
+    assert statements, "nenhuma consulta capturada"
+    for statement in statements:
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {statement}").fetchall()
+        for step in plan:
+            match = _SCAN.match(step["detail"])
+            if match is None:
+                continue
+            table = ALIASES.get(match.group(1), match.group(1))
+            assert table not in BASE_TABLES, (
+                f"{step['detail']} em:\n{statement}"
+            )
@@ -0,0 +1,95 @@
+"""Busca textual (GET /tasks/search) restrita às tarefas do usuário."""
+
+from db.database import connect
+from db.migrations import migrate
+from repositories import tasks_repo
+
+
+def _create(client, headers, titulo, descricao=None):
+    response = client.post(
+        "/tasks",
+        json={"titulo": titulo, "descricao": descricao},
+        headers=headers
+    )
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def _seed(conn, own, others):
+    conn.executemany(
+        "INSERT INTO users (email, password_hash) VALUES (?, 'x')",
+        [("a@test.com",), ("b@test.com",)]
+    )
+    conn.executemany(
+        "INSERT INTO tasks (user_id, titulo) VALUES (?, ?)",
+        [(1, "comprar pão")] * own + [(2, "comprar pão")] * others
+    )
+    conn.commit()
+
+
+def test_search_returns_only_own_tasks(client, auth_headers, other_headers):
+    own = _create(client, auth_headers, "Comprar pão")
+    described = _create(client, auth_headers, "Mercado", "comprar leite")
+    others = [
+        _create(client, other_headers, f"Comprar item {i}") for i in range(30)
+    ]
+
+    response = client.get("/tasks/search?q=compr*", headers=auth_headers)
+    assert response.status_code == 200
+    results = response.json()
+    assert {r["id"] for r in results} == {own, described}
+    # O trecho vem da coluna onde o termo apareceu, não do dono
+    snippets = {r["id"]: r["snippet"] for r in results}
+    assert snippets[described] == "<mark>comprar</mark> leite"
+
+    response = client.get("/tasks/search?q=compr*", headers=other_headers)
+    assert {r["id"] for r in response.json()} == set(others)
+
+
+def test_owner_token_is_not_searchable(client, auth_headers, other_headers):
+    _create(client, other_headers, "Tarefa do outro")
+    other_id = client.get("/me", headers=other_headers).json()["id"]
+
+    response = client.get(f"/tasks/search?q=u{other_id}", headers=auth_headers)
+    assert response.json() == []
+
+
+def test_match_is_scoped_in_the_index(tmp_path):
+    """O próprio MATCH, sem a junção com tasks, só devolve linhas do usuário."""
+    conn = connect(str(tmp_path / "todolist.db"))
+    migrate(conn)
+    _seed(conn, own=3, others=200)
+
+    matched = conn.execute(
+        "SELECT COUNT(*) AS n FROM tasks_fts WHERE tasks_fts MATCH ?",
+        (tasks_repo._fts_query(1, "comprar"),)
+    ).fetchone()["n"]
+    assert matched == 3
+    assert len(tasks_repo.search_tasks(conn, 1, "comprar", 50)) == 3
+
+    executed = []
+    conn.set_trace_callback(executed.append)
+    tasks_repo.search_tasks(conn, 1, "comprar", 50)
+    conn.set_trace_callback(None)
+    statement = next(s for s in executed if "tasks_fts" in s)
+    plan = [
+        row["detail"]
+        for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}")
+    ]
+    # Primeiro o índice textual, depois a tarefa pelo rowid
+    assert plan[0].startswith("SCAN tasks_fts VIRTUAL TABLE INDEX")
+    assert plan[1] == "SEARCH t USING INTEGER PRIMARY KEY (rowid=?)"
+    conn.close()
+
+
+def test_migration_indexes_existing_tasks(tmp_path):
+    conn = connect(str(tmp_path / "todolist.db"))
+    migrate(conn, target=8)
+    _seed(conn, own=2, others=5)
+    conn.execute("INSERT INTO subtasks (task_id, titulo) VALUES (1, 'ovos')")
+    conn.commit()
+
+    migrate(conn)
+    assert [r["id"] for r in tasks_repo.search_tasks(conn, 1, "ovos", 50)] == [1]
+    assert len(tasks_repo.search_tasks(conn, 2, "comprar", 50)) == 5
+    conn.close()
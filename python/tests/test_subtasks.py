@@ -0,0 +1,48 @@
+"""Rotas de subtarefas restritas às tarefas do usuário."""
+
+
+def _create_subtask(client, headers):
+    task_id = client.post(
+        "/tasks", json={"titulo": "Tarefa"}, headers=headers
+    ).json()["id"]
+    subtask_id = client.post(
+        f"/tasks/{task_id}/subtasks", json={"titulo": "Item"}, headers=headers
+    ).json()["id"]
+    return task_id, subtask_id
+
+
+def _subtasks(client, headers, task_id):
+    tasks = client.get("/tasks", headers=headers).json()
+    return next(t["subtasks"] for t in tasks if t["id"] == task_id)
+
+
+def test_owner_updates_and_deletes_subtask(client, auth_headers):
+    task_id, subtask_id = _create_subtask(client, auth_headers)
+
+    response = client.put(
+        f"/subtasks/{subtask_id}",
+        json={"concluida": True},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert _subtasks(client, auth_headers, task_id)[0]["concluida"]
+
+    response = client.delete(f"/subtasks/{subtask_id}", headers=auth_headers)
+    assert response.status_code == 200
+    assert _subtasks(client, auth_headers, task_id) == []
+
+
+def test_other_user_cannot_touch_subtask(client, auth_headers, other_headers):
+    task_id, subtask_id = _create_subtask(client, auth_headers)
+
+    response = client.put(
+        f"/subtasks/{subtask_id}",
+        json={"titulo": "Alterada"},
+        headers=other_headers
+    )
+    assert response.status_code == 404
+    response = client.delete(f"/subtasks/{subtask_id}", headers=other_headers)
+    assert response.status_code == 404
+
+    subtasks = _subtasks(client, auth_headers, task_id)
+    assert [s["titulo"] for s in subtasks] == ["Item"]
@@ -0,0 +1,119 @@
+"""Sincronização incremental (GET /sync) e compactação dos tombstones."""
+
+import asyncio
+
+from core.config import DATABASE_PATH
+from db import maintenance
+
+
+def _create(client, headers, titulo):
+    response = client.post("/tasks", json={"titulo": titulo}, headers=headers)
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def _sync(client, headers, since=0):
+    response = client.get(f"/sync?since={since}", headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_full_sync_returns_only_own_data(client, auth_headers, other_headers):
+    own = _create(client, auth_headers, "Minha tarefa")
+    _create(client, other_headers, "Tarefa do outro")
+
+    page = _sync(client, auth_headers)
+    assert [t["id"] for t in page["tasks"]] == [own]
+    assert page["has_more"] is False
+    assert page["version"] > 0
+
+
+def test_since_returns_only_later_changes(client, auth_headers):
+    first = _create(client, auth_headers, "Primeira")
+    version = _sync(client, auth_headers)["version"]
+
+    second = _create(client, auth_headers, "Segunda")
+    client.put(
+        f"/tasks/{first}", json={"status": "concluida"}, headers=auth_headers
+    ).raise_for_status()
+
+    page = _sync(client, auth_headers, version)
+    assert sorted(t["id"] for t in page["tasks"]) == sorted([first, second])
+    assert page["version"] > version
+
+    # Nada mudou desde a última versão
+    latest = _sync(client, auth_headers, page["version"])
+    assert latest["tasks"] == []
+    assert latest["version"] == page["version"]
+
+
+def test_delete_leaves_tombstone(client, auth_headers):
+    task_id = _create(client, auth_headers, "Apagar")
+    subtask = client.post(
+        f"/tasks/{task_id}/subtasks",
+        json={"titulo": "Item"},
+        headers=auth_headers
+    ).json()["id"]
+    version = _sync(client, auth_headers)["version"]
+
+    client.delete(f"/tasks/{task_id}", headers=auth_headers).raise_for_status()
+
+    page = _sync(client, auth_headers, version)
+    assert page["tasks"] == []
+    assert page["deleted"]["tasks"] == [task_id]
+    # A exclusão da tarefa não gera tombstones das subtarefas
+    assert subtask not in page["deleted"].get("subtasks", [])
+
+
+def test_future_version_is_gone(client, auth_headers):
+    _create(client, auth_headers, "Tarefa")
+    version = _sync(client, auth_headers)["version"]
+
+    response = client.get(f"/sync?since={version + 1}", headers=auth_headers)
+    assert response.status_code == 410
+
+
+def test_compacted_version_is_gone(client, auth_headers):
+    task_id = _create(client, auth_headers, "Apagar")
+    version = _sync(client, auth_headers)["version"]
+    client.delete(f"/tasks/{task_id}", headers=auth_headers).raise_for_status()
+
+    # Retenção negativa: todos os tombstones já existentes são antigos
+    assert maintenance.compact_sync_tombstones(DATABASE_PATH, -1) >= 1
+
+    response = client.get(f"/sync?since={version}", headers=auth_headers)
+    assert response.status_code == 410
+
+    # Quem sincroniza do zero não recebe a tarefa excluída
+    page = _sync(client, auth_headers)
+    assert page["tasks"] == []
+    assert page["pruned_version"] > version
+    # E a versão atual continua válida
+    assert _sync(client, auth_headers, page["version"])["tasks"] == []
+
+
+def test_compaction_runs_periodically(client, auth_headers):
+    task_id = _create(client, auth_headers, "Apagar")
+    version = _sync(client, auth_headers)["version"]
+    client.delete(f"/tasks/{task_id}", headers=auth_headers).raise_for_status()
+
+    async def run_once():
+        task = asyncio.create_task(
+            maintenance.run_sync_compaction(DATABASE_PATH, -1, 0.01)
+        )
+        await asyncio.sleep(0.2)
+        task.cancel()
+
+    asyncio.run(run_once())
+
+    response = client.get(f"/sync?since={version}", headers=auth_headers)
+    assert response.status_code == 410
+
+
+def test_cli_migrates_under_lock(tmp_path, capsys):
+    path = str(tmp_path / "todolist.db")
+
+    assert maintenance.main(["--database", path, "sync-compact"]) == 0
+    # O esquema foi criado por init_db, com o lock de migração
+    assert (tmp_path / "todolist.db.migrate.lock").exists()
+    assert "0 tombstone(s)" in capsys.readouterr().out
@@ -0,0 +1,196 @@
+"""POST /tasks/bulk e operações em lote (PATCH /tasks/batch, exclusão)."""
+
+from tests.conftest import sql
+
+
+def _tasks(client, headers):
+    response = client.get("/tasks", headers=headers)
+    assert response.status_code == 200
+    return {t["id"]: t for t in response.json()}
+
+
+def _category(client, headers, nome="Casa"):
+    response = client.post("/categories", json={"nome": nome}, headers=headers)
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def test_bulk_creates_tasks_with_subtasks(client, auth_headers):
+    category_id = _category(client, auth_headers)
+    response = client.post(
+        "/tasks/bulk",
+        json=[
+            {
+                "titulo": "A",
+                "categoria_id": category_id,
+                "subtasks": [
+                    {"titulo": "A1"}, {"titulo": "A2", "concluida": True}
+                ],
+            },
+            {"titulo": "B"},
+        ],
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    first, second = response.json()["ids"]
+
+    tasks = _tasks(client, auth_headers)
+    assert set(tasks) == {first, second}
+    assert tasks[first]["titulo"] == "A"
+    assert tasks[first]["categoria_id"] == category_id
+    subtasks = tasks[first]["subtasks"]
+    assert [(s["titulo"], s["concluida"]) for s in subtasks] == [
+        ("A1", 0), ("A2", 1)
+    ]
+    assert tasks[second]["subtasks"] == []
+
+
+def test_bulk_rejects_foreign_category(client, auth_headers, other_headers):
+    foreign = _category(client, other_headers)
+    response = client.post(
+        "/tasks/bulk",
+        json=[{"titulo": "A"}, {"titulo": "B", "categoria_id": foreign}],
+        headers=auth_headers
+    )
+    assert response.status_code == 400
+    # Nada do lote foi gravado
+    assert _tasks(client, auth_headers) == {}
+
+
+def test_bulk_validates_whole_batch(client, auth_headers):
+    response = client.post(
+        "/tasks/bulk",
+        json=[{"titulo": "A"}, {"titulo": ""}],
+        headers=auth_headers
+    )
+    assert response.status_code == 422
+    assert _tasks(client, auth_headers) == {}
+
+    response = client.post("/tasks/bulk", json=[], headers=auth_headers)
+    assert response.status_code == 422
+
+
+def test_bulk_uses_one_transaction(client, auth_headers, statements):
+    statements.clear()
+    client.post(
+        "/tasks/bulk",
+        json=[{"titulo": f"T{i}", "subtasks": [{"titulo": "S"}]}
+              for i in range(20)],
+        headers=auth_headers
+    ).raise_for_status()
+    assert sum(s == "COMMIT" for s in sql(statements)) == 1
+
+
+def test_batch_update_by_ids_only_touches_own_tasks(
+    client, auth_headers, other_headers
+):
+    own = client.post(
+        "/tasks/bulk", json=[{"titulo": "A"}, {"titulo": "B"}],
+        headers=auth_headers
+    ).json()["ids"]
+    foreign = client.post(
+        "/tasks", json={"titulo": "Do outro"}, headers=other_headers
+    ).json()["id"]
+
+    response = client.patch(
+        "/tasks/batch",
+        json={"ids": [*own, foreign], "changes": {"status": "concluida"}},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["affected"] == 2
+
+    statuses = {t["status"] for t in _tasks(client, auth_headers).values()}
+    assert statuses == {"concluida"}
+    assert _tasks(client, other_headers)[foreign]["status"] == "pendente"
+
+
+def test_batch_update_by_filter(client, auth_headers):
+    category_id = _category(client, auth_headers)
+    other_category = _category(client, auth_headers, "Trabalho")
+    client.post(
+        "/tasks/bulk",
+        json=[
+            {"titulo": "A", "categoria_id": category_id},
+            {"titulo": "B", "categoria_id": category_id},
+            {"titulo": "C"},
+        ],
+        headers=auth_headers
+    ).raise_for_status()
+
+    response = client.patch(
+        "/tasks/batch",
+        json={
+            "filter": {"categoria_id": category_id},
+            "changes": {"categoria_id": other_category},
+        },
+        headers=auth_headers
+    )
+    assert response.json()["affected"] == 2
+    moved = {
+        t["titulo"] for t in _tasks(client, auth_headers).values()
+        if t["categoria_id"] == other_category
+    }
+    assert moved == {"A", "B"}
+
+
+def test_batch_update_rejects_foreign_category(
+    client, auth_headers, other_headers
+):
+    task_id = client.post(
+        "/tasks", json={"titulo": "A"}, headers=auth_headers
+    ).json()["id"]
+    foreign = _category(client, other_headers)
+
+    response = client.patch(
+        "/tasks/batch",
+        json={"ids": [task_id], "changes": {"categoria_id": foreign}},
+        headers=auth_headers
+    )
+    assert response.status_code == 404
+    assert _tasks(client, auth_headers)[task_id]["categoria_id"] is None
+
+
+def test_batch_selection_validation(client, auth_headers):
+    invalid = [
+        {"changes": {"status": "concluida"}},
+        {"ids": [1], "filter": {"status": "pendente"},
+         "changes": {"status": "concluida"}},
+        {"filter": {}, "changes": {"status": "concluida"}},
+        {"ids": [1], "changes": {}},
+    ]
+    for body in invalid:
+        response = client.patch("/tasks/batch", json=body, headers=auth_headers)
+        assert response.status_code == 422, body
+
+
+def test_batch_delete(client, auth_headers, other_headers):
+    ids = client.post(
+        "/tasks/bulk",
+        json=[
+            {"titulo": "A", "status": "concluida"},
+            {"titulo": "B", "status": "concluida"},
+            {"titulo": "C"},
+        ],
+        headers=auth_headers
+    ).json()["ids"]
+    foreign = client.post(
+        "/tasks", json={"titulo": "Do outro", "status": "concluida"},
+        headers=other_headers
+    ).json()["id"]
+
+    response = client.post(
+        "/tasks/batch/delete",
+        json={"filter": {"status": "concluida"}},
+        headers=auth_headers
+    )
+    assert response.json() == {"affected": 2, "ok": True}
+    assert set(_tasks(client, auth_headers)) == {ids[2]}
+    assert foreign in _tasks(client, other_headers)
+
+    response = client.post(
+        "/tasks/batch/delete", json={"ids": [ids[2], foreign]},
+        headers=auth_headers
+    )
+    assert response.json()["affected"] == 1
+    assert foreign in _tasks(client, other_headers)
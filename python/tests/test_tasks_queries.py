@@ -0,0 +1,60 @@
+"""Consultas de GET /tasks: quantidade fixa, sem N+1 nas subtarefas."""
+
+from tests.conftest import sql
+
+
+def _create_tasks(client, headers, count, subtasks=2):
+    response = client.post(
+        "/tasks/bulk",
+        json=[
+            {
+                "titulo": f"Tarefa {i}",
+                "subtasks": [{"titulo": f"Sub {j}"} for j in range(subtasks)],
+            }
+            for i in range(count)
+        ],
+        headers=headers
+    )
+    assert response.status_code == 200
+
+
+def _list_tasks(client, headers, statements):
+    statements.clear()
+    response = client.get("/tasks", headers=headers)
+    assert response.status_code == 200
+    return response.json(), sql(statements)
+
+
+def test_query_count_does_not_grow_with_tasks(client, auth_headers, statements):
+    _create_tasks(client, auth_headers, 1)
+    # Primeira requisição com o token: a busca do usuário fica em cache
+    client.get("/tasks", headers=auth_headers)
+
+    tasks, single = _list_tasks(client, auth_headers, statements)
+    assert len(tasks) == 1
+
+    _create_tasks(client, auth_headers, 24)
+    tasks, many = _list_tasks(client, auth_headers, statements)
+    assert len(tasks) == 25
+    assert all(len(task["subtasks"]) == 2 for task in tasks)
+
+    assert len(many) == len(single)
+    # Subtarefas de todas as tarefas em uma única consulta
+    assert sum("FROM subtasks" in s for s in many) == 1
+
+
+def test_query_count_does_not_grow_with_subtask_counts(
+    client, auth_headers, statements
+):
+    _create_tasks(client, auth_headers, 1)
+    client.get("/tasks", headers=auth_headers)
+
+    statements.clear()
+    client.get("/tasks?include=subtask_counts", headers=auth_headers)
+    single = sql(statements)
+
+    _create_tasks(client, auth_headers, 24)
+    statements.clear()
+    response = client.get("/tasks?include=subtask_counts", headers=auth_headers)
+    assert {task["subtasks_total"] for task in response.json()} == {2}
+    assert len(sql(statements)) == len(single)
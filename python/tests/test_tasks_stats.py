@@ -0,0 +1,78 @@
+"""GET /tasks/stats: contadores de task_stats mantidos pelos triggers."""
+
+import orjson
+
+
+def _import(client, headers, records):
+    body = b"".join(orjson.dumps(r) + b"\n" for r in records)
+    response = client.post("/import", content=body, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["errors"] == []
+
+
+def _stats(client, headers):
+    response = client.get("/tasks/stats", headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_stats_without_tasks(client, auth_headers):
+    assert _stats(client, auth_headers) == {
+        "total": 0,
+        "por_status": {},
+        "atrasadas": 0,
+        "taxa_conclusao": 0.0,
+        "por_categoria": [],
+    }
+
+
+def test_stats_by_status_and_category(client, auth_headers, other_headers):
+    # Importação: aceita vencimentos no passado (tarefas atrasadas)
+    _import(client, auth_headers, [
+        {"type": "category", "id": 1, "nome": "Casa", "cor": "#000000"},
+        {"type": "task", "id": 1, "categoria_id": 1, "titulo": "A",
+         "status": "concluida", "data_vencimento": "2000-01-01"},
+        {"type": "task", "id": 2, "categoria_id": 1, "titulo": "B",
+         "data_vencimento": "2000-01-01"},
+        {"type": "task", "id": 3, "categoria_id": 1, "titulo": "C"},
+        {"type": "task", "id": 4, "titulo": "D", "status": "concluida"},
+    ])
+    client.post(
+        "/tasks", json={"titulo": "Do outro"}, headers=other_headers
+    ).raise_for_status()
+
+    stats = _stats(client, auth_headers)
+    assert stats["total"] == 4
+    assert stats["por_status"] == {"concluida": 2, "pendente": 2}
+    # Só a tarefa em aberto com vencimento passado está atrasada
+    assert stats["atrasadas"] == 1
+    assert stats["taxa_conclusao"] == 0.5
+
+    by_category = {c["categoria_nome"]: c for c in stats["por_categoria"]}
+    assert set(by_category) == {"Casa", None}
+    casa = by_category["Casa"]
+    assert casa["categoria_cor"] == "#000000"
+    assert casa["total"] == 3
+    assert casa["por_status"] == {"concluida": 1, "pendente": 2}
+    assert casa["atrasadas"] == 1
+    assert casa["taxa_conclusao"] == 0.3333
+    assert by_category[None]["taxa_conclusao"] == 1.0
+
+
+def test_stats_follow_updates_and_deletes(client, auth_headers):
+    task_ids = client.post(
+        "/tasks/bulk",
+        json=[{"titulo": f"Tarefa {i}"} for i in range(3)],
+        headers=auth_headers
+    ).json()["ids"]
+
+    client.put(
+        f"/tasks/{task_ids[0]}", json={"status": "concluida"},
+        headers=auth_headers
+    ).raise_for_status()
+    client.delete(f"/tasks/{task_ids[1]}", headers=auth_headers)
+
+    stats = _stats(client, auth_headers)
+    assert stats["total"] == 2
+    assert stats["por_status"] == {"concluida": 1, "pendente": 1}
+    assert stats["taxa_conclusao"] == 0.5
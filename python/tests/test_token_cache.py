@@ -0,0 +1,26 @@
+"""Cache de tokens verificados (`core.token_cache`)."""
+
+from core.token_cache import token_cache
+from tests.conftest import PASSWORD
+
+
+def test_cache_keeps_only_id_and_email(client, auth_headers):
+    me = client.get("/me", headers=auth_headers).json()
+
+    token = auth_headers["Authorization"].split(" ", 1)[1]
+    assert token_cache.get(token) == {"id": me["id"], "email": me["email"]}
+
+
+def test_rehash_on_login_invalidates_cached_tokens(client, auth_headers, monkeypatch):
+    import services.auth_service as auth_service
+
+    email = client.get("/me", headers=auth_headers).json()["email"]
+    token = auth_headers["Authorization"].split(" ", 1)[1]
+    assert token_cache.get(token) is not None
+
+    monkeypatch.setattr(auth_service, "password_needs_rehash", lambda _: True)
+    response = client.post(
+        "/login", data={"username": email, "password": PASSWORD}
+    )
+    assert response.status_code == 200
+    assert token_cache.get(token) is None
@@ -0,0 +1,146 @@
+"""Exportação (GET /export) e importação (POST /import)."""
+
+import csv
+import io
+
+import orjson
+
+
+def _seed(client, headers):
+    category_id = client.post(
+        "/categories", json={"nome": "Casa", "cor": "#112233"},
+        headers=headers
+    ).json()["id"]
+    task_id = client.post(
+        "/tasks",
+        json={"titulo": "Limpar", "descricao": "Sala",
+              "categoria_id": category_id},
+        headers=headers
+    ).json()["id"]
+    for titulo in ("Varrer", "Passar pano"):
+        client.post(
+            f"/tasks/{task_id}/subtasks", json={"titulo": titulo},
+            headers=headers
+        ).raise_for_status()
+    client.post(
+        "/tasks", json={"titulo": "Sem categoria"}, headers=headers
+    ).raise_for_status()
+
+
+def _export(client, headers, query=""):
+    response = client.get(f"/export{query}", headers=headers)
+    assert response.status_code == 200
+    return response
+
+
+def _records(response):
+    return [orjson.loads(line) for line in response.content.splitlines()]
+
+
+def _import(client, headers, body, query=""):
+    return client.post(f"/import{query}", content=body, headers=headers)
+
+
+def _snapshot(client, headers):
+    """Dados do usuário sem os IDs, para comparar contas diferentes."""
+    categories = {
+        c["id"]: c["nome"]
+        for c in client.get("/categories", headers=headers).json()
+    }
+    return sorted(
+        (
+            t["titulo"],
+            t["descricao"],
+            t["status"],
+            categories.get(t["categoria_id"]),
+            tuple(s["titulo"] for s in t["subtasks"]),
+        )
+        for t in client.get("/tasks", headers=headers).json()
+    )
+
+
+def test_export_ndjson(client, auth_headers, other_headers):
+    _seed(client, auth_headers)
+    client.post(
+        "/tasks", json={"titulo": "Do outro"}, headers=other_headers
+    ).raise_for_status()
+
+    response = _export(client, auth_headers)
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = _records(response)
+    # Categorias, tarefas e subtarefas, nessa ordem
+    assert [r["type"] for r in records] == [
+        "category", "task", "task", "subtask", "subtask"
+    ]
+    assert "Do outro" not in {r.get("titulo") for r in records}
+
+    category, task = records[0], records[1]
+    assert task["categoria_id"] == category["id"]
+    assert {r["task_id"] for r in records[3:]} == {task["id"]}
+
+    only_tasks = _records(_export(client, auth_headers, "?entity=task"))
+    assert [r["type"] for r in only_tasks] == ["task", "task"]
+
+
+def test_export_import_roundtrip(client, auth_headers, other_headers):
+    _seed(client, auth_headers)
+    body = _export(client, auth_headers).content
+
+    response = _import(client, other_headers, body)
+    assert response.status_code == 200
+    summary = response.json()
+    assert summary["status"] == "completed"
+    counts = (summary["categories"], summary["tasks"], summary["subtasks"])
+    assert counts == (1, 2, 2)
+    assert summary["errors"] == []
+
+    # IDs novos, mesmas relações
+    assert _snapshot(client, other_headers) == _snapshot(client, auth_headers)
+
+
+def test_csv_roundtrip(client, auth_headers, other_headers):
+    _seed(client, auth_headers)
+    response = _export(client, auth_headers, "?format=csv")
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [r["type"] for r in rows].count("subtask") == 2
+
+    response = _import(
+        client, other_headers, response.content, "?format=csv"
+    )
+    assert response.status_code == 200
+    assert response.json()["errors"] == []
+    assert _snapshot(client, other_headers) == _snapshot(client, auth_headers)
+
+
+def test_import_reports_invalid_lines(client, auth_headers):
+    body = b"\n".join([
+        b'{"type": "task", "id": 1, "titulo": "Boa"}',
+        b"{nao e json",
+        b'{"type": "task", "id": 2, "titulo": ""}',
+        b'{"type": "subtask", "task_id": 99, "titulo": "Sem tarefa"}',
+        b'{"type": "subtask", "task_id": 1, "titulo": "Filha"}',
+    ])
+    response = _import(client, auth_headers, body)
+    assert response.status_code == 200
+    summary = response.json()
+    assert (summary["tasks"], summary["subtasks"]) == (1, 1)
+    assert [e["line"] for e in summary["errors"]] == [2, 3, 4]
+    assert summary["error_count"] == 3
+
+    tasks = client.get("/tasks", headers=auth_headers).json()
+    assert [t["titulo"] for t in tasks] == ["Boa"]
+    assert [s["titulo"] for s in tasks[0]["subtasks"]] == ["Filha"]
+
+
+def test_import_accepts_past_due_dates(client, auth_headers):
+    body = orjson.dumps({
+        "type": "task", "id": 1, "titulo": "Antiga",
+        "data_criacao": "2001-02-03T04:05:06Z",
+        "data_vencimento": "2001-03-01",
+    })
+    assert _import(client, auth_headers, body).status_code == 200
+
+    task, = client.get("/tasks", headers=auth_headers).json()
+    assert task["data_criacao"] == "2001-02-03 04:05:06"
+    assert task["data_vencimento"] == "2001-03-01"
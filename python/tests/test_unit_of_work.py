@@ -0,0 +1,120 @@
+"""
+Unidade de trabalho por requisição (`get_db` / `get_async_db`).
+
+Os repositórios não fazem commit: tudo o que a requisição grava vai para o
+banco em um único COMMIT no final, e nada fica gravado se ela falhar.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from db import writer
+from db.database import db_session_async, get_async_db, get_db, get_pool
+from repositories import categories_repo
+from repositories.aio import categories_repo as categories_repo_aio
+from tests.conftest import sql
+
+
+def _count(statements, keyword):
+    return sum(s.strip().upper() == keyword for s in sql(statements))
+
+
+def test_bulk_create_commits_once(client, auth_headers, statements):
+    response = client.post(
+        "/tasks/bulk",
+        json=[
+            {"titulo": f"Tarefa {i}", "subtasks": [{"titulo": "A"}, {"titulo": "B"}]}
+            for i in range(5)
+        ],
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert len(response.json()["ids"]) == 5
+
+    # 5 tarefas + 10 subtarefas (e os triggers delas) em uma só transação
+    assert _count(statements, "BEGIN") == 1
+    assert _count(statements, "COMMIT") == 1
+
+
+def test_update_commits_once(client, auth_headers, statements):
+    task_id = client.post(
+        "/tasks", json={"titulo": "Original"}, headers=auth_headers
+    ).json()["id"]
+    statements.clear()
+
+    response = client.put(
+        f"/tasks/{task_id}",
+        json={"titulo": "Alterada", "status": "concluida"},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert _count(statements, "COMMIT") == 1
+
+
+def _probe_app(user_id: int, nome: str) -> FastAPI:
+    """Aplicação com rotas que gravam uma categoria e depois falham."""
+    probe = FastAPI()
+
+    @probe.post("/async")
+    async def write_then_fail_async(conn=Depends(get_async_db)):
+        await categories_repo_aio.create_category(conn, user_id, nome, "#000000")
+        raise RuntimeError("falha depois da escrita")
+
+    @probe.post("/twice")
+    async def write_twice(conn=Depends(get_async_db)):
+        await categories_repo_aio.create_category(conn, user_id, nome, "#000000")
+        await categories_repo_aio.create_category(conn, user_id, nome, "#000000")
+
+    @probe.post("/sync")
+    def write_then_fail_sync(conn=Depends(get_db)):
+        categories_repo.create_category(conn, user_id, nome, "#000000")
+        raise RuntimeError("falha depois da escrita")
+
+    return probe
+
+
+@pytest.mark.parametrize("path", ["/async", "/sync", "/twice"])
+def test_exception_after_write_rolls_back(client, auth_headers, path):
+    user_id = client.get("/me", headers=auth_headers).json()["id"]
+    nome = f"Rascunho {path}"
+
+    with TestClient(
+        _probe_app(user_id, nome), raise_server_exceptions=False
+    ) as probe:
+        assert probe.post(path).status_code == 500
+
+    categories = client.get("/categories", headers=auth_headers).json()
+    assert nome not in [c["nome"] for c in categories]
+    assert get_pool().stats()["in_use"] == 0
+
+
+
+@pytest.mark.parametrize("single_writer", [False, True])
+def test_second_write_in_unit_is_refused(
+    client, auth_headers, monkeypatch, single_writer
+):
+    """
+    Com DB_SINGLE_WRITER cada escrita é commitada sozinha, então a segunda
+    função de escrita da unidade é recusada antes de chegar ao banco.
+    """
+    monkeypatch.setattr(writer, "DB_SINGLE_WRITER", single_writer)
+    user_id = client.get("/me", headers=auth_headers).json()["id"]
+
+    async def write_twice():
+        async with db_session_async() as conn:
+            for nome in ("Primeira", "Segunda"):
+                await categories_repo_aio.create_category(
+                    conn, user_id, nome, "#000000"
+                )
+
+    try:
+        with pytest.raises(RuntimeError, match="categories_repo.create_category"):
+            asyncio.run(write_twice())
+    finally:
+        writer.close_writer()
+
+    categories = client.get("/categories", headers=auth_headers).json()
+    assert "Segunda" not in [c["nome"] for c in categories]